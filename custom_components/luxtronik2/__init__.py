@@ -1,23 +1,52 @@
 from homeassistant.config_entries import ConfigEntry, ConfigEntryNotReady
-from homeassistant.core import HomeAssistant
+from homeassistant.const import (
+    EVENT_HOMEASSISTANT_STOP,
+    STATE_UNAVAILABLE,
+    STATE_UNKNOWN,
+    UnitOfPower,
+)
+from homeassistant.core import (
+    Event,
+    EventStateChangedData,
+    HomeAssistant,
+    State,
+    callback,
+)
 from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.event import async_track_state_change_event
 
+from .binary_client import LuxtronikBinaryClient
+from .cache import EnergyStore, NavigationCache, SnapshotStore
+from .config_flow import category_intervals
 from .const import (
+    BACKEND_BINARY,
+    CONF_BACKEND,
+    CONF_ELECTRICAL_POWER_ENTITY,
     CONF_INTERVAL,
     CONF_IP,
     CONF_PASSWORD,
     CONF_PORT,
+    DATA_ENERGY_STORE,
+    DATA_HUB,
+    DATA_NAVIGATION_CACHE,
+    DATA_SNAPSHOT_STORE,
     DEFAULT_INTERVAL,
     DEFAULT_PORT,
     DOMAIN,
+    PLATFORMS,
 )
+from .hub import LuxtronikHub
+from .services import async_setup_services
 from .websocket_client import LuxtronikClient
 
 CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
 
 
 async def async_setup(hass: HomeAssistant, config: dict):
-    """Nothing to set up during YAML phase."""
+    """Register the services; controllers come from config entries."""
+    async_setup_services(hass)
     return True
 
 
@@ -29,12 +58,37 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
     port = entry.data.get(CONF_PORT, DEFAULT_PORT)
     inverval = entry.data.get(CONF_INTERVAL, DEFAULT_INTERVAL)
 
-    client = LuxtronikClient(ip, pwd, port, inverval)
-
-    # Test connection (Bronze requirement)
+    hub = hass.data.setdefault(DATA_HUB, LuxtronikHub())
+    await er.async_migrate_entries(
+        hass, entry.entry_id, _unique_id_migrator(entry.entry_id)
+    )
+
+    if entry.data.get(CONF_BACKEND) == BACKEND_BINARY:
+        client_class = LuxtronikBinaryClient
+    else:
+        client_class = LuxtronikClient
+    client = client_class(
+        ip,
+        pwd,
+        port,
+        inverval,
+        async_get_clientsession(hass),
+        intervals=category_intervals(entry),
+        device_id=entry.entry_id,
+        name=entry.title,
+        limiter=hub.limiter,
+        phase=hub.phase(entry.entry_id),
+        navigation_cache=_navigation_cache(hass),
+        energy_store=_energy_store(hass),
+        lazy=True,
+        snapshot_store=_snapshot_store(hass),
+    )
+
+    # Test connection (Bronze requirement); polling continues on this socket
     try:
         await client.test_connection()
     except Exception as exc:
+        await client.close()
         raise ConfigEntryNotReady from exc
 
     # Store shared instance
@@ -43,19 +97,107 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
 
     entry.runtime_data = client  # Bronze requirement
 
+    if power_entity := entry.options.get(CONF_ELECTRICAL_POWER_ENTITY):
+        entry.async_on_unload(_track_electrical_power(hass, client, power_entity))
+
     # 🚀 WICHTIG: Hintergrund-Task starten
-    hass.loop.create_task(client.run())
-    await hass.config_entries.async_forward_entry_setups(entry, ["sensor"])
+    await client.start()
+
+    async def _async_stop(_event: Event):
+        # Saves the last snapshot before Home Assistant's final write
+        await client.close()
+
+    entry.async_on_unload(
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _async_stop)
+    )
+    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
     return True
 
 
+def _navigation_cache(hass: HomeAssistant) -> NavigationCache:
+    if DATA_NAVIGATION_CACHE not in hass.data:
+        hass.data[DATA_NAVIGATION_CACHE] = NavigationCache(hass)
+    return hass.data[DATA_NAVIGATION_CACHE]
+
+
+def _energy_store(hass: HomeAssistant) -> EnergyStore:
+    if DATA_ENERGY_STORE not in hass.data:
+        hass.data[DATA_ENERGY_STORE] = EnergyStore(hass)
+    return hass.data[DATA_ENERGY_STORE]
+
+
+def _snapshot_store(hass: HomeAssistant) -> SnapshotStore:
+    if DATA_SNAPSHOT_STORE not in hass.data:
+        hass.data[DATA_SNAPSHOT_STORE] = SnapshotStore(hass)
+    return hass.data[DATA_SNAPSHOT_STORE]
+
+
+def _power_watts(state: State | None) -> float | None:
+    """Power of a sensor state in W, None if it has none."""
+    if state is None or state.state in (STATE_UNAVAILABLE, STATE_UNKNOWN):
+        return None
+    try:
+        value = float(state.state)
+    except ValueError:
+        return None
+    unit = state.attributes.get("unit_of_measurement")
+    if unit == UnitOfPower.KILO_WATT:
+        return value * 1000
+    if unit == UnitOfPower.MEGA_WATT:
+        return value * 1_000_000
+    return value
+
+
+def _track_electrical_power(hass: HomeAssistant, client, entity_id: str):
+    """Keep client.electrical_power in line with the configured entity."""
+    client.electrical_power = _power_watts(hass.states.get(entity_id))
+
+    @callback
+    def power_changed(event: Event[EventStateChangedData]):
+        client.electrical_power = _power_watts(event.data["new_state"])
+
+    return async_track_state_change_event(hass, [entity_id], power_changed)
+
+
+def _unique_id_migrator(entry_id: str):
+    """Move unique ids from luxtronik2_<field> to <entry_id>_<field>.
+
+    The old ids had no device part, so a second controller collided with
+    the first one.
+    """
+
+    @callback
+    def migrate(entity_entry: er.RegistryEntry):
+        prefix = f"{DOMAIN}_"
+        if not entity_entry.unique_id.startswith(prefix):
+            return None
+        field = entity_entry.unique_id.removeprefix(prefix)
+        return {"new_unique_id": f"{entry_id}_{field}"}
+
+    return migrate
+
+
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry):
+    """Reload the entry when its options change."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry):
     """Unload integration and stop WS client."""
     client = hass.data[DOMAIN][entry.entry_id]
 
     await client.close()
 
-    await hass.config_entries.async_unload_platforms(entry, ["sensor"])
+    await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     hass.data[DOMAIN].pop(entry.entry_id)
+    hass.data[DATA_HUB].release(entry.entry_id)
 
     return True
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry):
+    """Forget the cached navigation, energy totals and snapshot of a removed controller."""
+    for store in (_navigation_cache(hass), _energy_store(hass), _snapshot_store(hass)):
+        await store.async_load(entry.entry_id)
+        store.async_remove(entry.entry_id)
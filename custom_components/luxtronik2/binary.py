@@ -0,0 +1,199 @@
+"""Binary interface of the Luxtronik 2 on TCP port 8889 and its index tables.
+
+The controller answers a request (command, 0) with the command echoed, a
+status word for calculations, the element count and the elements, all
+big-endian int32. Values are raw: temperatures in tenths of °C, heat
+quantities in tenths of kWh, outputs 0/1. The tables below map array
+indices to the keys of FIELDS and PARAMETERS, so both backends fill the
+same snapshot slots.
+"""
+
+import functools
+import struct
+from operator import itemgetter
+
+from .const import (
+    CATEGORY_ENERGY,
+    CATEGORY_OUTPUTS,
+    CATEGORY_STATE,
+    CATEGORY_TEMPERATURES,
+)
+from .fields import PARAMETERS_BY_KEY
+
+CMD_WRITE = 3002
+CMD_PARAMETERS = 3003
+CMD_CALCULATIONS = 3004
+
+# (command, 0) and (CMD_WRITE, index, value) out; (command, count) back,
+# with a status word between them for calculations
+REQUEST = struct.Struct(">ii")
+WRITE = struct.Struct(">iii")
+HEADER = struct.Struct(">ii")
+STATUS_HEADER = struct.Struct(">iii")
+
+# Key of the calculations round trip in ClientStats
+STATS_CALCULATIONS = "calculations"
+
+# Longer arrays are taken as a desynchronised stream
+MAX_ELEMENTS = 4096
+
+# Operating state (calculation 80) as the web interface renders it
+_OPERATING_STATES = (
+    "Heizen",
+    "Warmwasser",
+    "Schwimmbad / Photovoltaik",
+    "EVU-Sperre",
+    "Abtauen",
+    "Keine Anforderung",
+    "Heizen ext. Energiequelle",
+    "Kühlbetrieb",
+)
+
+
+def _tenths(raw):
+    return raw / 10
+
+
+def _number(raw):
+    return float(raw)
+
+
+def _on(raw):
+    return raw != 0
+
+
+def _tenths_sum(*raws):
+    return round(sum(raws) / 10, 1)
+
+
+def _operating_state(raw):
+    return _OPERATING_STATES[raw] if 0 <= raw < len(_OPERATING_STATES) else None
+
+
+def _text(*raws):
+    """Firmware version, one character per element, zero padded."""
+    return "".join(chr(raw) for raw in raws if 0 < raw < 0x110000)
+
+
+# category -> (key, calculation indices, converter of their raw values)
+CALCULATIONS: dict[str, tuple[tuple[str, tuple[int, ...], object], ...]] = {
+    CATEGORY_TEMPERATURES: (
+        ("vorlauf", (10,), _tenths),
+        ("ruecklauf", (11,), _tenths),
+        ("ruecklauf_soll", (12,), _tenths),
+        ("heissgas", (14,), _tenths),
+        ("aussentemperatur", (15,), _tenths),
+        ("mitteltemperatur", (16,), _tenths),
+        ("warmwasser_ist", (17,), _tenths),
+        ("warmwasser_soll", (18,), _tenths),
+        ("solarkollektor", (26,), _tenths),
+        ("solarspeicher", (27,), _tenths),
+        ("externe_energiequelle", (28,), _tenths),
+    ),
+    CATEGORY_ENERGY: (
+        ("waerme_heizung", (151,), _tenths),
+        ("waerme_ww", (152,), _tenths),
+        # The web page's total includes the swimming pool counter
+        ("waerme_gesamt", (151, 152, 153), _tenths_sum),
+        ("waerme_seit_reset", (154,), _tenths),
+        ("durchfluss", (155,), _number),
+    ),
+    # FUP 1 and FUP 3 have no calculation; they stay unknown on this backend
+    CATEGORY_OUTPUTS: (
+        ("av_abtauventil", (37,), _on),
+        ("bup", (38,), _on),
+        ("hup", (39,), _on),
+        ("ventilation", (42,), _on),
+        ("ventil_bosup", (43,), _on),
+        ("verdichter", (44,), _on),
+        ("zip", (46,), _on),
+        ("zup", (47,), _on),
+        ("zwe1", (48,), _on),
+        ("zwe2", (49,), _on),
+        ("zwe3", (50,), _on),
+        ("fup2", (51,), _on),
+        ("slp", (52,), _on),
+    ),
+    CATEGORY_STATE: (
+        ("Betriebszustand", (80,), _operating_state),
+        ("firmware", tuple(range(81, 91)), _text),
+    ),
+}
+
+# Parameter key -> index in the parameters array; raw values are what
+# Parameter.to_raw() sends over the WebSocket (scaled number or option index)
+PARAMETER_INDICES = {
+    "warmwasser_soll_einstellung": 2,
+    "betriebsart_heizung": 3,
+    "betriebsart_warmwasser": 4,
+    "heizkurve_endpunkt": 11,
+    "heizkurve_parallelverschiebung": 12,
+}
+
+
+def _getter(indices):
+    """Tuple of the elements at `indices`, whatever their number."""
+    getter = itemgetter(*indices)
+    if len(indices) == 1:
+        return lambda values: (getter(values),)
+    return getter
+
+
+# Raw elements each category is decoded from: equal raws, equal values
+_RAW = {
+    category: _getter(
+        sorted({index for _, indices, _ in entries for index in indices})
+    )
+    for category, entries in CALCULATIONS.items()
+}
+_ENTRIES = {
+    category: tuple((key, _getter(indices), convert) for key, indices, convert in entries)
+    for category, entries in CALCULATIONS.items()
+}
+_MIN_ELEMENTS = {
+    category: max(index for _, indices, _ in entries for index in indices) + 1
+    for category, entries in CALCULATIONS.items()
+}
+
+
+@functools.lru_cache(maxsize=8)
+def _array(count: int) -> struct.Struct:
+    return struct.Struct(f">{count}i")
+
+
+def unpack_array(payload) -> tuple[int, ...]:
+    """All elements of an int32 block in one unpack, without copying it."""
+    return _array(len(payload) // 4).unpack_from(memoryview(payload))
+
+
+def raw_of(values: tuple[int, ...], category: str) -> tuple[int, ...] | None:
+    """The elements `category` is decoded from; None if the array is too short."""
+    if len(values) < _MIN_ELEMENTS[category]:
+        return None
+    return _RAW[category](values)
+
+
+def decode(values: tuple[int, ...], category: str) -> dict:
+    """{key: value} of one category from a calculations array.
+
+    Firmware with a shorter array leaves the category's values unknown.
+    """
+    if len(values) < _MIN_ELEMENTS[category]:
+        return {key: None for key, _, _ in _ENTRIES[category]}
+    return {key: convert(*raws(values)) for key, raws, convert in _ENTRIES[category]}
+
+
+def decode_parameters(values: tuple[int, ...]) -> dict:
+    """{parameter key: value} from a parameters array."""
+    updates = {}
+    for key, index in PARAMETER_INDICES.items():
+        if index >= len(values):
+            continue
+        parameter = PARAMETERS_BY_KEY[key]
+        raw = values[index]
+        if parameter.options:
+            options = parameter.options
+            updates[key] = options[raw] if 0 <= raw < len(options) else None
+        else:
+            updates[key] = raw / parameter.scale
+    return updates
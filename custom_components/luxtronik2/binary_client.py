@@ -0,0 +1,151 @@
+"""LuxtronikClient on the binary interface (TCP port 8889) instead of the WebSocket."""
+
+import asyncio
+import contextlib
+import time
+
+from .binary import (
+    CALCULATIONS,
+    CMD_CALCULATIONS,
+    CMD_PARAMETERS,
+    CMD_WRITE,
+    HEADER,
+    MAX_ELEMENTS,
+    PARAMETER_INDICES,
+    REQUEST,
+    STATS_CALCULATIONS,
+    STATUS_HEADER,
+    WRITE,
+    decode,
+    decode_parameters,
+    raw_of,
+    unpack_array,
+)
+from .const import CATEGORY_SETTINGS
+from .fields import PARAMETERS_BY_KEY
+from .websocket_client import LuxtronikClient
+
+
+class LuxtronikBinaryClient(LuxtronikClient):
+    """Same API and snapshot keys as LuxtronikClient, read from the raw arrays.
+
+    One calculations read carries the values of all four pages, so every
+    active category is refreshed by each poll at the cost of one round
+    trip, and nothing has to be rendered or parsed as text. Settings
+    come from the parameters array and are written element by element.
+
+    There is no navigation on this interface: no further pages are
+    discovered, and capture() has nothing to record.
+    """
+
+    captures_frames = False
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._reader: asyncio.StreamReader | None = None
+        self._writer: asyncio.StreamWriter | None = None
+
+    # -------------------------------------------------------------
+    # Polling
+    # -------------------------------------------------------------
+    async def _poll(self, categories=None):
+        """Read the calculations once and decode every active category."""
+        categories = self._scheduler.active.union(categories or ()).intersection(
+            CALCULATIONS
+        )
+        start = time.perf_counter()
+        async with self._limiter, self._io_lock:
+            values = await self._read_array(CMD_CALCULATIONS)
+        ms = (time.perf_counter() - start) * 1000
+        self.stats.add_round_trip(STATS_CALCULATIONS, ms)
+        # The one read refreshes every category; record it under each, so
+        # the per-category round trip sensors work on this backend too
+        for category in categories:
+            self.stats.add_round_trip(category, ms)
+
+        parse_start = time.perf_counter()
+        updates = {}
+        changed_categories = set()
+        for category in categories:
+            raw = raw_of(values, category)
+            # Same elements as last time: nothing to decode, nothing to notify
+            if raw is not None and raw == self._frames.get(category):
+                self.stats.unchanged_frames += 1
+                continue
+            self._frames[category] = raw
+            changed_categories.add(category)
+            updates.update(decode(values, category))
+        self._complete_cycle(
+            updates, categories, changed_categories, start, parse_start
+        )
+
+    @property
+    def _has_settings(self) -> bool:
+        return True
+
+    async def _fetch_settings(self, page_ids=()) -> dict:
+        """Settings from the parameters array; needs the socket lock held."""
+        start = time.perf_counter()
+        values = await self._read_array(CMD_PARAMETERS)
+        self.stats.add_round_trip(
+            CATEGORY_SETTINGS, (time.perf_counter() - start) * 1000
+        )
+        return decode_parameters(values)
+
+    async def _set_parameters(self, batch: dict) -> dict:
+        """Write each value of `batch` to its element, then re-read the parameters."""
+        for key, value in batch.items():
+            raw = int(PARAMETERS_BY_KEY[key].to_raw(value))
+            await self._write_element(PARAMETER_INDICES[key], raw)
+        return await self._fetch_settings()
+
+    # -------------------------------------------------------------
+    # TCP transport
+    # -------------------------------------------------------------
+    async def _open(self):
+        """Open the TCP connection; this interface has no login."""
+        await self._disconnect()
+        self._reader, self._writer = await asyncio.open_connection(self.ip, self.port)
+
+    def _connected(self) -> bool:
+        return self._writer is not None and not self._writer.is_closing()
+
+    async def _disconnect(self):
+        writer, self._writer = self._writer, None
+        self._reader = None
+        if writer is None:
+            return
+        writer.close()
+        with contextlib.suppress(Exception):
+            await writer.wait_closed()
+
+    async def _read_array(self, command: int) -> tuple[int, ...]:
+        """Request one array and unpack it in a single call."""
+        if self._writer is None:
+            raise ConnectionError("not connected")
+        self._writer.write(REQUEST.pack(command, 0))
+        header = STATUS_HEADER if command == CMD_CALCULATIONS else HEADER
+        async with asyncio.timeout(self.request_timeout):
+            head = await self._reader.readexactly(header.size)
+            echo, *_, count = header.unpack(head)
+            if echo != command or not 0 <= count <= MAX_ELEMENTS:
+                raise ConnectionError(f"unexpected reply to {command}: {echo}, {count}")
+            payload = await self._reader.readexactly(count * 4)
+        self._received(header.size + len(payload))
+        return unpack_array(payload)
+
+    async def _write_element(self, index: int, value: int):
+        """Set parameter `index`; the controller echoes the command and value."""
+        if self._writer is None:
+            raise ConnectionError("not connected")
+        self._writer.write(WRITE.pack(CMD_WRITE, index, value))
+        async with asyncio.timeout(self.request_timeout):
+            echo, _ = HEADER.unpack(await self._reader.readexactly(HEADER.size))
+        if echo != CMD_WRITE:
+            raise ConnectionError(f"unexpected reply to {CMD_WRITE}: {echo}")
+        self._received(HEADER.size)
+
+    def _received(self, size: int):
+        self._last_frame = time.monotonic()
+        self.stats.frames += 1
+        self.stats.bytes_received += size
@@ -0,0 +1,69 @@
+"""Per-controller data kept in Home Assistant storage."""
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    ENERGY_SAVE_DELAY,
+    ENERGY_STORAGE_KEY,
+    ENERGY_STORAGE_VERSION,
+    NAVIGATION_SAVE_DELAY,
+    NAVIGATION_STORAGE_KEY,
+    NAVIGATION_STORAGE_VERSION,
+    SNAPSHOT_SAVE_DELAY,
+    SNAPSHOT_STORAGE_KEY,
+    SNAPSHOT_STORAGE_VERSION,
+)
+
+
+class DeviceStore:
+    """{device id: data} of all controllers in one storage file."""
+
+    def __init__(self, hass: HomeAssistant, version: int, key: str, delay: float):
+        self._store = Store(hass, version, key)
+        self._delay = delay
+        self._data: dict | None = None
+
+    async def async_load(self, device_id: str) -> dict | None:
+        if self._data is None:
+            self._data = await self._store.async_load() or {}
+        return self._data.get(device_id)
+
+    @callback
+    def async_save(self, device_id: str, data: dict):
+        if self._data is None:
+            self._data = {}
+        self._data[device_id] = data
+        self._store.async_delay_save(lambda: self._data, self._delay)
+
+    @callback
+    def async_remove(self, device_id: str):
+        if self._data and self._data.pop(device_id, None) is not None:
+            self._store.async_delay_save(lambda: self._data, self._delay)
+
+
+class NavigationCache(DeviceStore):
+    """{device id: {"firmware": ..., "tree": ...}}"""
+
+    def __init__(self, hass: HomeAssistant):
+        super().__init__(
+            hass, NAVIGATION_STORAGE_VERSION, NAVIGATION_STORAGE_KEY, NAVIGATION_SAVE_DELAY
+        )
+
+
+class EnergyStore(DeviceStore):
+    """{device id: {"thermal": kWh, "electrical": kWh}} of the integrators."""
+
+    def __init__(self, hass: HomeAssistant):
+        super().__init__(
+            hass, ENERGY_STORAGE_VERSION, ENERGY_STORAGE_KEY, ENERGY_SAVE_DELAY
+        )
+
+
+class SnapshotStore(DeviceStore):
+    """{device id: {"timestamp": ..., "values": {...}}} of the last snapshot."""
+
+    def __init__(self, hass: HomeAssistant):
+        super().__init__(
+            hass, SNAPSHOT_STORAGE_VERSION, SNAPSHOT_STORAGE_KEY, SNAPSHOT_SAVE_DELAY
+        )
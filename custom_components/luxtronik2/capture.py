@@ -0,0 +1,91 @@
+"""Capture of raw controller frames, and reading captures back for replay.
+
+A capture is a gzip file of JSON lines, [unix time, frame text] each.
+Frames are written in batches, every batch its own gzip member, so the
+file can be appended to and stays readable if the process dies while
+capturing. LuxtronikClient.replay() feeds a capture back through the
+parse and notify path.
+"""
+
+import asyncio
+import gzip
+import json
+import time
+
+from .const import CAPTURE_BATCH
+
+
+class FrameRecorder:
+    """Append frames to a capture file without blocking the event loop."""
+
+    def __init__(self, path: str, batch: int = CAPTURE_BATCH):
+        self.path = path
+        self.frames = 0
+        self._batch = batch
+        self._pending: list[str] = []
+        self._writer: asyncio.Task | None = None
+
+    def record(self, frame: str, timestamp: float | None = None):
+        self._pending.append(
+            json.dumps([timestamp or time.time(), frame], ensure_ascii=False)
+        )
+        self.frames += 1
+        if len(self._pending) >= self._batch:
+            self._flush()
+
+    def _flush(self):
+        lines, self._pending = self._pending, []
+        # Each batch waits for the one before, so the file keeps their order
+        self._writer = asyncio.get_running_loop().create_task(
+            self._write(lines, self._writer)
+        )
+
+    async def _write(self, lines: list[str], previous: asyncio.Task | None):
+        if previous is not None:
+            await previous
+        await asyncio.get_running_loop().run_in_executor(
+            None, _append, self.path, lines
+        )
+
+    async def close(self):
+        """Write what is still buffered."""
+        if self._pending:
+            self._flush()
+        if self._writer is not None:
+            await self._writer
+
+
+def _append(path: str, lines: list[str]):
+    with gzip.open(path, "at", encoding="utf-8") as file:
+        file.write("\n".join(lines) + "\n")
+
+
+async def async_capture(client, path: str, seconds: float) -> int:
+    """Record every frame `client` receives for `seconds`; returns the count.
+
+    Starts with the current navigation, so a replay knows the page ids
+    even though the controller sent it before the capture began.
+    """
+    if not client.captures_frames:
+        raise RuntimeError("Only the WebSocket interface can be captured")
+    if client.capture is not None:
+        raise RuntimeError("A capture of this controller is already running")
+    recorder = FrameRecorder(path)
+    if client.navigation is not None:
+        recorder.record(client.navigation.to_xml())
+    client.capture = recorder
+    try:
+        await asyncio.sleep(seconds)
+    finally:
+        client.capture = None
+        await recorder.close()
+    return recorder.frames
+
+
+def read_capture(path: str):
+    """(timestamp, frame) pairs of a capture file, in recorded order."""
+    with gzip.open(path, "rt", encoding="utf-8") as file:
+        for line in file:
+            if line.strip():
+                timestamp, frame = json.loads(line)
+                yield timestamp, frame
@@ -1,9 +1,34 @@
 import voluptuous as vol
 
 from homeassistant import config_entries
+from homeassistant.components.sensor import SensorDeviceClass
+from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
+from homeassistant.helpers import selector
 
-from .const import CONF_INTERVAL, CONF_IP, CONF_PASSWORD, CONF_PORT, DOMAIN
+from .const import (
+    BACKEND_BINARY,
+    BACKEND_WEBSOCKET,
+    BACKENDS,
+    CATEGORY_INTERVAL_KEYS,
+    CATEGORY_TEMPERATURES,
+    CONF_BACKEND,
+    CONF_DEADBAND,
+    CONF_DEADBAND_RELATIVE,
+    CONF_ELECTRICAL_POWER_ENTITY,
+    CONF_INTERVAL,
+    CONF_IP,
+    CONF_MAX_PUBLISH_INTERVAL,
+    CONF_MIN_PUBLISH_INTERVAL,
+    CONF_PASSWORD,
+    CONF_PORT,
+    DEFAULT_BINARY_PORT,
+    DEFAULT_CATEGORY_INTERVALS,
+    DEFAULT_PORT,
+    DEFAULT_PUBLISH_POLICIES,
+    DOMAIN,
+)
+from .publish import PublishPolicy
 
 
 class LuxtronikConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
@@ -11,6 +36,12 @@ class LuxtronikConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry):
+        """Return the options flow."""
+        return LuxtronikOptionsFlow()
+
     async def async_step_init(self, user_input=None) -> FlowResult:
         """Redirect initial step to user step, while enforcing uniqueness."""
         return await self.async_step_user(user_input)
@@ -27,6 +58,12 @@ class LuxtronikConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
             await self.async_set_unique_id(user_input[CONF_IP])
             self._abort_if_unique_id_configured()
+            # Port der Weboberfläche stehen gelassen → Port der Binärschnittstelle
+            if (
+                user_input.get(CONF_BACKEND) == BACKEND_BINARY
+                and user_input.get(CONF_PORT, DEFAULT_PORT) == DEFAULT_PORT
+            ):
+                user_input[CONF_PORT] = DEFAULT_BINARY_PORT
             # Alles ok → Integration anlegen
             return self.async_create_entry(
                 title=f"Luxtronik @ {user_input[CONF_IP]}",
@@ -40,6 +77,7 @@ class LuxtronikConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 vol.Required(CONF_PASSWORD): str,
                 vol.Optional(CONF_PORT, default=8214): int,
                 vol.Optional(CONF_INTERVAL, default=10): int,
+                vol.Optional(CONF_BACKEND, default=BACKEND_WEBSOCKET): vol.In(BACKENDS),
             }
         )
 
@@ -47,3 +85,89 @@ class LuxtronikConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             step_id="user",
             data_schema=data_schema,
         )
+
+
+def category_intervals(entry: config_entries.ConfigEntry) -> dict[str, int]:
+    """Per-category poll intervals of an entry, with defaults filled in."""
+    defaults = {
+        **DEFAULT_CATEGORY_INTERVALS,
+        CATEGORY_TEMPERATURES: entry.data.get(
+            CONF_INTERVAL, DEFAULT_CATEGORY_INTERVALS[CATEGORY_TEMPERATURES]
+        ),
+    }
+    return {
+        category: entry.options.get(key, defaults[category])
+        for category, key in CATEGORY_INTERVAL_KEYS.items()
+    }
+
+
+def publish_option_key(publish_class: str, setting: str) -> str:
+    """Options key of one publish setting, e.g. deadband_temperature."""
+    return f"{setting}_{publish_class}"
+
+
+def publish_settings(entry: config_entries.ConfigEntry) -> dict[str, dict]:
+    """Publish settings per class of an entry, with defaults filled in."""
+    return {
+        publish_class: {
+            setting: entry.options.get(
+                publish_option_key(publish_class, setting), default
+            )
+            for setting, default in defaults.items()
+        }
+        for publish_class, defaults in DEFAULT_PUBLISH_POLICIES.items()
+    }
+
+
+def publish_policies(entry: config_entries.ConfigEntry) -> dict[str, PublishPolicy]:
+    """PublishPolicy per publish class of an entry."""
+    return {
+        publish_class: PublishPolicy(
+            deadband=settings[CONF_DEADBAND],
+            deadband_relative=settings[CONF_DEADBAND_RELATIVE],
+            min_interval=settings[CONF_MIN_PUBLISH_INTERVAL],
+            max_interval=settings[CONF_MAX_PUBLISH_INTERVAL],
+        )
+        for publish_class, settings in publish_settings(entry).items()
+    }
+
+
+class LuxtronikOptionsFlow(config_entries.OptionsFlow):
+    """Handle Luxtronik2 options (poll intervals, publish policies, COP input)."""
+
+    async def async_step_init(self, user_input=None) -> FlowResult:
+        """Manage the options."""
+        if user_input is not None:
+            return self.async_create_entry(data=user_input)
+
+        current = category_intervals(self.config_entry)
+        fields = {
+            vol.Optional(key, default=current[category]): vol.All(
+                int, vol.Range(min=1)
+            )
+            for category, key in CATEGORY_INTERVAL_KEYS.items()
+        }
+        for publish_class, settings in publish_settings(self.config_entry).items():
+            for setting, value in settings.items():
+                key = publish_option_key(publish_class, setting)
+                fields[vol.Optional(key, default=value)] = vol.All(
+                    vol.Coerce(float), vol.Range(min=0)
+                )
+        # Electrical input power of the heat pump, for the COP
+        fields[
+            vol.Optional(
+                CONF_ELECTRICAL_POWER_ENTITY,
+                description={
+                    "suggested_value": self.config_entry.options.get(
+                        CONF_ELECTRICAL_POWER_ENTITY
+                    )
+                },
+            )
+        ] = selector.EntitySelector(
+            selector.EntitySelectorConfig(
+                domain="sensor", device_class=SensorDeviceClass.POWER
+            )
+        )
+        data_schema = vol.Schema(fields)
+
+        return self.async_show_form(step_id="init", data_schema=data_schema)
@@ -4,6 +4,188 @@ CONF_IP = "ip"
 CONF_PASSWORD = "password"
 CONF_PORT = "port"
 CONF_INTERVAL = "interval"
+CONF_BACKEND = "backend"
 
 DEFAULT_INTERVAL = 10
 DEFAULT_PORT = 8214
+
+# How values are read: the web interface (WebSocket, XML pages) or the
+# raw parameter and calculation arrays on their own TCP port
+BACKEND_WEBSOCKET = "websocket"
+BACKEND_BINARY = "binary"
+BACKENDS = (BACKEND_WEBSOCKET, BACKEND_BINARY)
+DEFAULT_BINARY_PORT = 8889
+
+PIPELINE_TIMEOUT = 5
+
+# Page categories polled by the client
+CATEGORY_TEMPERATURES = "temperatures"
+CATEGORY_ENERGY = "energy"
+CATEGORY_OUTPUTS = "outputs"
+CATEGORY_STATE = "state"
+# Settings pages: read after connecting, after writes and every few minutes
+CATEGORY_SETTINGS = "settings"
+
+CONF_INTERVAL_TEMPERATURES = "interval_temperatures"
+CONF_INTERVAL_ENERGY = "interval_energy"
+CONF_INTERVAL_OUTPUTS = "interval_outputs"
+CONF_INTERVAL_STATE = "interval_state"
+
+CATEGORY_INTERVAL_KEYS = {
+    CATEGORY_TEMPERATURES: CONF_INTERVAL_TEMPERATURES,
+    CATEGORY_ENERGY: CONF_INTERVAL_ENERGY,
+    CATEGORY_OUTPUTS: CONF_INTERVAL_OUTPUTS,
+    CATEGORY_STATE: CONF_INTERVAL_STATE,
+}
+
+DEFAULT_CATEGORY_INTERVALS = {
+    CATEGORY_TEMPERATURES: DEFAULT_INTERVAL,
+    CATEGORY_ENERGY: 60,
+    CATEGORY_OUTPUTS: 5,
+    CATEGORY_STATE: 5,
+}
+
+# Stable categories back off by this factor per unchanged poll,
+# up to BACKOFF_LIMIT times their configured interval.
+BACKOFF_FACTOR = 1.5
+BACKOFF_LIMIT = 4
+
+# Shared across all controllers of one Home Assistant instance
+DATA_HUB = f"{DOMAIN}_hub"
+MAX_CONCURRENT_POLLS = 4
+
+DATA_NAVIGATION_CACHE = f"{DOMAIN}_navigation_cache"
+NAVIGATION_STORAGE_KEY = f"{DOMAIN}.navigation"
+NAVIGATION_STORAGE_VERSION = 1
+NAVIGATION_SAVE_DELAY = 10
+
+# Connection supervision
+CONNECT_TIMEOUT = 10
+REQUEST_TIMEOUT = 10
+RECONNECT_MIN_DELAY = 1
+RECONNECT_MAX_DELAY = 300
+# Reconnect when no frame arrived for this many of the longest poll gaps
+WATCHDOG_INTERVALS = 3
+# Consecutive pipelined failures (that sequential polling recovered)
+# before pipelining is switched off
+PIPELINE_MAX_FAILURES = 3
+
+# Pseudo field notified after every poll cycle with fresh client stats
+STATS_FIELD = "__stats__"
+# A poll that starts this many seconds after it was due missed its deadline
+DEADLINE_SLACK = 1.0
+# Pseudo field notified when the client learned new fields of its pages
+REGISTRY_FIELD = "__registry__"
+# Poll interval of pages found in the navigation, while an entity uses them
+DISCOVERED_PAGE_INTERVAL = 60
+
+# Change-set streams (LuxtronikClient.stream): queued change sets per
+# consumer, and what happens to a full queue
+STREAM_DEFAULT_SIZE = 64
+STREAM_COALESCE = "coalesce"
+STREAM_DROP_OLDEST = "drop_oldest"
+
+# Profile service
+SERVICE_PROFILE = "profile"
+ATTR_CYCLES = "cycles"
+ATTR_TIMEOUT = "timeout"
+ATTR_TOP = "top"
+PROFILE_DEFAULT_CYCLES = 10
+PROFILE_DEFAULT_TIMEOUT = 300
+PROFILE_DEFAULT_TOP = 25
+
+PLATFORMS = ["sensor", "number", "select"]
+
+# Write path: writes to one parameter within this window collapse into the
+# last one, and batches are at least this far apart
+WRITE_COALESCE_WINDOW = 1.0
+SETTINGS_REFRESH_INTERVAL = 300
+
+SERVICE_SET_PARAMETER = "set_parameter"
+ATTR_PARAMETER = "parameter"
+ATTR_VALUE = "value"
+
+# Publishing: which state changes are worth a state write (and a recorder row)
+PUBLISH_TEMPERATURE = "temperature"
+PUBLISH_FLOW = "flow"
+PUBLISH_ENERGY = "energy"
+PUBLISH_POWER = "power"
+
+CONF_DEADBAND = "deadband"
+CONF_DEADBAND_RELATIVE = "deadband_relative"
+CONF_MIN_PUBLISH_INTERVAL = "min_publish_interval"
+CONF_MAX_PUBLISH_INTERVAL = "max_publish_interval"
+
+# Per publish class: absolute deadband (unit of the sensor), relative
+# deadband (percent of the last published value), min and max seconds
+# between state writes. Zero disables the respective limit.
+DEFAULT_PUBLISH_POLICIES = {
+    PUBLISH_TEMPERATURE: {
+        CONF_DEADBAND: 0.2,
+        CONF_DEADBAND_RELATIVE: 0,
+        CONF_MIN_PUBLISH_INTERVAL: 10,
+        CONF_MAX_PUBLISH_INTERVAL: 900,
+    },
+    PUBLISH_FLOW: {
+        CONF_DEADBAND: 0,
+        CONF_DEADBAND_RELATIVE: 5,
+        CONF_MIN_PUBLISH_INTERVAL: 10,
+        CONF_MAX_PUBLISH_INTERVAL: 900,
+    },
+    PUBLISH_ENERGY: {
+        CONF_DEADBAND: 0.5,
+        CONF_DEADBAND_RELATIVE: 0,
+        CONF_MIN_PUBLISH_INTERVAL: 60,
+        CONF_MAX_PUBLISH_INTERVAL: 900,
+    },
+    PUBLISH_POWER: {
+        CONF_DEADBAND: 50,
+        CONF_DEADBAND_RELATIVE: 5,
+        CONF_MIN_PUBLISH_INTERVAL: 10,
+        CONF_MAX_PUBLISH_INTERVAL: 900,
+    },
+}
+
+# High-rate sampling: ring buffer per field, aggregated every window
+SAMPLED_FIELDS = ("durchfluss", "vorlauf", "ruecklauf", "heizleistung")
+SAMPLE_CAPACITY = 900
+AGGREGATE_WINDOW = 60
+AGGREGATES = ("min", "max", "mean", "last")
+
+SERVICE_GET_SAMPLES = "get_samples"
+ATTR_FIELDS = "fields"
+ATTR_SECONDS = "seconds"
+
+# Capture service: raw frames to a gzip file, written every CAPTURE_BATCH
+SERVICE_CAPTURE = "capture"
+CAPTURE_DEFAULT_SECONDS = 300
+CAPTURE_MAX_SECONDS = 86400
+CAPTURE_BATCH = 64
+
+# Energy integration and COP
+DATA_ENERGY_STORE = f"{DOMAIN}_energy_store"
+ENERGY_STORAGE_KEY = f"{DOMAIN}.energy"
+ENERGY_STORAGE_VERSION = 1
+ENERGY_SAVE_DELAY = 60
+# The totals are saved at most this often while polling, and when the
+# client closes
+ENERGY_SAVE_INTERVAL = 300
+# Samples further apart than this are not integrated (reconnects, stalls)
+MAX_INTEGRATION_GAP = 300
+COP_WINDOW = 900
+# Below this much electrical energy in the window the COP is not meaningful
+COP_MIN_ELECTRICAL_KWH = 0.01
+CONF_ELECTRICAL_POWER_ENTITY = "electrical_power_entity"
+
+# Output analytics: rolling window of the per-day figures, and the
+# compressor starts within one hour from which it counts as short-cycling
+CYCLE_WINDOW = 86400
+SHORT_CYCLE_STARTS_PER_HOUR = 4
+
+# Last snapshot, restored (marked stale) after a restart; saved at most
+# this often while polling, and when the client closes
+DATA_SNAPSHOT_STORE = f"{DOMAIN}_snapshot_store"
+SNAPSHOT_STORAGE_KEY = f"{DOMAIN}.snapshot"
+SNAPSHOT_STORAGE_VERSION = 1
+SNAPSHOT_SAVE_DELAY = 10
+SNAPSHOT_SAVE_INTERVAL = 300
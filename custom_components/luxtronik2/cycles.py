@@ -0,0 +1,158 @@
+"""Compressor, defrost and heating-rod statistics from output transitions."""
+
+from collections import deque
+
+from .const import CYCLE_WINDOW, SHORT_CYCLE_STARTS_PER_HOUR
+
+HOUR = 3600
+
+
+class OutputTimeline:
+    """On/off history of one output within the last `window` seconds.
+
+    `since` is the time of the last transition; None while the current
+    state started before we saw it (first sample, after a gap), so that
+    segment is not counted as a full run or pause. `observed` is when the
+    current segment was first seen and `last` the latest sample, for the
+    on-time.
+    """
+
+    __slots__ = (
+        "window",
+        "state",
+        "since",
+        "observed",
+        "last",
+        "starts",
+        "runs",
+        "pauses",
+        "_on",
+    )
+
+    def __init__(self, window: float = CYCLE_WINDOW):
+        self.window = window
+        self.state: bool | None = None
+        self.since: float | None = None
+        self.observed: float | None = None
+        self.last: float | None = None
+        self.starts: deque[float] = deque()
+        # (end time, duration) of complete on and off segments
+        self.runs: deque[tuple[float, float]] = deque()
+        self.pauses: deque[tuple[float, float]] = deque()
+        # (start, end) of closed on segments
+        self._on: deque[tuple[float, float]] = deque()
+
+    def update(self, timestamp: float, state: bool | None):
+        if state is None:
+            self.gap()
+            return
+        if self.state is None:
+            self.state = state
+            self.observed = timestamp
+        elif state != self.state:
+            if self.state:
+                self._on.append((self.observed, timestamp))
+            else:
+                self.starts.append(timestamp)
+            if self.since is not None:
+                segments = self.runs if self.state else self.pauses
+                segments.append((timestamp, timestamp - self.since))
+            self.state = state
+            self.since = self.observed = timestamp
+        self.last = timestamp
+        self._trim(timestamp - self.window)
+
+    def gap(self):
+        """Transitions may have been missed; the current segment is partial."""
+        if self.state and self.observed is not None:
+            # Count the on-time seen so far, up to the last sample
+            self._on.append((self.observed, self.last))
+        self.state = None
+        self.since = None
+        self.observed = None
+
+    def _trim(self, start: float):
+        while self.starts and self.starts[0] < start:
+            self.starts.popleft()
+        for segments in (self.runs, self.pauses):
+            while segments and segments[0][0] < start:
+                segments.popleft()
+        while self._on and self._on[0][1] < start:
+            self._on.popleft()
+
+    def starts_within(self, now: float, seconds: float) -> int:
+        start = now - seconds
+        return sum(1 for timestamp in self.starts if timestamp >= start)
+
+    def on_time(self, now: float) -> float:
+        """Seconds switched on within the window."""
+        start = now - self.window
+        total = sum(end - max(begin, start) for begin, end in self._on if end > start)
+        if self.state and self.observed is not None:
+            total += now - max(self.observed, start)
+        return total
+
+    @staticmethod
+    def mean(segments) -> float | None:
+        if not segments:
+            return None
+        return sum(duration for _, duration in segments) / len(segments)
+
+
+class CycleTracker:
+    """Compressor starts, run and pause times, defrosts and ZWE on-time.
+
+    The keys of values() are the snapshot keys the client publishes.
+    """
+
+    KEYS = (
+        "verdichter_starts_1h",
+        "verdichter_takten",
+        "verdichter_starts_24h",
+        "verdichter_laufzeit_mittel",
+        "verdichter_pause_mittel",
+        "abtauungen_24h",
+        "zwe_laufzeit_24h",
+    )
+
+    def __init__(self, window: float = CYCLE_WINDOW):
+        self.window = window
+        self.compressor = OutputTimeline(window)
+        self.defrost = OutputTimeline(window)
+        self.heating_rods = {
+            key: OutputTimeline(window) for key in ("zwe1", "zwe2", "zwe3")
+        }
+
+    def update(self, timestamp: float, outputs) -> dict:
+        """Feed the current output states; returns the derived values.
+
+        `outputs` maps output keys to True/False/None (e.g. a snapshot).
+        """
+        self.compressor.update(timestamp, outputs.get("verdichter"))
+        self.defrost.update(timestamp, outputs.get("av_abtauventil"))
+        for key, timeline in self.heating_rods.items():
+            timeline.update(timestamp, outputs.get(key))
+        return self.values(timestamp)
+
+    def gap(self):
+        for timeline in (self.compressor, self.defrost, *self.heating_rods.values()):
+            timeline.gap()
+
+    def values(self, now: float) -> dict:
+        compressor = self.compressor
+        starts_1h = compressor.starts_within(now, HOUR)
+        return {
+            "verdichter_starts_1h": starts_1h,
+            "verdichter_takten": starts_1h >= SHORT_CYCLE_STARTS_PER_HOUR,
+            "verdichter_starts_24h": compressor.starts_within(now, self.window),
+            "verdichter_laufzeit_mittel": _minutes(compressor.mean(compressor.runs)),
+            "verdichter_pause_mittel": _minutes(compressor.mean(compressor.pauses)),
+            "abtauungen_24h": self.defrost.starts_within(now, self.window),
+            "zwe_laufzeit_24h": round(
+                sum(rod.on_time(now) for rod in self.heating_rods.values()) / HOUR, 2
+            ),
+        }
+
+
+def _minutes(seconds: float | None) -> float | None:
+    return round(seconds / 60, 1) if seconds is not None else None
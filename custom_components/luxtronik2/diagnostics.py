@@ -0,0 +1,49 @@
+"""Diagnostics download: config, poll statistics and last values."""
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import CONF_PASSWORD, DOMAIN
+
+TO_REDACT = {CONF_PASSWORD}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict:
+    """Return diagnostics for a config entry."""
+    client = hass.data[DOMAIN][entry.entry_id]
+    navigation = client.navigation
+
+    return {
+        "entry": {
+            "data": async_redact_data(dict(entry.data), TO_REDACT),
+            "options": dict(entry.options),
+        },
+        "client": {
+            "backend": type(client).__name__,
+            "available": client.available,
+            "pipeline": client.pipeline,
+            "intervals": client.intervals,
+            "page_ids": {
+                "temperatures": client.temp_id,
+                "energy": client.waerm_id,
+                "outputs": client.output_id,
+                "state": client.state_id,
+            },
+            "navigation_pages": len(navigation) if navigation else 0,
+            "discovered_pages": client.discovered_pages,
+            "fields": client.registry.as_dict(),
+        },
+        "stats": client.stats.as_dict(),
+        "samples": {
+            key: [list(sample) for sample in buffer.samples()]
+            for key, buffer in client.samples.items()
+        },
+        "snapshot": {
+            "version": client.snapshot.version,
+            "timestamp": client.snapshot.timestamp,
+            "values": client.snapshot.as_dict(),
+        },
+    }
@@ -0,0 +1,63 @@
+"""Energy totals integrated from power samples, and a rolling COP."""
+
+from collections import deque
+
+from .const import COP_MIN_ELECTRICAL_KWH, COP_WINDOW, MAX_INTEGRATION_GAP
+
+
+class EnergyIntegrator:
+    """kWh total of a power signal in W, by the trapezoidal rule.
+
+    Samples more than `max_gap` seconds apart, and any sample after gap(),
+    start a new segment instead of bridging the hole with a straight line.
+    """
+
+    __slots__ = ("total", "max_gap", "_time", "_power")
+
+    def __init__(self, total: float = 0.0, max_gap: float = MAX_INTEGRATION_GAP):
+        self.total = total
+        self.max_gap = max_gap
+        self._time = None
+        self._power = None
+
+    def add(self, timestamp: float, power: float | None) -> float:
+        """Feed one sample; returns the kWh it added."""
+        if power is None:
+            self.gap()
+            return 0.0
+        delta = 0.0
+        if self._time is not None:
+            elapsed = timestamp - self._time
+            if elapsed <= 0:
+                return 0.0
+            if elapsed <= self.max_gap:
+                delta = (self._power + power) / 2 * elapsed / 3_600_000
+                self.total += delta
+        self._time = timestamp
+        self._power = power
+        return delta
+
+    def gap(self):
+        """The signal was not observed since the last sample."""
+        self._time = None
+        self._power = None
+
+
+class RollingCop:
+    """Thermal over electrical energy within the last `window` seconds."""
+
+    def __init__(self, window: float = COP_WINDOW):
+        self.window = window
+        # (timestamp, thermal kWh total, electrical kWh total)
+        self._points: deque[tuple[float, float, float]] = deque()
+
+    def add(self, timestamp: float, thermal: float, electrical: float) -> float | None:
+        points = self._points
+        points.append((timestamp, thermal, electrical))
+        while len(points) > 1 and points[1][0] <= timestamp - self.window:
+            points.popleft()
+        _, thermal_start, electrical_start = points[0]
+        electrical_used = electrical - electrical_start
+        if electrical_used < COP_MIN_ELECTRICAL_KWH:
+            return None
+        return round((thermal - thermal_start) / electrical_used, 2)
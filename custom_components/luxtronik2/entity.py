@@ -0,0 +1,97 @@
+from datetime import UTC, datetime
+
+from homeassistant.core import callback
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.event import async_call_later
+
+from .const import DOMAIN
+from .publish import PublishGate, PublishPolicy
+
+
+class LuxtronikEntity(Entity):
+    """Base for entities that show one field of a LuxtronikClient."""
+
+    _attr_has_entity_name = True
+    _attr_should_poll = False
+
+    def __init__(
+        self, client, name: str, field: str, policy: PublishPolicy | None = None
+    ):
+        self._client = client
+        self._field = field
+        # Without a policy every change is written
+        self._gate = PublishGate(policy) if policy is not None else None
+        self._cancel_publish = None
+
+        self._attr_name = name
+        self._attr_unique_id = f"{client.device_id}_{field}"
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, client.device_id)},
+            name=client.name,
+            manufacturer="Alpha Innotec",
+            model="Luxtronik 2.0",
+            configuration_url=f"http://{client.ip}",
+        )
+
+    @property
+    def available(self) -> bool:
+        """Unavailable while the client is disconnected.
+
+        A value restored from the last run counts as available until the
+        client reads it again or fails to connect.
+        """
+        return self._client.available or self._client.is_stale(self._field)
+
+    @property
+    def extra_state_attributes(self) -> dict | None:
+        """Mark a restored value as stale, with the time it was read."""
+        if not self._client.is_stale(self._field):
+            return None
+        restored_at = self._client.restored_at
+        return {
+            "stale": True,
+            "last_read": (
+                datetime.fromtimestamp(restored_at, UTC).isoformat()
+                if restored_at is not None
+                else None
+            ),
+        }
+
+    async def async_added_to_hass(self):
+        """Subscribe to client updates of this entity's field."""
+        self.async_on_remove(
+            self._client.subscribe(self._field, self._handle_client_update)
+        )
+        self.async_on_remove(self._cancel_pending_publish)
+
+    @callback
+    def _handle_client_update(self):
+        """Handle push-update from client."""
+        if self._gate is None:
+            self.async_write_ha_state()
+            return
+
+        delay = self._gate.check(self._client.get_value(self._field), self.available)
+        # Also when the value is back to the published one: a held-back
+        # write must not fire later
+        self._cancel_pending_publish()
+        if delay is None:
+            return
+        if delay:
+            self._cancel_publish = async_call_later(self.hass, delay, self._publish)
+        else:
+            self._publish()
+
+    @callback
+    def _publish(self, _now=None):
+        """Write the current state and remember it as the last published one."""
+        self._cancel_publish = None
+        self._gate.published(self._client.get_value(self._field), self.available)
+        self.async_write_ha_state()
+
+    @callback
+    def _cancel_pending_publish(self):
+        if self._cancel_publish is not None:
+            self._cancel_publish()
+            self._cancel_publish = None
@@ -0,0 +1,267 @@
+"""Field schema of the Luxtronik pages and the table-driven page parser."""
+
+import re
+from typing import NamedTuple
+
+from .const import (
+    CATEGORY_ENERGY,
+    CATEGORY_OUTPUTS,
+    CATEGORY_STATE,
+    CATEGORY_TEMPERATURES,
+)
+
+TYPE_FLOAT = "float"
+TYPE_STR = "str"
+TYPE_BOOL = "bool"
+
+
+class Field(NamedTuple):
+    """One value on a controller page."""
+
+    name: str  # label as rendered by the controller
+    key: str
+    unit: str | None
+    type: str
+    category: str
+
+
+FIELDS: tuple[Field, ...] = (
+    # Temperaturen
+    Field("Vorlauf", "vorlauf", "°C", TYPE_FLOAT, CATEGORY_TEMPERATURES),
+    Field("Rücklauf", "ruecklauf", "°C", TYPE_FLOAT, CATEGORY_TEMPERATURES),
+    Field("Rückl.-Soll", "ruecklauf_soll", "°C", TYPE_FLOAT, CATEGORY_TEMPERATURES),
+    Field("Heissgas", "heissgas", "°C", TYPE_FLOAT, CATEGORY_TEMPERATURES),
+    Field("Aussentemperatur", "aussentemperatur", "°C", TYPE_FLOAT, CATEGORY_TEMPERATURES),
+    Field("Mitteltemperatur", "mitteltemperatur", "°C", TYPE_FLOAT, CATEGORY_TEMPERATURES),
+    Field("Warmwasser-Ist", "warmwasser_ist", "°C", TYPE_FLOAT, CATEGORY_TEMPERATURES),
+    Field("Warmwasser-Soll", "warmwasser_soll", "°C", TYPE_FLOAT, CATEGORY_TEMPERATURES),
+    Field("Solarkollektor", "solarkollektor", "°C", TYPE_FLOAT, CATEGORY_TEMPERATURES),
+    Field("Solarspeicher", "solarspeicher", "°C", TYPE_FLOAT, CATEGORY_TEMPERATURES),
+    Field(
+        "Externe Energ.Quelle",
+        "externe_energiequelle",
+        "°C",
+        TYPE_FLOAT,
+        CATEGORY_TEMPERATURES,
+    ),
+    # Wärmemenge
+    Field("Heizung", "waerme_heizung", "kWh", TYPE_FLOAT, CATEGORY_ENERGY),
+    Field("Warmwasser", "waerme_ww", "kWh", TYPE_FLOAT, CATEGORY_ENERGY),
+    Field("Gesamt", "waerme_gesamt", "kWh", TYPE_FLOAT, CATEGORY_ENERGY),
+    Field("Durchfluss", "durchfluss", "l/h", TYPE_FLOAT, CATEGORY_ENERGY),
+    # Rendered with the date of the last reset, e.g. "seit : 14. 2.2025"
+    Field("seit :", "waerme_seit_datum", "kWh", TYPE_FLOAT, CATEGORY_ENERGY),
+    Field("seit Reset:", "waerme_seit_reset", "kWh", TYPE_FLOAT, CATEGORY_ENERGY),
+    # Ausgänge
+    Field("AV-Abtauventil", "av_abtauventil", None, TYPE_BOOL, CATEGORY_OUTPUTS),
+    Field("BUP", "bup", None, TYPE_BOOL, CATEGORY_OUTPUTS),
+    Field("FUP 1", "fup1", None, TYPE_BOOL, CATEGORY_OUTPUTS),
+    Field("HUP", "hup", None, TYPE_BOOL, CATEGORY_OUTPUTS),
+    Field("Ventilation", "ventilation", None, TYPE_BOOL, CATEGORY_OUTPUTS),
+    Field("Ventil.-BOSUP", "ventil_bosup", None, TYPE_BOOL, CATEGORY_OUTPUTS),
+    Field("Verdichter", "verdichter", None, TYPE_BOOL, CATEGORY_OUTPUTS),
+    Field("ZIP", "zip", None, TYPE_BOOL, CATEGORY_OUTPUTS),
+    Field("ZUP", "zup", None, TYPE_BOOL, CATEGORY_OUTPUTS),
+    Field("ZWE 1", "zwe1", None, TYPE_BOOL, CATEGORY_OUTPUTS),
+    Field("ZWE 2 - SST", "zwe2", None, TYPE_BOOL, CATEGORY_OUTPUTS),
+    Field("ZWE 3", "zwe3", None, TYPE_BOOL, CATEGORY_OUTPUTS),
+    Field("SLP", "slp", None, TYPE_BOOL, CATEGORY_OUTPUTS),
+    Field("FUP 2", "fup2", None, TYPE_BOOL, CATEGORY_OUTPUTS),
+    Field("FUP 3", "fup3", None, TYPE_BOOL, CATEGORY_OUTPUTS),
+    # Anlagenstatus
+    Field("Betriebszustand", "Betriebszustand", None, TYPE_STR, CATEGORY_STATE),
+    Field("Softwarestand", "firmware", None, TYPE_STR, CATEGORY_STATE),
+)
+
+# name -> Field, per category
+FIELDS_BY_CATEGORY: dict[str, dict[str, Field]] = {}
+for _field in FIELDS:
+    FIELDS_BY_CATEGORY.setdefault(_field.category, {})[_field.name] = _field
+del _field
+
+# Unit suffixes the controller appends to numbers
+UNITS = ("°C", "kWh", "l/h")
+
+_NAME_VALUE = re.compile(r"<name>([^<]+)</name><value>([^<]+)</value>")
+
+# Trailing date some labels carry, e.g. "seit : 14. 2.2025"
+_LABEL_DATE = re.compile(r"\s*\d{1,2}\.\s?\d{1,2}\.\d{4}$")
+
+
+def label(name: str) -> str:
+    """Label without a trailing date, so it stays the same across resets."""
+    return _LABEL_DATE.sub("", name)
+
+
+def to_number(raw: str, unit: str | None = None) -> float | None:
+    """'32.1°C' -> 32.1; None for anything that is not a number.
+
+    Checks the digits up front instead of letting float() raise.
+    """
+    v = raw.strip()
+    if unit and v.endswith(unit):
+        v = v[: -len(unit)].rstrip()
+    else:
+        for suffix in UNITS:
+            if v.endswith(suffix):
+                v = v[: -len(suffix)].rstrip()
+                break
+
+    digits = v[1:] if v.startswith("-") else v
+    if not digits.replace(".", "", 1).isdecimal():
+        return None
+    return float(v)
+
+
+# Output and input states as rendered by the controller
+BOOLEANS = {"Ein": True, "Aus": False}
+
+
+def convert(field: Field, raw: str):
+    """Value of `field` from its rendered text."""
+    if field.type == TYPE_FLOAT:
+        return to_number(raw, field.unit)
+    if field.type == TYPE_BOOL:
+        return BOOLEANS.get(raw.strip())
+    return raw
+
+
+def parse_page(
+    xml: str,
+    category: str,
+    fields: dict[str, Field] | None = None,
+    unknown: list | None = None,
+) -> dict:
+    """Single pass over a page: {key: converted value} for its fields.
+
+    `fields` (label -> Field) defaults to the fields of `category` in
+    FIELDS; labels that are not among them go to `unknown` as
+    (label, raw value).
+    """
+    if fields is None:
+        fields = FIELDS_BY_CATEGORY.get(category, {})
+    values = {}
+
+    for name, raw in _NAME_VALUE.findall(xml):
+        field = fields.get(name)
+        if field is None:
+            field = fields.get(label(name))
+            if field is None:
+                if unknown is not None:
+                    unknown.append((name, raw))
+                continue
+        values[field.key] = convert(field, raw)
+
+    return values
+
+
+class Parameter(NamedTuple):
+    """One setting the controller accepts SET commands for."""
+
+    name: str  # label on the settings page
+    key: str
+    page: tuple[str, ...]  # navigation path of the settings page
+    unit: str | None = None
+    scale: int = 1  # SET takes value * scale as an integer
+    minimum: float | None = None
+    maximum: float | None = None
+    step: float | None = None
+    options: tuple[str, ...] = ()  # select: SET takes the option index
+
+    def to_raw(self, value) -> str:
+        """Value as sent in SET;set_<id>;<raw>; ValueError if out of range."""
+        if self.options:
+            if value not in self.options:
+                raise ValueError(f"{self.key}: {value!r} is not one of {self.options}")
+            return str(self.options.index(value))
+        value = float(value)
+        if not self.minimum <= value <= self.maximum:
+            raise ValueError(
+                f"{self.key}: {value} outside {self.minimum}..{self.maximum}"
+            )
+        return str(round(value * self.scale))
+
+    def matches(self, current, requested) -> bool:
+        """Whether the value read back confirms the requested one."""
+        if self.options or current is None:
+            return current == requested
+        return abs(current - float(requested)) < (self.step or 1) / 2
+
+
+_OPERATING_MODES = ("Automatik", "Zweiter Wärmeerzeuger", "Party", "Ferien", "Aus")
+
+PARAMETERS: tuple[Parameter, ...] = (
+    Parameter(
+        "Warmwasser-Soll",
+        "warmwasser_soll_einstellung",
+        ("Einstellungen", "Warmwasser"),
+        "°C",
+        10,
+        30.0,
+        65.0,
+        0.5,
+    ),
+    Parameter(
+        "Endpunkt",
+        "heizkurve_endpunkt",
+        ("Einstellungen", "Heizkurven"),
+        "°C",
+        10,
+        20.0,
+        70.0,
+        0.5,
+    ),
+    Parameter(
+        "Parallelversch.",
+        "heizkurve_parallelverschiebung",
+        ("Einstellungen", "Heizkurven"),
+        "°C",
+        10,
+        5.0,
+        35.0,
+        0.5,
+    ),
+    Parameter(
+        "Heizung",
+        "betriebsart_heizung",
+        ("Einstellungen", "Betriebsart"),
+        options=_OPERATING_MODES,
+    ),
+    Parameter(
+        "Warmwasser",
+        "betriebsart_warmwasser",
+        ("Einstellungen", "Betriebsart"),
+        options=_OPERATING_MODES,
+    ),
+)
+
+PARAMETERS_BY_KEY = {parameter.key: parameter for parameter in PARAMETERS}
+
+# navigation path -> label -> Parameter
+PARAMETERS_BY_PAGE: dict[tuple[str, ...], dict[str, Parameter]] = {}
+for _parameter in PARAMETERS:
+    PARAMETERS_BY_PAGE.setdefault(_parameter.page, {})[_parameter.name] = _parameter
+del _parameter
+
+_ID_NAME_VALUE = re.compile(
+    r"<item id='([^']*)'><name>([^<]+)</name><value>([^<]*)</value>"
+)
+
+
+def parse_settings_page(xml: str, page: tuple[str, ...]) -> tuple[dict, dict]:
+    """({key: value}, {key: item id}) of the parameters on a settings page."""
+    parameters = PARAMETERS_BY_PAGE.get(page, {})
+    values = {}
+    item_ids = {}
+
+    for item_id, name, raw in _ID_NAME_VALUE.findall(xml):
+        parameter = parameters.get(name)
+        if parameter is None:
+            continue
+        item_ids[parameter.key] = item_id
+        if parameter.options:
+            values[parameter.key] = raw if raw in parameter.options else None
+        else:
+            values[parameter.key] = to_number(raw, parameter.unit)
+
+    return values, item_ids
@@ -0,0 +1,35 @@
+"""State shared by all Luxtronik controllers of one Home Assistant instance."""
+
+import asyncio
+
+from .const import MAX_CONCURRENT_POLLS
+
+# Successive multiples of the golden ratio spread out evenly in [0, 1)
+_GOLDEN = 0.6180339887498949
+
+
+class LuxtronikHub:
+    """Concurrency limit and poll staggering across controllers.
+
+    Every controller gets a phase in [0, 1); its scheduler offsets its
+    polls by that fraction of their interval, so controllers with equal
+    intervals do not all fire on the same tick. The limiter caps how many
+    controllers have a request batch (or a connect) in flight at once.
+    """
+
+    def __init__(self, max_concurrent: int = MAX_CONCURRENT_POLLS):
+        self.limiter = asyncio.Semaphore(max_concurrent)
+        self._slots: dict[str, int] = {}
+
+    def phase(self, device_id: str) -> float:
+        """Reserve (or reuse) the stagger phase of a controller."""
+        slot = self._slots.get(device_id)
+        if slot is None:
+            used = set(self._slots.values())
+            slot = next(i for i in range(len(used) + 1) if i not in used)
+            self._slots[device_id] = slot
+        return (slot * _GOLDEN) % 1.0
+
+    def release(self, device_id: str):
+        """Free the phase of a controller that was unloaded."""
+        self._slots.pop(device_id, None)
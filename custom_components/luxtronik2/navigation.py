@@ -0,0 +1,93 @@
+"""The controller's navigation tree: every page id, its name and its parent."""
+
+import re
+
+_TOKEN = re.compile(r"<item id='([^']*)'>|<name>([^<]*)</name>|</item>")
+
+
+class NavigationTree:
+    """Page ids of one controller with their hierarchy."""
+
+    def __init__(self, nodes: dict[str, tuple[str, str | None]]):
+        # page id -> (name, parent page id); insertion order = document order
+        self.nodes = nodes
+
+    @classmethod
+    def parse(cls, xml: str) -> "NavigationTree":
+        """Walk the <Navigation> XML once and collect every item."""
+        nodes: dict[str, tuple[str, str | None]] = {}
+        stack: list[str] = []
+        for m in _TOKEN.finditer(xml):
+            item_id, name = m.group(1), m.group(2)
+            if item_id is not None:
+                parent = stack[-1] if stack else None
+                stack.append(item_id)
+                nodes[item_id] = ("", parent)
+            elif name is not None:
+                # The first <name> inside an item is its own
+                if stack and not nodes[stack[-1]][0]:
+                    nodes[stack[-1]] = (name, nodes[stack[-1]][1])
+            elif stack:
+                stack.pop()
+        return cls(nodes)
+
+    def find(self, name: str) -> str | None:
+        """Id of the first page called `name`."""
+        for page_id, (page_name, _) in self.nodes.items():
+            if page_name == name:
+                return page_id
+        return None
+
+    def find_path(self, names) -> str | None:
+        """Id of the page reached by following `names` from the top."""
+        page_id = None
+        for name in names:
+            for child in self.children(page_id):
+                if self.nodes[child][0] == name:
+                    page_id = child
+                    break
+            else:
+                return None
+        return page_id
+
+    def path(self, page_id: str) -> list[str]:
+        """Names from the top of the tree down to `page_id`."""
+        names = []
+        while page_id in self.nodes:
+            name, page_id = self.nodes[page_id]
+            names.append(name)
+        return names[::-1]
+
+    def children(self, page_id: str | None) -> list[str]:
+        """Ids of the pages directly below `page_id` (None: top level)."""
+        return [
+            child for child, (_, parent) in self.nodes.items() if parent == page_id
+        ]
+
+    def to_xml(self) -> str:
+        """<Navigation> XML that parse() reads back into this tree."""
+        parts = ["<Navigation>"]
+
+        def render(parent):
+            for child in self.children(parent):
+                parts.append(f"<item id='{child}'><name>{self.nodes[child][0]}</name>")
+                render(child)
+                parts.append("</item>")
+
+        render(None)
+        parts.append("</Navigation>")
+        return "".join(parts)
+
+    def as_dict(self) -> dict:
+        """JSON-serialisable form, for the navigation cache."""
+        return {page_id: list(node) for page_id, node in self.nodes.items()}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "NavigationTree":
+        return cls({page_id: (name, parent) for page_id, (name, parent) in data.items()})
+
+    def __eq__(self, other):
+        return isinstance(other, NavigationTree) and self.nodes == other.nodes
+
+    def __len__(self):
+        return len(self.nodes)
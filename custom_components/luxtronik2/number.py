@@ -0,0 +1,55 @@
+from homeassistant.components.number import NumberDeviceClass, NumberEntity, NumberMode
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .const import DOMAIN
+from .entity import LuxtronikEntity
+from .fields import PARAMETERS_BY_KEY
+from .writer import WriteNotConfirmed
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+):
+    client = hass.data[DOMAIN][entry.entry_id]
+
+    number_defs = [
+        ("Warmwasser-Soll Einstellung", "warmwasser_soll_einstellung"),
+        ("Heizkurve Endpunkt", "heizkurve_endpunkt"),
+        ("Heizkurve Parallelverschiebung", "heizkurve_parallelverschiebung"),
+    ]
+
+    async_add_entities(
+        LuxtronikNumber(client, name, field) for name, field in number_defs
+    )
+
+
+class LuxtronikNumber(LuxtronikEntity, NumberEntity):
+    """Einstellbarer Wert, geschrieben per SET."""
+
+    _attr_mode = NumberMode.BOX
+
+    def __init__(self, client, name: str, field: str):
+        super().__init__(client, name, field)
+        parameter = PARAMETERS_BY_KEY[field]
+
+        self._attr_native_unit_of_measurement = parameter.unit
+        self._attr_native_min_value = parameter.minimum
+        self._attr_native_max_value = parameter.maximum
+        self._attr_native_step = parameter.step
+        if parameter.unit == "°C":
+            self._attr_device_class = NumberDeviceClass.TEMPERATURE
+
+    @property
+    def native_value(self):
+        return self._client.get_value(self._field)
+
+    async def async_set_native_value(self, value: float) -> None:
+        try:
+            await self._client.write(self._field, value)
+        except (ValueError, ConnectionError, WriteNotConfirmed) as err:
+            raise HomeAssistantError(str(err)) from err
@@ -0,0 +1,109 @@
+"""Profile a number of poll cycles of a running LuxtronikClient.
+
+Nothing here touches the client until a profile is requested: the
+profiled `_poll` is installed as an instance attribute for the duration
+of the capture and deleted afterwards, so the normal path is the plain
+class method again.
+"""
+
+import asyncio
+import contextlib
+import cProfile
+import io
+import logging
+import os
+import pstats
+import re
+
+# pstats restriction matching the functions of this package
+_OWN_CODE = re.escape(os.path.dirname(__file__))
+
+_LOGGER = logging.getLogger(__name__)
+
+# Only one profiler can be active per interpreter (enforced since 3.12),
+# so one profile at a time across all controllers
+_RUNNING = asyncio.Lock()
+
+
+class PollProfiler:
+    """Capture `cycles` poll cycles of `client` with cProfile."""
+
+    def __init__(self, client, cycles: int):
+        self._client = client
+        self._cycles = cycles
+        self._profile = cProfile.Profile()
+        self._done = asyncio.get_running_loop().create_future()
+        self.captured = 0
+
+    async def async_run(self, timeout: float) -> pstats.Stats:
+        """Profile the next cycles; returns whatever was captured in `timeout`.
+
+        While the client awaits the controller, other tasks on the event
+        loop run and show up in the profile as well; sort by the client's
+        functions to tell them apart.
+        """
+        if _RUNNING.locked():
+            raise RuntimeError("A profile is already running, try again when it is done")
+        async with _RUNNING:
+            return await self._run(timeout)
+
+    async def _run(self, timeout: float) -> pstats.Stats:
+        client = self._client
+        if "_poll" in vars(client):
+            raise RuntimeError("A profile of this controller is already running")
+
+        original = client._poll
+
+        async def profiled_poll(categories=None):
+            enabled = self._enable()
+            try:
+                return await original(categories)
+            finally:
+                if enabled:
+                    self._disable()
+                    self.captured += 1
+                if self.captured >= self._cycles and not self._done.done():
+                    self._done.set_result(None)
+
+        client._poll = profiled_poll
+        try:
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(asyncio.shield(self._done), timeout)
+        finally:
+            del client._poll
+
+        if not self.captured:
+            # pstats cannot be built from an empty profile
+            raise RuntimeError(f"No poll cycle could be profiled within {timeout:g} s")
+        return pstats.Stats(self._profile)
+
+    def _enable(self) -> bool:
+        """Start profiling; False, and the cycle runs unprofiled, if it cannot.
+
+        Another profiling tool (a debugger, a second cProfile) makes
+        enable() raise; that must not fail the poll.
+        """
+        try:
+            self._profile.enable()
+        except ValueError as err:
+            _LOGGER.debug("Poll cycle not profiled: %s", err)
+            return False
+        return True
+
+    def _disable(self):
+        try:
+            self._profile.disable()
+        except ValueError as err:
+            _LOGGER.debug("Could not stop profiling: %s", err)
+
+    @staticmethod
+    def summary(stats: pstats.Stats, top: int) -> str:
+        """This integration's `top` functions by cumulative time.
+
+        The event loop itself dominates an unfiltered listing; the stats
+        file keeps everything.
+        """
+        stream = io.StringIO()
+        stats.stream = stream
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(_OWN_CODE, top)
+        return stream.getvalue()
@@ -0,0 +1,59 @@
+"""Decide which value changes are significant enough to publish."""
+
+import time
+from typing import NamedTuple
+
+
+class PublishPolicy(NamedTuple):
+    """Significant-change policy of one entity."""
+
+    deadband: float = 0.0  # absolute, in the sensor's unit
+    deadband_relative: float = 0.0  # percent of the last published value
+    min_interval: float = 0.0  # seconds between two state writes, at least
+    max_interval: float = 0.0  # held-back changes are written after this
+
+
+class PublishGate:
+    """Per-entity state of a PublishPolicy.
+
+    check() says when to write the state: 0 for now, a positive delay for
+    later (too soon after the last write, or a small change held back until
+    max_interval) or None for never. Whoever writes calls published().
+    """
+
+    __slots__ = ("policy", "_clock", "_value", "_available", "_time")
+
+    def __init__(self, policy: PublishPolicy, clock=time.monotonic):
+        self.policy = policy
+        self._clock = clock
+        self._value = None
+        self._available = None
+        self._time = None
+
+    def check(self, value, available: bool) -> float | None:
+        policy = self.policy
+        if self._time is None or available is not self._available:
+            return 0
+        since = self._clock() - self._time
+        if self._significant(value):
+            return max(0.0, policy.min_interval - since)
+        if value == self._value or not policy.max_interval:
+            return None
+        return max(0.0, policy.max_interval - since)
+
+    def published(self, value, available: bool):
+        self._value = value
+        self._available = available
+        self._time = self._clock()
+
+    def _significant(self, value) -> bool:
+        last = self._value
+        if value == last:
+            return False
+        if not isinstance(value, (int, float)) or not isinstance(last, (int, float)):
+            return True
+        policy = self.policy
+        threshold = max(
+            policy.deadband, abs(last) * policy.deadband_relative / 100
+        )
+        return abs(value - last) >= threshold
@@ -0,0 +1,138 @@
+"""Every value a controller shows, learned from the pages of its navigation."""
+
+import re
+
+from .fields import (
+    BOOLEANS,
+    FIELDS_BY_CATEGORY,
+    PARAMETERS_BY_PAGE,
+    TYPE_BOOL,
+    TYPE_FLOAT,
+    TYPE_STR,
+    Field,
+    label,
+)
+
+_UMLAUTS = str.maketrans({"ä": "ae", "ö": "oe", "ü": "ue", "ß": "ss"})
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+# "13025h", "4.20 kW", "-3.5°C", "1"
+_NUMBER_UNIT = re.compile(r"-?\d+(?:\.\d+)?\s*(\S*)")
+# Suffixes taken as units; anything else makes the value text
+_UNITS = frozenset(("°C", "K", "kWh", "kW", "W", "l/h", "h", "min", "s", "bar", "V", "%", "Hz"))
+
+# Keys declared in FIELDS; everything else in the registry was learned
+_DECLARED = frozenset(
+    field.key for fields in FIELDS_BY_CATEGORY.values() for field in fields.values()
+)
+
+
+def slugify(text: str) -> str:
+    """'Betriebstund. VD1' -> 'betriebstund_vd1'."""
+    return _NON_WORD.sub("_", text.lower().translate(_UMLAUTS)).strip("_")
+
+
+def infer_field(name: str, raw: str, key: str, category: str) -> Field:
+    """Field for a label seen the first time, typed by its rendered value."""
+    value = raw.strip()
+    if value in BOOLEANS:
+        return Field(name, key, None, TYPE_BOOL, category)
+    m = _NUMBER_UNIT.fullmatch(value)
+    if m is not None and (not m.group(1) or m.group(1) in _UNITS):
+        return Field(name, key, m.group(1) or None, TYPE_FLOAT, category)
+    return Field(name, key, None, TYPE_STR, category)
+
+
+class FieldRegistry:
+    """Fields per page category: the ones in FIELDS plus learned ones.
+
+    The four polled pages keep their categories; every other page of the
+    navigation tree gets one from its path. Labels nobody declared are
+    learned from the first read of a page, keyed by page path and label.
+    Learned fields go into the navigation cache via as_dict()/load(), so
+    each page is read for discovery once per controller.
+    """
+
+    def __init__(self):
+        self.paths: dict[str, tuple[str, ...]] = {}
+        self.fields: dict[str, dict[str, Field]] = {
+            category: dict(fields) for category, fields in FIELDS_BY_CATEGORY.items()
+        }
+        self._categories = {
+            field.key: field.category
+            for fields in self.fields.values()
+            for field in fields.values()
+        }
+        # Categories whose page was read at least once
+        self._read: set[str] = set()
+
+    def add_page(self, path, category: str | None = None) -> str:
+        """Register the page at navigation `path`; returns its category."""
+        path = tuple(path)
+        if category is None:
+            category = slugify(" ".join(path))
+        self.paths[category] = path
+        return category
+
+    def unread(self, categories) -> list[str]:
+        """Those of `categories` whose fields are not known yet."""
+        return [category for category in categories if category not in self._read]
+
+    def learn(self, category: str, items) -> list[Field]:
+        """Add the (label, raw value) pairs not known yet; returns the new fields.
+
+        Labels of writable parameters on a settings page stay with the
+        number and select entities.
+        """
+        self._read.add(category)
+        fields = self.fields.setdefault(category, {})
+        path = self.paths.get(category, (category,))
+        parameters = PARAMETERS_BY_PAGE.get(path, {})
+        prefix = slugify(" ".join(path))
+        new = []
+        for name, raw in items:
+            name = label(name)
+            if name in fields or name in parameters:
+                continue
+            key = base = f"{prefix}_{slugify(name)}"
+            suffix = 1
+            while key in self._categories:
+                suffix += 1
+                key = f"{base}_{suffix}"
+            field = fields[name] = infer_field(name, raw, key, category)
+            self._categories[key] = category
+            new.append(field)
+        return new
+
+    def category_of(self, key: str) -> str | None:
+        return self._categories.get(key)
+
+    def page_name(self, category: str) -> str:
+        path = self.paths.get(category)
+        return path[-1] if path else category
+
+    def __iter__(self):
+        for fields in self.fields.values():
+            yield from fields.values()
+
+    def __len__(self):
+        return len(self._categories)
+
+    def as_dict(self) -> dict:
+        """Learned fields per read category, JSON-serialisable."""
+        return {
+            category: [
+                [field.name, field.key, field.unit, field.type]
+                for field in self.fields.get(category, {}).values()
+                if field.key not in _DECLARED
+            ]
+            for category in sorted(self._read)
+        }
+
+    def load(self, data: dict):
+        """Restore what as_dict() returned."""
+        for category, fields in data.items():
+            self._read.add(category)
+            known = self.fields.setdefault(category, {})
+            for name, key, unit, type_ in fields:
+                known[name] = Field(name, key, unit, type_, category)
+                self._categories[key] = category
@@ -0,0 +1,71 @@
+"""Fixed-size sample buffers for high-rate fields."""
+
+from array import array
+
+
+class RingBuffer:
+    """The last `capacity` (timestamp, value) samples of one field.
+
+    Two preallocated double arrays; appending overwrites the oldest
+    sample and never allocates.
+    """
+
+    __slots__ = ("_times", "_values", "_next", "_size")
+
+    def __init__(self, capacity: int):
+        self._times = array("d", bytes(8 * capacity))
+        self._values = array("d", bytes(8 * capacity))
+        self._next = 0
+        self._size = 0
+
+    @property
+    def capacity(self) -> int:
+        return len(self._values)
+
+    def __len__(self):
+        return self._size
+
+    def append(self, timestamp: float, value: float):
+        index = self._next
+        self._times[index] = timestamp
+        self._values[index] = value
+        self._next = (index + 1) % len(self._values)
+        if self._size < len(self._values):
+            self._size += 1
+
+    def _newest_first(self):
+        capacity = len(self._values)
+        for offset in range(1, self._size + 1):
+            yield (self._next - offset) % capacity
+
+    def samples(self, since: float | None = None) -> list[tuple[float, float]]:
+        """Samples newer than `since` (all by default), oldest first."""
+        out = []
+        for index in self._newest_first():
+            timestamp = self._times[index]
+            if since is not None and timestamp < since:
+                break
+            out.append((timestamp, self._values[index]))
+        out.reverse()
+        return out
+
+    def aggregate(self, since: float) -> dict | None:
+        """min/max/mean/last of the samples newer than `since`; None if empty."""
+        count = 0
+        total = 0.0
+        low = high = last = None
+        for index in self._newest_first():
+            if self._times[index] < since:
+                break
+            value = self._values[index]
+            if last is None:
+                last = low = high = value
+            elif value < low:
+                low = value
+            elif value > high:
+                high = value
+            total += value
+            count += 1
+        if not count:
+            return None
+        return {"min": low, "max": high, "mean": total / count, "last": last}
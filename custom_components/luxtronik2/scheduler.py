@@ -0,0 +1,164 @@
+"""Per-category adaptive poll scheduling."""
+
+import random
+import time
+
+from .const import (
+    BACKOFF_FACTOR,
+    BACKOFF_LIMIT,
+    RECONNECT_MAX_DELAY,
+    RECONNECT_MIN_DELAY,
+)
+
+
+class CategorySchedule:
+    """Interval and next due time of one page category."""
+
+    __slots__ = ("base", "interval", "due", "offset")
+
+    def __init__(self, base: float, offset: float = 0.0):
+        self.base = base
+        self.interval = base
+        self.due = 0.0
+        self.offset = offset
+
+
+class PollScheduler:
+    """Decide which categories are due and adapt their intervals.
+
+    A category that changed is polled at its configured interval again; one
+    that stayed the same backs off by BACKOFF_FACTOR, up to BACKOFF_LIMIT
+    times its configured interval.
+
+    `phase` (0..1) shifts every category after its first poll by that
+    fraction of its interval, to stagger several controllers.
+
+    Only the categories in `active` are ever due; all of them by default.
+    """
+
+    def __init__(
+        self, intervals: dict[str, float], clock=time.monotonic, phase: float = 0.0
+    ):
+        self._clock = clock
+        self.categories = {
+            category: CategorySchedule(interval, phase * interval)
+            for category, interval in intervals.items()
+        }
+        self.active = set(self.categories)
+
+    def due(self) -> list[str]:
+        """Active categories whose next poll is due now."""
+        now = self._clock()
+        return [
+            category
+            for category, schedule in self.categories.items()
+            if category in self.active and schedule.due <= now
+        ]
+
+    def delay(self) -> float | None:
+        """Seconds until the next active category is due; None if none is active."""
+        if not self.active:
+            return None
+        next_due = min(self.categories[category].due for category in self.active)
+        return max(0.0, next_due - self._clock())
+
+    def add(self, category: str, interval: float):
+        """Schedule another category; it stays inactive until set_active()."""
+        if category not in self.categories:
+            self.categories[category] = CategorySchedule(interval)
+
+    def set_active(self, categories) -> set[str]:
+        """Poll only `categories` from now on; returns the newly active ones.
+
+        A category that comes back is due right away at its configured
+        interval, whatever it had backed off to before.
+        """
+        categories = set(categories) & self.categories.keys()
+        resumed = categories - self.active
+        now = self._clock()
+        for category in resumed:
+            schedule = self.categories[category]
+            schedule.interval = schedule.base
+            schedule.due = now
+        self.active = categories
+        return resumed
+
+    def record(self, category: str, changed: bool):
+        """Adapt the interval after a poll and schedule the next one."""
+        schedule = self.categories[category]
+        if changed:
+            schedule.interval = schedule.base
+        else:
+            schedule.interval = min(
+                schedule.interval * BACKOFF_FACTOR, schedule.base * BACKOFF_LIMIT
+            )
+        schedule.due = self._clock() + schedule.interval + schedule.offset
+        schedule.offset = 0.0
+
+    @property
+    def intervals(self) -> dict[str, float]:
+        """Current, possibly backed-off interval of every category."""
+        return {
+            category: schedule.interval
+            for category, schedule in self.categories.items()
+        }
+
+    def lateness(self, categories) -> float:
+        """Seconds the most overdue of `categories` is past its due time."""
+        dues = [
+            self.categories[category].due
+            for category in categories
+            if self.categories[category].due
+        ]
+        if not dues:
+            return 0.0
+        return max(0.0, self._clock() - min(dues))
+
+    def longest_gap(self) -> float:
+        """Longest time polls can be apart: the fastest active category, backed off.
+
+        0.0 while no category is active.
+        """
+        if not self.active:
+            return 0.0
+        return min(
+            max(schedule.interval, schedule.base * BACKOFF_LIMIT) + schedule.offset
+            for category, schedule in self.categories.items()
+            if category in self.active
+        )
+
+    def wake(self, category: str):
+        """Return a category to its configured interval right away."""
+        schedule = self.categories.get(category)
+        if schedule is None or category not in self.active:
+            return
+        schedule.interval = schedule.base
+        schedule.due = min(schedule.due, self._clock() + schedule.base)
+
+
+class Backoff:
+    """Jittered exponential backoff for reconnects.
+
+    The n-th delay is drawn from [d/2, d] with d = minimum * 2**n, capped
+    at `maximum`, so many controllers that dropped together do not all
+    come back on the same tick.
+    """
+
+    def __init__(
+        self,
+        minimum: float = RECONNECT_MIN_DELAY,
+        maximum: float = RECONNECT_MAX_DELAY,
+        rng=random.random,
+    ):
+        self.minimum = minimum
+        self.maximum = maximum
+        self._rng = rng
+        self.attempt = 0
+
+    def next(self) -> float:
+        delay = min(self.maximum, self.minimum * 2 ** min(self.attempt, 32))
+        self.attempt += 1
+        return delay / 2 + self._rng() * delay / 2
+
+    def reset(self):
+        self.attempt = 0
@@ -0,0 +1,45 @@
+from homeassistant.components.select import SelectEntity
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .const import DOMAIN
+from .entity import LuxtronikEntity
+from .fields import PARAMETERS_BY_KEY
+from .writer import WriteNotConfirmed
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+):
+    client = hass.data[DOMAIN][entry.entry_id]
+
+    select_defs = [
+        ("Betriebsart Heizung", "betriebsart_heizung"),
+        ("Betriebsart Warmwasser", "betriebsart_warmwasser"),
+    ]
+
+    async_add_entities(
+        LuxtronikSelect(client, name, field) for name, field in select_defs
+    )
+
+
+class LuxtronikSelect(LuxtronikEntity, SelectEntity):
+    """Betriebsart, geschrieben per SET."""
+
+    def __init__(self, client, name: str, field: str):
+        super().__init__(client, name, field)
+        self._attr_options = list(PARAMETERS_BY_KEY[field].options)
+
+    @property
+    def current_option(self):
+        return self._client.get_value(self._field)
+
+    async def async_select_option(self, option: str) -> None:
+        try:
+            await self._client.write(self._field, option)
+        except (ValueError, ConnectionError, WriteNotConfirmed) as err:
+            raise HomeAssistantError(str(err)) from err
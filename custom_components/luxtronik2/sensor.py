@@ -4,10 +4,46 @@ from homeassistant.components.sensor import (
     SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EntityCategory, UnitOfInformation, UnitOfTime
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import DOMAIN
+from .config_flow import publish_policies
+from .const import (
+    AGGREGATE_WINDOW,
+    CATEGORY_ENERGY,
+    CATEGORY_OUTPUTS,
+    CATEGORY_STATE,
+    CATEGORY_TEMPERATURES,
+    CONF_ELECTRICAL_POWER_ENTITY,
+    COP_WINDOW,
+    DOMAIN,
+    PUBLISH_ENERGY,
+    PUBLISH_FLOW,
+    PUBLISH_POWER,
+    PUBLISH_TEMPERATURE,
+    REGISTRY_FIELD,
+    SHORT_CYCLE_STARTS_PER_HOUR,
+    STATS_FIELD,
+)
+from .entity import LuxtronikEntity
+from .fields import TYPE_BOOL, TYPE_FLOAT, Field
+from .publish import PublishPolicy
+
+# Einheit -> Geräteklasse, Zustandsklasse und Publish-Klasse erzeugter Sensoren
+_UNIT_CLASSES = {
+    "°C": (SensorDeviceClass.TEMPERATURE, SensorStateClass.MEASUREMENT, PUBLISH_TEMPERATURE),
+    "kWh": (SensorDeviceClass.ENERGY, SensorStateClass.TOTAL_INCREASING, PUBLISH_ENERGY),
+    "kW": (SensorDeviceClass.POWER, SensorStateClass.MEASUREMENT, PUBLISH_POWER),
+    "W": (SensorDeviceClass.POWER, SensorStateClass.MEASUREMENT, PUBLISH_POWER),
+    "l/h": (SensorDeviceClass.VOLUME_FLOW_RATE, SensorStateClass.MEASUREMENT, PUBLISH_FLOW),
+    "h": (SensorDeviceClass.DURATION, SensorStateClass.TOTAL_INCREASING, None),
+    "min": (SensorDeviceClass.DURATION, SensorStateClass.MEASUREMENT, None),
+    "s": (SensorDeviceClass.DURATION, SensorStateClass.MEASUREMENT, None),
+    "bar": (SensorDeviceClass.PRESSURE, SensorStateClass.MEASUREMENT, None),
+    "V": (SensorDeviceClass.VOLTAGE, SensorStateClass.MEASUREMENT, None),
+    "Hz": (SensorDeviceClass.FREQUENCY, SensorStateClass.MEASUREMENT, None),
+}
 
 
 async def async_setup_entry(
@@ -16,6 +52,7 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ):
     client = hass.data[DOMAIN][entry.entry_id]
+    policies = publish_policies(entry)
 
     sensors: list[SensorEntity] = []
 
@@ -39,10 +76,15 @@ async def async_setup_entry(
                 unit="°C",
                 device_class=SensorDeviceClass.TEMPERATURE,
                 state_class=SensorStateClass.MEASUREMENT,
+                policy=policies[PUBLISH_TEMPERATURE],
             )
         )
 
-    sensors.append(LuxtronikPowerSensor(client, "Heizleistung", "heizleistung"))
+    sensors.append(
+        LuxtronikPowerSensor(
+            client, "Heizleistung", "heizleistung", policies[PUBLISH_POWER]
+        )
+    )
 
     # Wärmemengen & Durchfluss
     waerme_defs = [
@@ -52,6 +94,7 @@ async def async_setup_entry(
             "kWh",
             SensorDeviceClass.ENERGY,
             SensorStateClass.TOTAL,
+            PUBLISH_ENERGY,
         ),
         (
             "Wärmemenge Warmwasser",
@@ -59,6 +102,7 @@ async def async_setup_entry(
             "kWh",
             SensorDeviceClass.ENERGY,
             SensorStateClass.TOTAL,
+            PUBLISH_ENERGY,
         ),
         (
             "Wärmemenge Gesamt",
@@ -66,6 +110,7 @@ async def async_setup_entry(
             "kWh",
             SensorDeviceClass.ENERGY,
             SensorStateClass.TOTAL,
+            PUBLISH_ENERGY,
         ),
         (
             "Durchfluss",
@@ -73,10 +118,11 @@ async def async_setup_entry(
             "l/h",
             SensorDeviceClass.VOLUME_FLOW_RATE,
             SensorStateClass.MEASUREMENT,
+            PUBLISH_FLOW,
         ),
     ]
 
-    for name, field, unit, dev_class, state_class in waerme_defs:
+    for name, field, unit, dev_class, state_class, publish_class in waerme_defs:
         sensors.append(
             LuxtronikSensor(
                 client=client,
@@ -85,6 +131,7 @@ async def async_setup_entry(
                 unit=unit,
                 device_class=dev_class,
                 state_class=state_class,
+                policy=policies[publish_class],
             )
         )
 
@@ -111,10 +158,169 @@ async def async_setup_entry(
 
     sensors.append(LuxtronikStringSensor(client, "Betriebszustand", "Betriebszustand"))
 
+    # Taktung: aus den Schaltvorgängen der Ausgänge
+    hours = UnitOfTime.HOURS
+    minutes = UnitOfTime.MINUTES
+    cycle_defs = [
+        ("Verdichterstarts 1 h", "verdichter_starts_1h", None),
+        ("Verdichterstarts 24 h", "verdichter_starts_24h", None),
+        ("Mittlere Laufzeit Verdichter", "verdichter_laufzeit_mittel", minutes),
+        ("Mittlere Pause Verdichter", "verdichter_pause_mittel", minutes),
+        ("Abtauungen 24 h", "abtauungen_24h", None),
+        ("ZWE Laufzeit 24 h", "zwe_laufzeit_24h", hours),
+    ]
+    for name, field, unit in cycle_defs:
+        sensors.append(
+            LuxtronikSensor(
+                client,
+                name,
+                field,
+                unit=unit,
+                device_class=SensorDeviceClass.DURATION if unit else None,
+                state_class=SensorStateClass.MEASUREMENT,
+            )
+        )
+    sensors.append(
+        LuxtronikShortCycling(client, "Verdichter taktet", "verdichter_takten")
+    )
+
+    # Aus der Heizleistung integrierte Energie, gespeichert über Neustarts
+    energy_defs = [("Wärmeenergie berechnet", "waerme_berechnet")]
+    if entry.options.get(CONF_ELECTRICAL_POWER_ENTITY):
+        energy_defs.append(("Elektrische Energie berechnet", "strom_berechnet"))
+        sensors.append(
+            LuxtronikSensor(
+                client,
+                f"COP ({COP_WINDOW // 60} min)",
+                "cop",
+                state_class=SensorStateClass.MEASUREMENT,
+            )
+        )
+    for name, field in energy_defs:
+        sensors.append(
+            LuxtronikSensor(
+                client,
+                name,
+                field,
+                unit="kWh",
+                device_class=SensorDeviceClass.ENERGY,
+                state_class=SensorStateClass.TOTAL_INCREASING,
+                policy=policies[PUBLISH_ENERGY],
+            )
+        )
+
+    # Aggregate der schnell abgetasteten Felder, einmal pro Fenster
+    aggregate_defs = [
+        ("Vorlauf", "vorlauf", "°C", SensorDeviceClass.TEMPERATURE),
+        ("Rücklauf", "ruecklauf", "°C", SensorDeviceClass.TEMPERATURE),
+        ("Durchfluss", "durchfluss", "l/h", SensorDeviceClass.VOLUME_FLOW_RATE),
+        ("Heizleistung", "heizleistung", "W", SensorDeviceClass.POWER),
+    ]
+    stat_names = {
+        "min": "Minimum",
+        "max": "Maximum",
+        "mean": "Mittelwert",
+        "last": "Letzter Wert",
+    }
+    window = f"{AGGREGATE_WINDOW} s"
+    for name, field, unit, dev_class in aggregate_defs:
+        for stat, label in stat_names.items():
+            sensors.append(
+                LuxtronikAggregateSensor(
+                    client,
+                    f"{name} {label} ({window})",
+                    f"{field}_{stat}",
+                    unit,
+                    dev_class,
+                    enabled=stat == "mean",
+                )
+            )
+
+    # Diagnose: wie gut das Polling selbst läuft
+    ms = UnitOfTime.MILLISECONDS
+    diagnostic_defs = [
+        ("Zykluszeit", "cycle_time", ms, lambda s: s.cycle.last),
+        ("Zykluszeit p95", "cycle_time_p95", ms, lambda s: s.cycle.percentile(0.95)),
+        ("Parse-Zeit", "parse_time", ms, lambda s: s.parse.last),
+        (
+            "Empfangene Daten",
+            "bytes_received",
+            UnitOfInformation.BYTES,
+            lambda s: s.bytes_received,
+        ),
+        ("Verbindungsabbrüche", "reconnects", None, lambda s: s.reconnects),
+        ("Verpasste Termine", "missed_deadlines", None, lambda s: s.missed_deadlines),
+    ]
+    for category, label in (
+        (CATEGORY_TEMPERATURES, "Temperaturen"),
+        (CATEGORY_ENERGY, "Wärmemenge"),
+        (CATEGORY_OUTPUTS, "Ausgänge"),
+        (CATEGORY_STATE, "Anlagenstatus"),
+    ):
+        diagnostic_defs.append(
+            (
+                f"Antwortzeit {label}",
+                f"round_trip_{category}",
+                ms,
+                lambda s, c=category: (
+                    s.round_trip[c].last if c in s.round_trip else None
+                ),
+            )
+        )
+
+    for name, key, unit, value in diagnostic_defs:
+        sensors.append(LuxtronikDiagnosticSensor(client, name, key, unit, value))
+
     async_add_entities(sensors, True)
 
+    # Alle übrigen Felder der Seiten, standardmäßig deaktiviert; was der
+    # Client erst beim ersten Lesen einer Seite findet, kommt später dazu
+    known = {sensor._field for sensor in sensors}
+
+    @callback
+    def add_registry_entities():
+        new = []
+        for field in client.registry:
+            if field.key not in known:
+                known.add(field.key)
+                new.append(_registry_entity(client, field, policies))
+        if new:
+            async_add_entities(new)
+
+    add_registry_entities()
+    entry.async_on_unload(client.subscribe(REGISTRY_FIELD, add_registry_entities))
+
+
+def _registry_entity(client, field: Field, policies) -> LuxtronikEntity:
+    """Entity for a registry field: binary sensor for on/off, sensor otherwise."""
+    name = f"{client.registry.page_name(field.category)} {field.name}"
+    if field.type == TYPE_BOOL:
+        device_class = (
+            BinarySensorDeviceClass.RUNNING
+            if field.category == CATEGORY_OUTPUTS
+            else None
+        )
+        entity = LuxtronikBinaryOutput(client, name, field.key, device_class)
+    elif field.type == TYPE_FLOAT:
+        device_class, state_class, publish_class = _UNIT_CLASSES.get(
+            field.unit, (None, SensorStateClass.MEASUREMENT, None)
+        )
+        entity = LuxtronikSensor(
+            client,
+            name,
+            field.key,
+            unit=field.unit,
+            device_class=device_class,
+            state_class=state_class,
+            policy=policies.get(publish_class),
+        )
+    else:
+        entity = LuxtronikStringSensor(client, name, field.key)
+    entity._attr_entity_registry_enabled_default = False
+    return entity
+
 
-class LuxtronikSensor(SensorEntity):
+class LuxtronikSensor(LuxtronikEntity, SensorEntity):
     """Generischer Luxtronik-Sensor."""
 
     def __init__(
@@ -125,13 +331,10 @@ class LuxtronikSensor(SensorEntity):
         unit: str | None = None,
         device_class: SensorDeviceClass | None = None,
         state_class: SensorStateClass | None = None,
+        policy: PublishPolicy | None = None,
     ):
-        self._client = client
-        self._client.register_listener(self._handle_client_update)
-        self._field = field
+        super().__init__(client, name, field, policy)
 
-        self._attr_name = name
-        self._attr_unique_id = f"luxtronik2_{field}"
         self._attr_native_unit_of_measurement = unit
         self._attr_device_class = device_class
         self._attr_state_class = state_class
@@ -146,22 +349,32 @@ class LuxtronikSensor(SensorEntity):
         # print(f"LUX SENSOR ASYNC UPDATE {self._field}")
         return
 
-    @callback
-    def _handle_client_update(self):
-        """Handle push-update from client."""
-        self.async_write_ha_state()
+
+class LuxtronikAggregateSensor(LuxtronikSensor):
+    """Windowed min/max/mean/last of a sampled field."""
+
+    _attr_suggested_display_precision = 1
+
+    def __init__(self, client, name, field, unit, device_class, enabled: bool):
+        super().__init__(
+            client,
+            name,
+            field,
+            unit=unit,
+            device_class=device_class,
+            state_class=SensorStateClass.MEASUREMENT,
+        )
+        self._attr_entity_registry_enabled_default = enabled
 
 
-class LuxtronikPowerSensor(SensorEntity):
+class LuxtronikPowerSensor(LuxtronikEntity, SensorEntity):
     """Berechnete Heizleistung (Watt)."""
 
-    def __init__(self, client, name: str, field: str):
-        self._client = client
-        self._field = field
-        self._client.register_listener(self._handle_client_update)
+    def __init__(
+        self, client, name: str, field: str, policy: PublishPolicy | None = None
+    ):
+        super().__init__(client, name, field, policy)
 
-        self._attr_name = f"{name}"
-        self._attr_unique_id = f"luxtronik2_{field}"
         self._attr_device_class = SensorDeviceClass.POWER
         self._attr_native_unit_of_measurement = "W"
         self._attr_state_class = SensorStateClass.MEASUREMENT
@@ -182,11 +395,6 @@ class LuxtronikPowerSensor(SensorEntity):
     async def async_update(self):
         return
 
-    @callback
-    def _handle_client_update(self):
-        """Handle push-update from client."""
-        self.async_write_ha_state()
-
 
 from homeassistant.components.binary_sensor import (
     BinarySensorDeviceClass,
@@ -194,36 +402,43 @@ from homeassistant.components.binary_sensor import (
 )
 
 
-class LuxtronikBinaryOutput(BinarySensorEntity):
-    def __init__(self, client, name, field):
-        self._client = client
-        self._field = field
-        self._client.register_listener(self._handle_client_update)
-        self._attr_name = f"{name}"
-        self._attr_unique_id = f"luxtronik2_{field}"
-        self._attr_device_class = BinarySensorDeviceClass.RUNNING
+class LuxtronikBinaryOutput(LuxtronikEntity, BinarySensorEntity):
+    def __init__(
+        self,
+        client,
+        name,
+        field,
+        device_class: BinarySensorDeviceClass | None = BinarySensorDeviceClass.RUNNING,
+    ):
+        super().__init__(client, name, field)
+        self._attr_device_class = device_class
 
     @property
     def is_on(self):
-        value = self._client.get_value(self._field)
-        if value is None:
-            return None
+        return self._client.get_value(self._field)
 
-        return str(value).lower() == "ein"
 
-    @callback
-    def _handle_client_update(self):
-        """Handle push-update from client."""
-        self.async_write_ha_state()
+class LuxtronikShortCycling(LuxtronikEntity, BinarySensorEntity):
+    """Problem while the compressor starts too often within one hour."""
+
+    _attr_device_class = BinarySensorDeviceClass.PROBLEM
 
+    @property
+    def is_on(self):
+        return self._client.get_value(self._field)
 
-class LuxtronikStringSensor(SensorEntity):
+    @property
+    def extra_state_attributes(self):
+        return {
+            **(super().extra_state_attributes or {}),
+            "starts_last_hour": self._client.get_value("verdichter_starts_1h"),
+            "threshold": SHORT_CYCLE_STARTS_PER_HOUR,
+        }
+
+
+class LuxtronikStringSensor(LuxtronikEntity, SensorEntity):
     def __init__(self, client, name, field):
-        self._client = client
-        self._field = field
-        self._client.register_listener(self._handle_client_update)
-        self._attr_name = f"{name}"
-        self._attr_unique_id = f"luxtronik2_{field}"
+        super().__init__(client, name, field)
         self._attr_device_class = None
         self._attr_native_unit_of_measurement = None
         self._attr_state_class = None
@@ -232,7 +447,33 @@ class LuxtronikStringSensor(SensorEntity):
     def native_value(self):
         return self._client.get_value(self._field)
 
-    @callback
-    def _handle_client_update(self):
-        """Handle push-update from client."""
-        self.async_write_ha_state()
+
+class LuxtronikDiagnosticSensor(LuxtronikEntity, SensorEntity):
+    """One number from the client's own poll statistics."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(self, client, name, key, unit, value):
+        super().__init__(client, name, STATS_FIELD)
+        self._attr_unique_id = f"{client.device_id}_diag_{key}"
+        self._attr_native_unit_of_measurement = unit
+        self._value = value
+        if unit == UnitOfTime.MILLISECONDS:
+            self._attr_device_class = SensorDeviceClass.DURATION
+            self._attr_state_class = SensorStateClass.MEASUREMENT
+            self._attr_suggested_display_precision = 1
+        elif unit == UnitOfInformation.BYTES:
+            self._attr_device_class = SensorDeviceClass.DATA_SIZE
+            self._attr_state_class = SensorStateClass.TOTAL_INCREASING
+        else:
+            self._attr_state_class = SensorStateClass.TOTAL_INCREASING
+
+    @property
+    def available(self) -> bool:
+        """Counters stay readable while the client reconnects."""
+        return True
+
+    @property
+    def native_value(self):
+        return self._value(self._client.stats)
@@ -0,0 +1,190 @@
+"""Services of the Luxtronik integration."""
+
+import logging
+import time
+
+import voluptuous as vol
+
+from homeassistant.const import ATTR_CONFIG_ENTRY_ID
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.util import dt as dt_util
+
+from .capture import async_capture
+from .const import (
+    ATTR_CYCLES,
+    ATTR_FIELDS,
+    ATTR_PARAMETER,
+    ATTR_SECONDS,
+    ATTR_TIMEOUT,
+    ATTR_TOP,
+    ATTR_VALUE,
+    CAPTURE_DEFAULT_SECONDS,
+    CAPTURE_MAX_SECONDS,
+    DOMAIN,
+    PROFILE_DEFAULT_CYCLES,
+    PROFILE_DEFAULT_TIMEOUT,
+    PROFILE_DEFAULT_TOP,
+    SAMPLED_FIELDS,
+    SERVICE_CAPTURE,
+    SERVICE_GET_SAMPLES,
+    SERVICE_PROFILE,
+    SERVICE_SET_PARAMETER,
+)
+from .fields import PARAMETERS_BY_KEY
+from .profiler import PollProfiler
+from .writer import WriteNotConfirmed
+
+_LOGGER = logging.getLogger(__name__)
+
+PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_CYCLES, default=PROFILE_DEFAULT_CYCLES): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=1000)
+        ),
+        vol.Optional(ATTR_TIMEOUT, default=PROFILE_DEFAULT_TIMEOUT): vol.All(
+            vol.Coerce(float), vol.Range(min=1, max=3600)
+        ),
+        vol.Optional(ATTR_TOP, default=PROFILE_DEFAULT_TOP): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=200)
+        ),
+    }
+)
+
+SET_PARAMETER_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Required(ATTR_PARAMETER): vol.In(PARAMETERS_BY_KEY),
+        vol.Required(ATTR_VALUE): vol.Any(vol.Coerce(float), cv.string),
+    }
+)
+
+GET_SAMPLES_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_FIELDS, default=list(SAMPLED_FIELDS)): vol.All(
+            cv.ensure_list, [vol.In(SAMPLED_FIELDS)]
+        ),
+        vol.Optional(ATTR_SECONDS): vol.All(vol.Coerce(float), vol.Range(min=1)),
+    }
+)
+
+CAPTURE_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_SECONDS, default=CAPTURE_DEFAULT_SECONDS): vol.All(
+            vol.Coerce(float), vol.Range(min=1, max=CAPTURE_MAX_SECONDS)
+        ),
+    }
+)
+
+
+def _client(hass: HomeAssistant, call: ServiceCall):
+    entry_id = call.data[ATTR_CONFIG_ENTRY_ID]
+    client = hass.data.get(DOMAIN, {}).get(entry_id)
+    if client is None:
+        raise ServiceValidationError(f"No loaded Luxtronik entry {entry_id}")
+    return client
+
+
+async def _async_profile(call: ServiceCall) -> ServiceResponse:
+    """Profile the next poll cycles and write a .prof file to the config dir."""
+    hass = call.hass
+    client = _client(hass, call)
+
+    profiler = PollProfiler(client, call.data[ATTR_CYCLES])
+    try:
+        stats = await profiler.async_run(call.data[ATTR_TIMEOUT])
+    except RuntimeError as err:
+        raise HomeAssistantError(str(err)) from err
+
+    stamp = dt_util.now().strftime("%Y%m%d-%H%M%S")
+    path = hass.config.path(f"{DOMAIN}_profile_{client.device_id}_{stamp}.prof")
+    await hass.async_add_executor_job(stats.dump_stats, path)
+    summary = PollProfiler.summary(stats, call.data[ATTR_TOP])
+
+    _LOGGER.warning(
+        "%s: profiled %d poll cycles, stats written to %s\n%s",
+        client.name,
+        profiler.captured,
+        path,
+        summary,
+    )
+    return {"cycles": profiler.captured, "file": path, "summary": summary}
+
+
+async def _async_capture(call: ServiceCall) -> ServiceResponse:
+    """Record the raw frames of one controller to a file in the config dir."""
+    hass = call.hass
+    client = _client(hass, call)
+
+    stamp = dt_util.now().strftime("%Y%m%d-%H%M%S")
+    path = hass.config.path(f"{DOMAIN}_capture_{client.device_id}_{stamp}.jsonl.gz")
+    try:
+        frames = await async_capture(client, path, call.data[ATTR_SECONDS])
+    except RuntimeError as err:
+        raise HomeAssistantError(str(err)) from err
+
+    _LOGGER.warning("%s: captured %d frames to %s", client.name, frames, path)
+    return {"frames": frames, "file": path}
+
+
+async def _async_set_parameter(call: ServiceCall):
+    """Write one parameter; returns once the controller shows the new value."""
+    client = _client(call.hass, call)
+    try:
+        await client.write(call.data[ATTR_PARAMETER], call.data[ATTR_VALUE])
+    except ValueError as err:
+        raise ServiceValidationError(str(err)) from err
+    except (ConnectionError, WriteNotConfirmed) as err:
+        raise HomeAssistantError(str(err)) from err
+
+
+async def _async_get_samples(call: ServiceCall) -> ServiceResponse:
+    """Raw samples of the high-rate fields, as [unix time, value] pairs."""
+    client = _client(call.hass, call)
+    since = None
+    if ATTR_SECONDS in call.data:
+        since = time.time() - call.data[ATTR_SECONDS]
+    return {
+        key: [list(sample) for sample in client.samples[key].samples(since)]
+        for key in call.data[ATTR_FIELDS]
+    }
+
+
+def async_setup_services(hass: HomeAssistant):
+    """Register the integration's services once, not per entry."""
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PROFILE,
+        _async_profile,
+        schema=PROFILE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_CAPTURE,
+        _async_capture,
+        schema=CAPTURE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_SAMPLES,
+        _async_get_samples,
+        schema=GET_SAMPLES_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SET_PARAMETER,
+        _async_set_parameter,
+        schema=SET_PARAMETER_SCHEMA,
+    )
@@ -0,0 +1,107 @@
+"""Immutable, versioned snapshots of a controller's values."""
+
+from array import array
+
+# Slot that never had a value, as opposed to a value that parsed to None
+_UNSET = object()
+
+
+class FieldTable:
+    """Key -> slot index; only ever grows, so old snapshots stay valid."""
+
+    __slots__ = ("keys", "index")
+
+    def __init__(self, keys=()):
+        self.keys: list[str] = []
+        self.index: dict[str, int] = {}
+        for key in keys:
+            self.slot(key)
+
+    def slot(self, key: str) -> int:
+        """Index of `key`, appending it for labels seen the first time."""
+        index = self.index.get(key)
+        if index is None:
+            index = self.index[key] = len(self.keys)
+            self.keys.append(key)
+        return index
+
+    def __len__(self):
+        return len(self.keys)
+
+
+class Snapshot:
+    """All values of one poll cycle, never modified after creation.
+
+    Values live in a tuple indexed by the shared FieldTable; next to each
+    slot the version that last changed it, which makes "what changed
+    since version N" a single scan.
+    """
+
+    __slots__ = ("table", "version", "timestamp", "_values", "_versions")
+
+    def __init__(
+        self,
+        table: FieldTable,
+        version: int = 0,
+        timestamp: float | None = None,
+        values: tuple = (),
+        versions: array | None = None,
+    ):
+        self.table = table
+        self.version = version
+        self.timestamp = timestamp
+        self._values = values
+        self._versions = versions if versions is not None else array("Q")
+
+    def get(self, key: str, default=None):
+        index = self.table.index.get(key)
+        if index is None or index >= len(self._values):
+            return default
+        value = self._values[index]
+        return default if value is _UNSET else value
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key, _UNSET) is not _UNSET
+
+    def changed_since(self, version: int) -> dict:
+        """{key: value} of every slot changed after `version`."""
+        keys = self.table.keys
+        return {
+            keys[index]: self._values[index]
+            for index, changed_in in enumerate(self._versions)
+            if changed_in > version
+        }
+
+    def as_dict(self) -> dict:
+        keys = self.table.keys
+        return {
+            keys[index]: value
+            for index, value in enumerate(self._values)
+            if value is not _UNSET
+        }
+
+    def evolve(self, updates: dict, timestamp: float) -> tuple["Snapshot", dict]:
+        """Next snapshot with `updates` applied, and the values that differ.
+
+        Returns this snapshot itself when nothing differs.
+        """
+        old = self._values
+        diffs = []
+        for key, value in updates.items():
+            index = self.table.slot(key)
+            if index >= len(old) or old[index] is _UNSET or old[index] != value:
+                diffs.append((index, key, value))
+        if not diffs:
+            return self, {}
+
+        grow = len(self.table) - len(old)
+        values = [*old, *([_UNSET] * grow)]
+        versions = array("Q", self._versions)
+        versions.extend([0] * grow)
+        version = self.version + 1
+        changed = {}
+        for index, key, value in diffs:
+            values[index] = value
+            versions[index] = version
+            changed[key] = value
+        return Snapshot(self.table, version, timestamp, tuple(values), versions), changed
@@ -0,0 +1,95 @@
+"""Timing histograms and counters of a LuxtronikClient."""
+
+import bisect
+
+# Upper bucket bounds in milliseconds; the last bucket is open-ended
+BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000)
+
+
+class Histogram:
+    """Fixed-bucket latency histogram with running count, mean and max."""
+
+    __slots__ = ("counts", "count", "total", "max", "last")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS_MS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.last = None
+
+    def add(self, ms: float):
+        self.counts[bisect.bisect_left(BUCKETS_MS, ms)] += 1
+        self.count += 1
+        self.total += ms
+        self.last = ms
+        if ms > self.max:
+            self.max = ms
+
+    @property
+    def mean(self) -> float | None:
+        return self.total / self.count if self.count else None
+
+    def percentile(self, pct: float) -> float | None:
+        """Upper bound of the bucket holding the `pct` quantile."""
+        if not self.count:
+            return None
+        rank = pct * self.count
+        seen = 0
+        for bound, count in zip(BUCKETS_MS, self.counts):
+            seen += count
+            if seen >= rank:
+                return min(float(bound), self.max)
+        return self.max
+
+    def as_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "last_ms": self.last,
+            "mean_ms": self.mean,
+            "p50_ms": self.percentile(0.5),
+            "p95_ms": self.percentile(0.95),
+            "max_ms": self.max,
+            "buckets_ms": dict(
+                zip([*map(str, BUCKETS_MS), "inf"], self.counts, strict=True)
+            ),
+        }
+
+
+class ClientStats:
+    """Everything the client measures about its own polling."""
+
+    def __init__(self):
+        self.cycle = Histogram()
+        self.round_trip: dict[str, Histogram] = {}
+        self.parse = Histogram()
+        self.notify = Histogram()
+        self.cycles = 0
+        self.frames = 0
+        self.unchanged_frames = 0
+        self.bytes_received = 0
+        self.reconnects = 0
+        self.missed_deadlines = 0
+
+    def add_round_trip(self, category: str, ms: float):
+        histogram = self.round_trip.get(category)
+        if histogram is None:
+            histogram = self.round_trip[category] = Histogram()
+        histogram.add(ms)
+
+    def as_dict(self) -> dict:
+        return {
+            "cycles": self.cycles,
+            "frames": self.frames,
+            "unchanged_frames": self.unchanged_frames,
+            "bytes_received": self.bytes_received,
+            "reconnects": self.reconnects,
+            "missed_deadlines": self.missed_deadlines,
+            "cycle": self.cycle.as_dict(),
+            "parse": self.parse.as_dict(),
+            "notify": self.notify.as_dict(),
+            "round_trip": {
+                category: histogram.as_dict()
+                for category, histogram in self.round_trip.items()
+            },
+        }
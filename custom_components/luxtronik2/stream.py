@@ -0,0 +1,104 @@
+"""Change sets of a client as an async iterator, one bounded queue per consumer."""
+
+import asyncio
+from collections import deque
+from typing import NamedTuple
+
+from .const import STREAM_COALESCE, STREAM_DROP_OLDEST
+
+
+class ChangeSet(NamedTuple):
+    """Values that changed with one snapshot version."""
+
+    version: int
+    timestamp: float | None
+    changes: dict  # key -> new value; shared by all consumers, read-only
+
+
+class ChangeStream:
+    """Async iterator over the change sets one consumer has not taken yet.
+
+    put() never blocks the client. Once `maxsize` change sets are
+    queued, STREAM_DROP_OLDEST discards the oldest one and
+    STREAM_COALESCE merges the new one into the newest queued one, so
+    every key still arrives with its latest value, only intermediate
+    values are lost. `dropped` counts change sets lost either way.
+
+    `keys` limits the stream to those keys. Iteration ends after close(),
+    once the queue is drained.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        policy: str = STREAM_COALESCE,
+        keys=None,
+        on_close=None,
+    ):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        if policy not in (STREAM_COALESCE, STREAM_DROP_OLDEST):
+            raise ValueError(f"Unknown overflow policy {policy}")
+        self.maxsize = maxsize
+        self.policy = policy
+        self.keys = frozenset(keys) if keys is not None else None
+        self.dropped = 0
+        self.closed = False
+        self._queue: deque[ChangeSet] = deque()
+        self._ready = asyncio.Event()
+        self._on_close = on_close
+
+    def put(self, change_set: ChangeSet):
+        """Queue a change set; called by the client, never blocks."""
+        if self.closed:
+            return
+        if self.keys is not None:
+            changes = {
+                key: value
+                for key, value in change_set.changes.items()
+                if key in self.keys
+            }
+            if not changes:
+                return
+            change_set = change_set._replace(changes=changes)
+        queue = self._queue
+        if len(queue) >= self.maxsize:
+            self.dropped += 1
+            if self.policy == STREAM_DROP_OLDEST:
+                queue.popleft()
+            else:
+                newest = queue.pop()
+                change_set = change_set._replace(
+                    changes={**newest.changes, **change_set.changes}
+                )
+        queue.append(change_set)
+        self._ready.set()
+
+    def close(self):
+        """End the iteration after what is queued; detaches from the client."""
+        if self.closed:
+            return
+        self.closed = True
+        self._ready.set()
+        if self._on_close is not None:
+            self._on_close(self)
+
+    def __len__(self):
+        return len(self._queue)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> ChangeSet:
+        while not self._queue:
+            if self.closed:
+                raise StopAsyncIteration
+            self._ready.clear()
+            await self._ready.wait()
+        return self._queue.popleft()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        self.close()
@@ -1,57 +1,397 @@
 import asyncio
+import contextlib
 import logging
 import re
+import time
 
-import websocket
+import aiohttp
+
+from .const import (
+    AGGREGATE_WINDOW,
+    AGGREGATES,
+    CATEGORY_ENERGY,
+    CATEGORY_OUTPUTS,
+    CATEGORY_SETTINGS,
+    CATEGORY_STATE,
+    CATEGORY_TEMPERATURES,
+    CONNECT_TIMEOUT,
+    DEADLINE_SLACK,
+    DISCOVERED_PAGE_INTERVAL,
+    ENERGY_SAVE_INTERVAL,
+    PIPELINE_MAX_FAILURES,
+    PIPELINE_TIMEOUT,
+    REGISTRY_FIELD,
+    REQUEST_TIMEOUT,
+    SAMPLE_CAPACITY,
+    SAMPLED_FIELDS,
+    SETTINGS_REFRESH_INTERVAL,
+    SNAPSHOT_SAVE_INTERVAL,
+    STATS_FIELD,
+    STREAM_COALESCE,
+    STREAM_DEFAULT_SIZE,
+    WATCHDOG_INTERVALS,
+)
+from .cycles import CycleTracker
+from .energy import EnergyIntegrator, RollingCop
+from .fields import (
+    FIELDS,
+    PARAMETERS,
+    PARAMETERS_BY_KEY,
+    convert,
+    label,
+    parse_page,
+    parse_settings_page,
+)
+from .navigation import NavigationTree
+from .registry import FieldRegistry
+from .ring import RingBuffer
+from .scheduler import Backoff, PollScheduler
+from .snapshot import FieldTable, Snapshot
+from .stats import ClientStats
+from .stream import ChangeSet, ChangeStream
+from .writer import WriteQueue
 
 _LOGGER = logging.getLogger(__name__)
 
 
+class NavigationChanged(Exception):
+    """The controller's page ids differ from the ones being polled."""
+
+
+class StaleConnection(ConnectionError):
+    """No frame arrived from the controller for too long."""
+
+# Head of a page reply: <Content><item id='0x...'><name>Temperaturen</name>
+_CONTENT_HEAD = re.compile(r"<Content>\s*<item id='([^']*)'>\s*<name>([^<]*)</name>")
+
+# Slot layout shared by the snapshots of all clients
+_FIELD_TABLE = FieldTable(
+    [
+        *(field.key for field in FIELDS),
+        "heizleistung",
+        "waerme_berechnet",
+        "strom_berechnet",
+        "cop",
+        *CycleTracker.KEYS,
+        *(parameter.key for parameter in PARAMETERS),
+        *(f"{key}_{stat}" for key in SAMPLED_FIELDS for stat in AGGREGATES),
+    ]
+)
+
+_CATEGORIES = (CATEGORY_TEMPERATURES, CATEGORY_ENERGY, CATEGORY_OUTPUTS, CATEGORY_STATE)
+
+# Menu name of each category's page in the navigation tree
+_PAGE_NAMES = {
+    CATEGORY_TEMPERATURES: "Temperaturen",
+    CATEGORY_ENERGY: "Wärmemenge",
+    CATEGORY_OUTPUTS: "Ausgänge",
+    CATEGORY_STATE: "Anlagenstatus",
+}
+
+# Pages each value is derived from: a poll of any of them yields a new
+# sample, and a subscriber to the value keeps them polled
+_DERIVED = frozenset({CATEGORY_TEMPERATURES, CATEGORY_ENERGY})
+_FIELD_CATEGORIES = {
+    **{field.key: frozenset({field.category}) for field in FIELDS},
+    **dict.fromkeys(("heizleistung", "waerme_berechnet", "strom_berechnet", "cop"), _DERIVED),
+    **dict.fromkeys(CycleTracker.KEYS, frozenset({CATEGORY_OUTPUTS})),
+}
+_FIELD_CATEGORIES.update(
+    {
+        f"{key}_{stat}": _FIELD_CATEGORIES[key]
+        for key in SAMPLED_FIELDS
+        for stat in AGGREGATES
+    }
+)
+
+# A change in one category (e.g. the compressor switching) speeds these up too
+_LINKED_CATEGORIES = {
+    CATEGORY_OUTPUTS: (CATEGORY_STATE, CATEGORY_TEMPERATURES),
+    CATEGORY_STATE: (CATEGORY_OUTPUTS, CATEGORY_TEMPERATURES),
+}
+
+
 class LuxtronikClient:
     """WebSocket client for Luxtronik heat pump."""
 
-    def __init__(self, ip: str, password: str, port: int, interval: int):
+    # Whether capture() can record what this client receives
+    captures_frames = True
+
+    def __init__(
+        self,
+        ip: str,
+        password: str,
+        port: int,
+        interval: int,
+        session: aiohttp.ClientSession | None = None,
+        pipeline: bool = True,
+        intervals: dict[str, float] | None = None,
+        device_id: str | None = None,
+        name: str | None = None,
+        limiter: asyncio.Semaphore | None = None,
+        phase: float = 0.0,
+        navigation_cache=None,
+        energy_store=None,
+        lazy: bool = False,
+        snapshot_store=None,
+    ):
         self.ip = ip
         self.password = password
         self.port = port
         self.interval = interval
+        self.pipeline = pipeline
+        self.device_id = device_id or f"{ip}:{port}"
+        self.name = name or f"Luxtronik @ {ip}"
+        # Shared across controllers: caps concurrent request batches
+        self._limiter = limiter or contextlib.nullcontext()
+        # Categories without their own interval use the global one
+        self._scheduler = PollScheduler(
+            {**dict.fromkeys(_CATEGORIES, interval), **(intervals or {})},
+            phase=phase,
+        )
+        # Lazy: poll only the pages some subscriber needs (see _update_demand)
+        self.lazy = lazy
+        if lazy:
+            self._scheduler.set_active(())
+        self._wakeup = asyncio.Event()
+        # Set by _update_demand: the watchdog's limit follows the active pages
+        self._demand_changed = asyncio.Event()
+        self._frames = {}
+        # Polls and writes take turns on the one socket
+        self._io_lock = asyncio.Lock()
+        # Settings pages: navigation path -> page id, parameter key -> item id
+        self.setting_pages: dict[tuple[str, ...], str] = {}
+        self._setting_ids: dict[str, str] = {}
+        self._settings_due = 0.0
+        self._settings_wanted = not lazy
+        self._writes = WriteQueue(self._write_batch)
+        # Raw samples of the fast fields; aggregates go into the snapshot
+        self.samples = {key: RingBuffer(SAMPLE_CAPACITY) for key in SAMPLED_FIELDS}
+        self._aggregate_due = time.monotonic() + AGGREGATE_WINDOW
+        # Thermal energy from heizleistung; electrical energy from a power
+        # value the caller keeps up to date in `electrical_power` (W)
+        self._energy_store = energy_store
+        self._energy_saved = 0.0
+        self._energy_changed = False
+        self.thermal = EnergyIntegrator()
+        self.electrical = EnergyIntegrator()
+        self.electrical_power: float | None = None
+        self._cop = RollingCop()
+        # Compressor/defrost/ZWE analytics from the output transitions
+        self.cycles = CycleTracker()
+        # Fields of every page; pages beyond the four polled ones are read
+        # once to learn their fields, then polled only while subscribed
+        self.registry = FieldRegistry()
+        self.discovered_pages: dict[str, str] = {}
+        # Optional store with async_load/async_save/async_remove per device id
+        self._navigation_cache = navigation_cache
+        self._cached_navigation = None
+        # Whether the firmware answers GETs sent before its LOGIN reply,
+        # learned from pipelined polls and cached with the navigation;
+        # None while unknown
+        self._queues_requests: bool | None = None
+        # GETs went out without waiting for the LOGIN reply; unconfirmed
+        # until a page arrives
+        self._early_requests = False
+        self.navigation: NavigationTree | None = None
 
+        self._session = session
+        self._owns_session = session is None
         self.ws = None
         self._task = None
         self._should_run = True
-        self._listeners = []
+        self._prepared = False
+        # Set by connect_once(): the first session is already open
+        self._handshake = False
 
-        self.values = {}
+        self.connect_timeout = CONNECT_TIMEOUT
+        self.request_timeout = REQUEST_TIMEOUT
+        self._backoff = Backoff()
+        self._pipeline_failures = 0
+        self._last_frame = 0.0
+        self.available = False
+        self.stats = ClientStats()
+        # Wall clock of values and samples; replay() runs it on recorded time
+        self._time = time.time
+        # FrameRecorder while a capture runs
+        self.capture = None
+        self._listeners = []  # called on any change
+        self._subscribers = {}  # field -> callbacks
+        self._streams: list[ChangeStream] = []
+
+        # Swapped as a whole once per cycle; readers never see half a cycle
+        self.snapshot = Snapshot(_FIELD_TABLE)
+        # Values of the last run stay visible, as stale, until polled again
+        self._snapshot_store = snapshot_store
+        self._snapshot_saved = 0.0
+        self.stale: set[str] = set()
+        self.restored_at: float | None = None
         self.temp_id = None
         self.waerm_id = None
         self.output_id = None
         self.state_id = None
-        self.values["heizleistung"] = None
 
-    def register_listener(self, callback):
+    def register_listener(self, callback, field: str | None = None):
+        """Call back when `field` changes, or on any change if no field is given.
+
+        Returns a function that removes the listener again.
+        """
+        if field is not None:
+            return self.subscribe(field, callback)
+
         self._listeners.append(callback)
+        self._update_demand()
 
-    def _notify_listeners(self):
-        for callback in self._listeners:
-            try:
-                callback()
-            except Exception:
-                pass
+        def unsubscribe():
+            if callback in self._listeners:
+                self._listeners.remove(callback)
+                self._update_demand()
 
-    async def connect_once(self):
-        import websocket
+        return unsubscribe
 
-        self.ws = websocket.WebSocket()
-        self.ws.connect(f"ws://{self.ip}:{self.port}", subprotocols=["Lux_WS"])
-        self.ws.send(f"LOGIN;{self.password}")
+    def subscribe(self, field: str, callback):
+        """Call back whenever `field` changes; returns an unsubscribe function."""
+        callbacks = self._subscribers.setdefault(field, [])
+        callbacks.append(callback)
+        if len(callbacks) == 1:
+            self._update_demand()
 
-    async def test_connection(self):
-        import asyncio
+        def unsubscribe():
+            callbacks = self._subscribers.get(field)
+            if callbacks and callback in callbacks:
+                callbacks.remove(callback)
+                if not callbacks:
+                    del self._subscribers[field]
+                    self._update_demand()
+
+        return unsubscribe
+
+    def stream(
+        self,
+        maxsize: int = STREAM_DEFAULT_SIZE,
+        policy: str = STREAM_COALESCE,
+        keys=None,
+        initial: bool = True,
+    ) -> ChangeStream:
+        """Async iterator of ChangeSets: version, timestamp and changed values.
+
+        Each consumer gets its own queue of `maxsize` change sets; a full
+        queue is handled by `policy` (see ChangeStream), never by making
+        the poll wait. With `initial` the first item is the whole current
+        snapshot. `keys` limits the stream to those keys, and in lazy
+        mode keeps their pages polled like a subscription. Close the
+        stream, or use it as an async context manager, to detach it.
+        """
+        stream = ChangeStream(maxsize, policy, keys, self._remove_stream)
+        if initial and self.snapshot.version:
+            stream.put(
+                ChangeSet(
+                    self.snapshot.version,
+                    self.snapshot.timestamp,
+                    self.snapshot.as_dict(),
+                )
+            )
+        self._streams.append(stream)
+        self._update_demand()
+        return stream
+
+    def _remove_stream(self, stream: ChangeStream):
+        if stream in self._streams:
+            self._streams.remove(stream)
+            self._update_demand()
+
+    def _update_demand(self):
+        """Poll the pages that subscribed fields come from, and only those.
+
+        An any-change listener or stream, or a client that is not lazy,
+        wants the four main pages and the settings. A page that gains its
+        first consumer is fetched right away instead of at its next slot.
+        """
+        fields = set(self._subscribers)
+        for stream in self._streams:
+            fields.update(stream.keys or ())
+        if (
+            not self.lazy
+            or self._listeners
+            or any(stream.keys is None for stream in self._streams)
+        ):
+            categories = set(_CATEGORIES)
+            settings = True
+        else:
+            categories = set()
+            for field in fields:
+                categories.update(self._field_categories(field))
+            settings = not fields.isdisjoint(PARAMETERS_BY_KEY)
+        # Discovered pages only ever for fields that are actually shown
+        categories.update(
+            category
+            for field in fields
+            if (category := self.registry.category_of(field)) in self.discovered_pages
+        )
+        idle = not self._scheduler.active and not self._settings_wanted
+        if CATEGORY_OUTPUTS in self._scheduler.active - categories:
+            # Transitions while the outputs are not polled go unseen
+            self.cycles.gap()
+        if categories != self._scheduler.active:
+            self._demand_changed.set()
+        resumed = self._scheduler.set_active(categories)
+        if settings and not self._settings_wanted:
+            self._settings_due = 0.0
+            resumed.add(CATEGORY_SETTINGS)
+        self._settings_wanted = settings
+        if resumed:
+            if idle:
+                # Nothing was polled; that silence is no sign of a stale link
+                self._last_frame = max(self._last_frame, time.monotonic())
+            self._wakeup.set()
+
+    def _notify_listeners(self, changed):
+        """Dispatch a change set: O(changed keys), not O(all entities)."""
+        self._notify_subscribers(changed)
+        for callback in tuple(self._listeners):
+            self._call_listener(callback)
 
+    def _notify_subscribers(self, fields):
+        """Call back the subscribers of `fields` only, not the any-change listeners.
+
+        For what is no value change: availability and the pseudo-fields
+        STATS_FIELD and REGISTRY_FIELD.
+        """
+        for field in fields:
+            callbacks = self._subscribers.get(field)
+            if callbacks:
+                for callback in tuple(callbacks):
+                    self._call_listener(callback)
+
+    @staticmethod
+    def _call_listener(callback):
         try:
-            await asyncio.wait_for(self.connect_once(), timeout=5)
-        except Exception as e:
-            raise e
+            callback()
+        except Exception:
+            _LOGGER.exception("LuxtronikClient: Error in listener %s", callback)
+
+    def _field_categories(self, field: str):
+        """Categories whose pages `field` is read or derived from."""
+        categories = _FIELD_CATEGORIES.get(field)
+        if categories is None:
+            category = self.registry.category_of(field)
+            categories = (category,) if category is not None else ()
+        return categories
+
+    async def connect_once(self):
+        """Connect and LOGIN; run() continues on this socket instead of a new one.
+
+        Waits for the navigation LOGIN is answered with, which also
+        proves the password, unless cached page ids can be polled right
+        away (see _open).
+        """
+        await self._prepare()
+        await self._start_session()
+        self._handshake = True
+
+    async def test_connection(self):
+        """Setup's handshake; raises if the controller cannot be reached."""
+        await asyncio.wait_for(self.connect_once(), timeout=5)
 
     # -------------------------------------------------------------
     # Public API used by HA
@@ -66,7 +406,12 @@ class LuxtronikClient:
         """Stop background loop and close socket."""
         _LOGGER.debug("LuxtronikClient: Closing...")
 
+        self._save_snapshot(force=True)
+        self._save_energy(force=True)
         self._should_run = False
+        self._writes.cancel()
+        for stream in tuple(self._streams):
+            stream.close()
 
         if self._task:
             self._task.cancel()
@@ -76,12 +421,11 @@ class LuxtronikClient:
                 pass
             self._task = None
 
-        if self.ws:
-            try:
-                self.ws.close()
-            except Exception:
-                pass
-            self.ws = None
+        await self._disconnect()
+
+        if self._owns_session and self._session:
+            await self._session.close()
+            self._session = None
 
         _LOGGER.debug("LuxtronikClient: Closed.")
 
@@ -89,65 +433,682 @@ class LuxtronikClient:
     # Core loop
     # -------------------------------------------------------------
     async def run(self):
-        """Reconnect loop with polling."""
+        """Connection supervisor: connect, poll, and reconnect with backoff."""
         _LOGGER.debug("LuxtronikClient RUN start")
 
-        await asyncio.to_thread(self._connect)
-        # Navigation lesen
-        nav_xml = await asyncio.to_thread(self.ws.recv)
-        self._parse_navigation(nav_xml)
+        await self._prepare()
+        first = True
         while self._should_run:
+            if not first:
+                self.stats.reconnects += 1
+            first = False
             try:
-                await self._poll()
+                # The socket of connect_once() is already past LOGIN
+                if not (self._handshake and self._connected()):
+                    await self._start_session()
+                self._handshake = False
+                self._backoff.reset()
+                self._set_available(True)
+                await self._supervise()
+            except NavigationChanged:
+                _LOGGER.info("LuxtronikClient: Page ids changed, reconnecting")
             except Exception as err:
-                _LOGGER.error("Luxtronik Error: %s", err)
-                await asyncio.sleep(20)
-                await asyncio.to_thread(self._connect)
+                if self._early_requests:
+                    # Maybe other firmware that drops early GETs: wait for
+                    # the navigation again until pipelining proves otherwise
+                    self._early_requests = False
+                    self._set_queueing(None)
+                delay = self._backoff.next()
+                if self.available:
+                    _LOGGER.warning(
+                        "LuxtronikClient %s: Connection lost (%s), reconnecting in %.1f s",
+                        self.ip,
+                        str(err) or type(err).__name__,
+                        delay,
+                    )
+                else:
+                    _LOGGER.debug(
+                        "LuxtronikClient %s: Reconnect failed (%s), retrying in %.1f s",
+                        self.ip,
+                        str(err) or type(err).__name__,
+                        delay,
+                    )
+                self._set_available(False)
+                self._drop_stale()
+                self.thermal.gap()
+                self.electrical.gap()
+                self.cycles.gap()
+                await self._disconnect()
+                await asyncio.sleep(delay)
+
+    async def _prepare(self):
+        """Load the cached navigation and energy totals, once per client.
+
+        With cached ids of firmware that queues requests, polling starts
+        right away; the navigation the controller sends after LOGIN is
+        checked when it arrives.
+        """
+        if self._prepared:
+            return
+        self._prepared = True
+        await self._load_navigation()
+        await self._load_energy()
+        await self._load_snapshot()
+
+    async def _start_session(self):
+        """Connect and LOGIN; _open() decides whether to wait for the navigation."""
+        async with asyncio.timeout(self.connect_timeout):
+            await self._connect()
+        self._last_frame = time.monotonic()
+        self._settings_due = 0.0
+
+    async def _supervise(self):
+        """Run the poll loop until it fails or the watchdog finds the link stale."""
+        poller = asyncio.create_task(self._poll_loop())
+        watchdog = asyncio.create_task(self._watchdog())
+        try:
+            done, _ = await asyncio.wait(
+                (poller, watchdog), return_when=asyncio.FIRST_COMPLETED
+            )
+        finally:
+            poller.cancel()
+            watchdog.cancel()
+            await asyncio.gather(poller, watchdog, return_exceptions=True)
+        for task in done:
+            task.result()
+
+    async def _poll_loop(self):
+        while self._should_run:
+            # Set by _update_demand: a page gained its first consumer
+            self._wakeup.clear()
+            due = self._scheduler.due()
+            if due:
+                if self._scheduler.lateness(due) > DEADLINE_SLACK:
+                    self.stats.missed_deadlines += 1
+                await self._poll(due)
+            if (
+                self._has_settings
+                and self._settings_wanted
+                and time.monotonic() >= self._settings_due
+            ):
+                await self._read_settings()
+            if self.registry.unread(self._page_ids):
+                await self._discover()
+            if time.monotonic() >= self._aggregate_due:
+                self._publish_aggregates()
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(self._wakeup.wait(), self._next_delay())
+
+    def _next_delay(self) -> float | None:
+        """Seconds until the next page, settings read or aggregate; None while idle."""
+        now = time.monotonic()
+        delay = self._scheduler.delay()
+        if self._has_settings and self._settings_wanted:
+            settings = max(0.0, self._settings_due - now)
+            delay = settings if delay is None else min(delay, settings)
+        if delay is not None:
+            # Aggregates are due on their own clock, not with the next poll
+            delay = min(delay, max(0.0, self._aggregate_due - now))
+        return delay
+
+    async def _watchdog(self):
+        """Raise StaleConnection when no frame arrived for WATCHDOG_INTERVALS gaps.
 
-            await asyncio.sleep(self.interval)
+        The gap is that of the pages polled right now, so a lazy client
+        with only slow pages subscribed is not taken for stale. While
+        nothing is polled the controller has no reason to send anything,
+        so an idle link is not checked.
+        """
+        while True:
+            self._demand_changed.clear()
+            limit = WATCHDOG_INTERVALS * max(
+                self._scheduler.longest_gap(), self.request_timeout
+            )
+            silent = time.monotonic() - self._last_frame
+            if silent > limit and self._scheduler.active:
+                raise StaleConnection(f"no frame for {silent:.0f} s")
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(
+                    self._demand_changed.wait(),
+                    max(limit - silent, limit / WATCHDOG_INTERVALS) + 0.01,
+                )
+
+    def _set_available(self, available: bool):
+        """Push availability changes to every subscribed entity."""
+        if available == self.available:
+            return
+        self.available = available
+        if available:
+            _LOGGER.info("LuxtronikClient %s: Connected", self.ip)
+        self._notify_subscribers(list(self._subscribers))
 
     # -------------------------------------------------------------
-    async def _poll(self):
-        """Poll all categories exactly once each cycle."""
-
-        # Temperaturen
-        if self.temp_id:
-            await asyncio.to_thread(self.ws.send, f"GET;{self.temp_id}")
-            xml_temp = await asyncio.to_thread(self.ws.recv)
-            self._parse_values(xml_temp)
-
-        # Wärmemenge
-        if self.waerm_id:
-            await asyncio.to_thread(self.ws.send, f"GET;{self.waerm_id}")
-            xml_waerme = await asyncio.to_thread(self.ws.recv)
-            self._parse_waermemenge(xml_waerme)
-
-        # Ausgänge
-        if self.output_id:
-            await asyncio.to_thread(self.ws.send, f"GET;{self.output_id}")
-            xml_outputs = await asyncio.to_thread(self.ws.recv)
-            self._parse_outputs(xml_outputs)
-
-        # Status
-        if self.state_id:
-            await asyncio.to_thread(self.ws.send, f"GET;{self.state_id}")
-            xml_state = await asyncio.to_thread(self.ws.recv)
-            self._parse_state(xml_state)
+    async def _poll(self, categories=None):
+        """Poll the given categories (all active ones by default) once."""
+        if categories is None:
+            categories = list(self._scheduler.active)
+        pages = [
+            (page_id, name, category)
+            for category, page_id, name in self._pages()
+            if page_id and category in categories
+        ]
+
+        start = time.perf_counter()
+        async with self._limiter, self._io_lock:
+            if self.pipeline and len(pages) > 1:
+                frames = await self._fetch_pipelined(pages)
+            else:
+                frames = await self._fetch_sequential(pages)
+        self._process(pages, frames, categories, start)
+
+    def _process(self, pages, frames, categories, start: float):
+        """Parse the frames of one cycle, then derive, commit and notify."""
+        parse_start = time.perf_counter()
+        updates = {}
+        changed_categories = set()
+        learned = False
+        for (_, _, category), xml in zip(pages, frames):
+            # Byte-identical page: nothing to parse, nothing to notify
+            if xml == self._frames.get(category):
+                self.stats.unchanged_frames += 1
+                continue
+            self._frames[category] = xml
+            changed_categories.add(category)
+            unknown = []
+            updates.update(
+                parse_page(xml, category, self.registry.fields.get(category), unknown)
+            )
+            learned |= self._learn(category, unknown, updates)
+        self._complete_cycle(
+            updates, categories, changed_categories, start, parse_start, learned
+        )
 
+    def _complete_cycle(
+        self,
+        updates: dict,
+        categories,
+        changed_categories: set,
+        start: float,
+        parse_start: float,
+        learned: bool = False,
+    ):
+        """Derive, commit and notify the parsed `updates` of one cycle."""
+        stats = self.stats
         # Heizleistung berechnen
-        self._calculate_heizleistung()
-        self._notify_listeners()
+        self._calculate_heizleistung(updates)
+        self._integrate_energy(updates, categories)
+        if CATEGORY_OUTPUTS in categories:
+            self._track_cycles(updates)
+        changed = self._commit(updates)
+        self._reschedule(categories, changed_categories)
+        self._sample(categories)
 
-    def _calculate_heizleistung(self):
-        """Berechnung der Heizleistung (Watt), Formel wird noch ergänzt."""
+        notify_start = time.perf_counter()
+        stats.parse.add((notify_start - parse_start) * 1000)
+        if changed:
+            self._notify_listeners(changed)
+            stats.notify.add((time.perf_counter() - notify_start) * 1000)
+
+        self._save_snapshot()
+        stats.cycles += 1
+        stats.cycle.add((time.perf_counter() - start) * 1000)
+        self._notify_subscribers((STATS_FIELD, REGISTRY_FIELD) if learned else (STATS_FIELD,))
+
+    def _learn(self, category: str, items, updates: dict) -> bool:
+        """Add unknown labels to the registry and their values to `updates`.
+
+        Marks the page as read even without any.
+        """
+        new = self.registry.learn(category, items)
+        if not new:
+            return False
+        fields = self.registry.fields[category]
+        for name, raw in items:
+            field = fields.get(label(name))
+            if field is not None:
+                updates[field.key] = convert(field, raw)
+        self._save_navigation()
+        return True
+
+    async def _discover(self):
+        """Read each page not read yet once to learn which fields it has.
+
+        Covers the four main pages too, so their extra fields show up
+        even while the page itself is not polled.
+        """
+        page_ids = self._page_ids
+        updates = {}
+        async with self._limiter, self._io_lock:
+            for category in self.registry.unread(page_ids):
+                page_id = page_ids[category]
+                start = time.perf_counter()
+                try:
+                    xml = await self._request_page(
+                        page_id, self.registry.page_name(category)
+                    )
+                except TimeoutError:
+                    _LOGGER.debug("LuxtronikClient: No reply for page %s", page_id)
+                    xml = ""
+                self.stats.add_round_trip(category, (time.perf_counter() - start) * 1000)
+                unknown = []
+                parse_page(xml, category, {}, unknown)
+                self._learn(category, unknown, updates)
+        self._save_navigation()
+        changed = self._commit(updates)
+        if changed:
+            self._notify_listeners(changed)
+        self._notify_subscribers((REGISTRY_FIELD,))
+        # Entities subscribed before their page was known
+        self._update_demand()
+
+    def _commit(self, updates: dict) -> dict:
+        """Swap in the snapshot with `updates` applied; returns what changed.
+
+        Restored values that were just read again count as changed even
+        if equal, so their entities drop the stale mark.
+        """
+        self.snapshot, changed = self.snapshot.evolve(updates, self._time())
+        if self.stale:
+            fresh = self.stale.intersection(updates)
+            if fresh:
+                self.stale -= fresh
+                changed = {**{key: updates[key] for key in fresh}, **changed}
+        if "firmware" in changed:
+            self._save_navigation()
+        if changed and self._streams:
+            change_set = ChangeSet(
+                self.snapshot.version, self.snapshot.timestamp, changed
+            )
+            for stream in self._streams:
+                stream.put(change_set)
+        return changed
+
+    def is_stale(self, key: str) -> bool:
+        """Whether `key` still holds the value restored from the last run."""
+        return key in self.stale
+
+    async def _load_snapshot(self):
+        """Start from the last run's values, marked stale until polled."""
+        if self._snapshot_store is None:
+            return
+        data = await self._snapshot_store.async_load(self.device_id)
+        if not data or not data.get("values"):
+            return
+        values = data["values"]
+        self.snapshot, _ = self.snapshot.evolve(values, data.get("timestamp"))
+        self.stale = set(values)
+        self.restored_at = data.get("timestamp")
+        # The integrated totals must not fall below what entities already
+        # showed, or the statistics would see a meter reset
+        for integrator, key in (
+            (self.thermal, "waerme_berechnet"),
+            (self.electrical, "strom_berechnet"),
+        ):
+            if isinstance(values.get(key), (int, float)):
+                integrator.total = max(integrator.total, values[key])
+
+    def _save_snapshot(self, force: bool = False):
+        """Persist the snapshot every SNAPSHOT_SAVE_INTERVAL, or now with `force`."""
+        if self._snapshot_store is None or self.snapshot.timestamp is None:
+            return
+        now = time.monotonic()
+        if not force and now - self._snapshot_saved < SNAPSHOT_SAVE_INTERVAL:
+            return
+        self._snapshot_saved = now
+        self._snapshot_store.async_save(
+            self.device_id,
+            {"timestamp": self.snapshot.timestamp, "values": self.snapshot.as_dict()},
+        )
+
+    def _drop_stale(self):
+        """The controller is not answering; stop showing the restored values."""
+        if not self.stale:
+            return
+        stale, self.stale = self.stale, set()
+        self._notify_listeners(stale)
+
+    def _integrate_energy(self, updates, categories):
+        """Add this cycle's heat (and electrical) power to the energy totals."""
+        if _FIELD_CATEGORIES["heizleistung"].isdisjoint(categories):
+            return
+        now = self._time()
+        power = updates.get("heizleistung", self.snapshot.get("heizleistung"))
+        self.thermal.add(now, power)
+        updates["waerme_berechnet"] = round(self.thermal.total, 3)
+        if self.electrical_power is not None:
+            self.electrical.add(now, self.electrical_power)
+            updates["strom_berechnet"] = round(self.electrical.total, 3)
+            updates["cop"] = self._cop.add(
+                now, self.thermal.total, self.electrical.total
+            )
+        else:
+            self.electrical.gap()
+        self._energy_changed = True
+        self._save_energy()
+
+    def _save_energy(self, force: bool = False):
+        """Persist the energy totals every ENERGY_SAVE_INTERVAL, or now with `force`.
+
+        Saving on every poll would keep restarting the store's delayed
+        write, so it would only ever happen on shutdown.
+        """
+        if self._energy_store is None or not self._energy_changed:
+            return
+        now = time.monotonic()
+        if not force and now - self._energy_saved < ENERGY_SAVE_INTERVAL:
+            return
+        self._energy_saved = now
+        self._energy_changed = False
+        self._energy_store.async_save(
+            self.device_id,
+            {"thermal": self.thermal.total, "electrical": self.electrical.total},
+        )
+
+    def _track_cycles(self, updates):
+        """Feed this cycle's output states to the cycle analytics."""
+        snapshot = self.snapshot
+        outputs = {
+            key: updates[key] if key in updates else snapshot.get(key)
+            for key in ("verdichter", "av_abtauventil", "zwe1", "zwe2", "zwe3")
+        }
+        updates.update(self.cycles.update(self._time(), outputs))
+
+    async def _load_energy(self):
+        """Continue the energy totals of the last run."""
+        if self._energy_store is None:
+            return
+        data = await self._energy_store.async_load(self.device_id)
+        if data:
+            self.thermal.total = data.get("thermal", 0.0)
+            self.electrical.total = data.get("electrical", 0.0)
+
+    def _sample(self, categories):
+        """Append the current value of each sampled field that was just polled."""
+        now = self._time()
+        for key, buffer in self.samples.items():
+            if _FIELD_CATEGORIES[key].isdisjoint(categories):
+                continue
+            value = self.snapshot.get(key)
+            if isinstance(value, (int, float)):
+                buffer.append(now, value)
+
+    def _publish_aggregates(self):
+        """min/max/mean/last of the last window as <field>_<stat> values."""
+        self._aggregate_due = time.monotonic() + AGGREGATE_WINDOW
+        since = self._time() - AGGREGATE_WINDOW
+        updates = {}
+        for key, buffer in self.samples.items():
+            aggregate = buffer.aggregate(since) or dict.fromkeys(AGGREGATES)
+            for stat in AGGREGATES:
+                updates[f"{key}_{stat}"] = aggregate[stat]
+        changed = self._commit(updates)
+        if changed:
+            self._notify_listeners(changed)
+
+    # -------------------------------------------------------------
+    # Replay of captured frames
+    # -------------------------------------------------------------
+    async def replay(self, frames, speed: float | None = None) -> int:
+        """Feed recorded (timestamp, frame) pairs through parsing and notification.
+
+        Frames are handled as if just received: a navigation frame sets
+        the page ids, every page frame is one cycle of its category, and
+        values carry the recorded times. `speed` 1.0 keeps the recorded
+        pace, None replays as fast as possible. Returns the page frames fed.
+        """
+        loop = asyncio.get_running_loop()
+        first = origin = None
+        fed = 0
+        clock = self._time
+        try:
+            for timestamp, xml in frames:
+                if speed:
+                    if first is None:
+                        first, origin = timestamp, loop.time()
+                    delay = origin + (timestamp - first) / speed - loop.time()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                else:
+                    await asyncio.sleep(0)
+                self._time = lambda timestamp=timestamp: timestamp
+                if xml.lstrip().startswith("<Navigation"):
+                    self._parse_navigation(xml)
+                    continue
+                pages = [
+                    (page_id, name, category)
+                    for category, page_id, name in self._pages()
+                    if page_id
+                ]
+                page_id = self._match_page(xml, pages)
+                if page_id is None:
+                    continue
+                page = next(page for page in pages if page[0] == page_id)
+                self._process([page], [xml], [page[2]], time.perf_counter())
+                fed += 1
+        finally:
+            self._time = clock
+        return fed
+
+    # -------------------------------------------------------------
+    # Settings and writes
+    # -------------------------------------------------------------
+    async def write(self, key: str, value):
+        """Set parameter `key` and return once the controller shows it.
+
+        Raises ValueError for unknown parameters and out-of-range values,
+        WriteNotConfirmed if the controller kept a different value.
+        """
+        parameter = PARAMETERS_BY_KEY.get(key)
+        if parameter is None:
+            raise ValueError(f"Unknown parameter {key}")
+        parameter.to_raw(value)
+        if not self.available:
+            raise ConnectionError("not connected")
+        await self._writes.put(key, value)
+
+    async def _write_batch(self, batch: dict) -> set[str]:
+        """Write `batch`; returns the keys the controller did not take."""
+        async with self._limiter, self._io_lock:
+            updates = await self._set_parameters(batch)
+
+        changed = self._commit(updates)
+        if changed:
+            self._notify_listeners(changed)
+        return {
+            key
+            for key, value in batch.items()
+            if not PARAMETERS_BY_KEY[key].matches(self.snapshot.get(key), value)
+        }
+
+    async def _set_parameters(self, batch: dict) -> dict:
+        """SET every value of `batch`, SAVE, then re-read only the touched pages.
+
+        Needs the socket lock held; returns the values read back.
+        """
+        updates = {}
+        if not batch.keys() <= self._setting_ids.keys():
+            # Item ids come from the settings pages; none read yet
+            updates = await self._fetch_settings(self.setting_pages.values())
+        page_ids = set()
+        for key, value in batch.items():
+            item_id = self._setting_ids.get(key)
+            page_id = self.setting_pages.get(PARAMETERS_BY_KEY[key].page)
+            if item_id is None or page_id is None:
+                continue
+            raw = PARAMETERS_BY_KEY[key].to_raw(value)
+            await self._send(f"SET;set_{item_id};{raw}")
+            page_ids.add(page_id)
+        if page_ids:
+            await self._send("SAVE;1")
+            updates.update(await self._fetch_settings(page_ids))
+        return updates
+
+    async def _read_settings(self):
+        """Read all settings pages and publish their values."""
+        async with self._limiter, self._io_lock:
+            updates = await self._fetch_settings(self.setting_pages.values())
+        self._settings_due = time.monotonic() + SETTINGS_REFRESH_INTERVAL
+        changed = self._commit(updates)
+        if changed:
+            self._notify_listeners(changed)
+
+    @property
+    def _has_settings(self) -> bool:
+        """Whether settings can be read: their pages are in the navigation."""
+        return bool(self.setting_pages)
+
+    async def _fetch_settings(self, page_ids) -> dict:
+        """GET settings pages one by one; needs the socket lock held."""
+        paths = {page_id: path for path, page_id in self.setting_pages.items()}
+        updates = {}
+        for page_id in page_ids:
+            path = paths[page_id]
+            start = time.perf_counter()
+            xml = await self._request_page(page_id, path[-1])
+            self.stats.add_round_trip(
+                CATEGORY_SETTINGS, (time.perf_counter() - start) * 1000
+            )
+            values, item_ids = parse_settings_page(xml, path)
+            self._setting_ids.update(item_ids)
+            updates.update(values)
+        return updates
+
+    async def _request_page(self, page_id: str, name: str) -> str:
+        """GET one page, skipping frames that belong to something else.
+
+        After SAVE the controller may push other frames before the reply.
+        """
+        page = [(page_id, name, None)]
+        await self._send(f"GET;{page_id}")
+        async with asyncio.timeout(self.request_timeout):
+            while True:
+                xml = await self._recv_frame()
+                if self._match_page(xml, page) is not None:
+                    return xml
+
+    @property
+    def _page_ids(self) -> dict[str, str]:
+        """Category -> page id of every page in the navigation."""
+        return {category: page_id for category, page_id, _ in self._pages() if page_id}
+
+    def _pages(self):
+        """Known pages in poll order: (category, page id, menu name)."""
+        return [
+            (CATEGORY_TEMPERATURES, self.temp_id, _PAGE_NAMES[CATEGORY_TEMPERATURES]),
+            (CATEGORY_ENERGY, self.waerm_id, _PAGE_NAMES[CATEGORY_ENERGY]),
+            (CATEGORY_OUTPUTS, self.output_id, _PAGE_NAMES[CATEGORY_OUTPUTS]),
+            (CATEGORY_STATE, self.state_id, _PAGE_NAMES[CATEGORY_STATE]),
+            *(
+                (category, page_id, self.registry.page_name(category))
+                for category, page_id in self.discovered_pages.items()
+            ),
+        ]
+
+    def _reschedule(self, categories, changed_categories):
+        """Feed whether each polled category changed back to the scheduler."""
+        woken = set()
+        for category in categories:
+            changed = category in changed_categories
+            self._scheduler.record(category, changed)
+            if changed:
+                woken.update(_LINKED_CATEGORIES.get(category, ()))
+        for category in woken.difference(categories):
+            self._scheduler.wake(category)
+
+    async def _fetch_pipelined(self, pages):
+        """Send all GETs back to back, then match the replies to their pages.
+
+        Falls back to sequential polling for good if the controller drops
+        queued requests or answers with something we cannot match.
+        """
+        start = time.perf_counter()
+        for page_id, _, _ in pages:
+            await self._send(f"GET;{page_id}")
+
+        categories = {page_id: category for page_id, _, category in pages}
+        frames = {}
+        try:
+            async with asyncio.timeout(PIPELINE_TIMEOUT):
+                while len(frames) < len(pages):
+                    xml = await self._recv_frame()
+                    page_id = self._match_page(xml, pages)
+                    if page_id is None or page_id in frames:
+                        raise ValueError("unexpected reply")
+                    frames[page_id] = xml
+                    self.stats.add_round_trip(
+                        categories[page_id], (time.perf_counter() - start) * 1000
+                    )
+        except (TimeoutError, ValueError) as err:
+            # Drop whatever is still queued on the old socket and retry
+            # sequentially; if that fails too, the link is the problem.
+            if await self._open():
+                raise NavigationChanged from err
+            frames = await self._fetch_sequential(pages)
+            # The link works, so the controller mishandled the pipeline
+            self._pipeline_failures += 1
+            if self._pipeline_failures >= PIPELINE_MAX_FAILURES:
+                _LOGGER.warning(
+                    "LuxtronikClient: Pipelined GET failed (%s), "
+                    "falling back to sequential polling",
+                    str(err) or "timeout",
+                )
+                self.pipeline = False
+                self._set_queueing(False)
+            return frames
+
+        self._pipeline_failures = 0
+        self._set_queueing(True)
+        return [frames[page_id] for page_id, _, _ in pages]
+
+    async def _fetch_sequential(self, pages):
+        """One GET/reply round trip per page."""
+        frames = []
+        for page_id, _, category in pages:
+            start = time.perf_counter()
+            frames.append(await self._request(page_id))
+            self.stats.add_round_trip(category, (time.perf_counter() - start) * 1000)
+        return frames
+
+    @staticmethod
+    def _match_page(xml: str, pages):
+        """Page id a reply belongs to, by its item id or else its page name.
+
+        Names are not unique (Temperaturen is under Informationen and
+        Einstellungen), so an id match wins.
+        """
+        m = _CONTENT_HEAD.search(xml)
+        if m is None:
+            return None
+        reply_id, reply_name = m.groups()
+        for page_id, _, _ in pages:
+            if reply_id == page_id:
+                return page_id
+        for page_id, name, _ in pages:
+            if reply_name == name:
+                return page_id
+        return None
+
+    def _calculate_heizleistung(self, updates):
+        """Berechnung der Heizleistung (Watt), Formel wird noch ergänzt.
+
+        Inputs come from this cycle's `updates` where present, so all three
+        belong to the same moment.
+        """
+        if not updates.keys() & {"vorlauf", "ruecklauf", "durchfluss"}:
+            return
+
+        def value(key):
+            if key in updates:
+                return updates[key]
+            return self.snapshot.get(key)
 
         try:
             # Formel folgt später – Platzhalter:
 
             try:
-                vor = float(self.values.get("vorlauf"))
-                rueck = float(self.values.get("ruecklauf"))
-                flow = float(self.values.get("durchfluss"))  # l/h
+                vor = float(value("vorlauf"))
+                rueck = float(value("ruecklauf"))
+                flow = float(value("durchfluss"))  # l/h
 
             except (TypeError, ValueError):
                 return
@@ -156,161 +1117,200 @@ class LuxtronikClient:
             delta = vor - rueck
 
             if flow <= 0 or delta < 0:
-                self.values["heizleistung"] = 0
+                heizleistung = 0
             else:
                 heat_watts = flow / 3600 * 4180 * delta
-                self.values["heizleistung"] = round(heat_watts, 2)
+                heizleistung = round(heat_watts, 2)
 
         except Exception as e:
             print("Heizleistung-Berechnung Fehler:", e)
-            self.values["heizleistung"] = None
+            heizleistung = None
 
-    # -------------------------------------------------------------
-    # Blocking WS ops → wrapped into asyncio threads
-    # -------------------------------------------------------------
-    def _connect(self):
-        """Blocking WebSocket connect."""
-        url = f"ws://{self.ip}:{self.port}"
-        self.ws = websocket.WebSocket()
-        self.ws.connect(url, subprotocols=["Lux_WS"])
-        self.ws.send(f"LOGIN;{self.password}")
+        updates["heizleistung"] = heizleistung
 
     # -------------------------------------------------------------
-    # Parsing helpers
+    # WebSocket transport (native asyncio via aiohttp)
     # -------------------------------------------------------------
-    def _parse_navigation(self, xml: str):
-        import re
-
-        """Extract navigation IDs."""
-        # Example: find Temperatures menu entry
-        if "Temperaturen" in xml:
-            m = re.search(r"<item id='([^']+)'><name>Temperaturen</name>", xml)
-            if m:
-                self.temp_id = m.group(1)
-
-        if "Wärmemenge" in xml:
-            m = re.search(r"<item id='([^']+)'><name>Wärmemenge</name>", xml)
-            if m:
-                self.waerm_id = m.group(1)
-
-        if "Ausgänge" in xml:
-            m = re.search(r"<item id='([^']+)'><name>Ausgänge</name>", xml)
-            if m:
-                self.output_id = m.group(1)
-
-        if "Anlagenstatus" in xml:
-            m = re.search(r"<item id='([^']+)'><name>Anlagenstatus</name>", xml)
-            if m:
-                self.state_id = m.group(1)
+    async def _connect(self):
+        """Open the WebSocket and send LOGIN; the reply is the navigation."""
+        async with self._limiter:
+            await self._open()
 
-    # -------------------------------------------------------------
-    def get_value(self, key):
-        """Public getter used by sensors."""
-        return self.values.get(key)
+    async def _open(self) -> bool:
+        """_connect() without taking the shared limiter.
 
-    def _clean_value(self, value: str):
-        """Strip Einheit und als float zurückgeben, sofern möglich."""
-        v = value.strip()
+        Reads the navigation LOGIN is answered with before anything else
+        is sent: firmware that cannot queue requests drops a GET that
+        arrives while that reply is pending. Only with cached page ids of
+        firmware known to queue them do the first GETs go out right away;
+        _recv_frame() checks the navigation when it arrives. True if the
+        polled page ids changed.
+        """
+        await self._disconnect()
 
-        # Temperatur
-        if v.endswith("°C"):
-            try:
-                return float(v[:-2].strip())
-            except ValueError:
-                return None
+        if self._session is None:
+            self._session = aiohttp.ClientSession()
+            self._owns_session = True
 
-        # Energie (kWh)
-        if v.endswith("kWh"):
-            try:
-                return float(v[:-3].strip())
-            except ValueError:
-                return None
+        url = f"ws://{self.ip}:{self.port}"
+        self.ws = await self._session.ws_connect(url, protocols=("Lux_WS",))
+        await self.ws.send_str(f"LOGIN;{self.password}")
+        if self.temp_id is not None and self._queues_requests:
+            self._early_requests = True
+            return False
+        # Navigation lesen
+        return self._parse_navigation(await self._recv())
 
-        # Durchfluss (l/h oder ' l/h')
-        if v.endswith("l/h"):
+    def _connected(self) -> bool:
+        return self.ws is not None and not self.ws.closed
+
+    async def _disconnect(self):
+        """Close the current socket, if any."""
+        ws, self.ws = self.ws, None
+        if ws is not None and not ws.closed:
             try:
-                return float(v[:-3].strip())
-            except ValueError:
-                return None
+                await ws.close()
+            except Exception as err:
+                _LOGGER.debug("LuxtronikClient: Error while closing socket: %s", err)
 
-        # Fallback: nackt als float versuchen
-        try:
-            return float(v)
-        except ValueError:
-            return None
+    async def _send(self, data: str):
+        if self.ws is None:
+            raise ConnectionError("not connected")
+        await self.ws.send_str(data)
 
-    def _parse_values(self, xml: str):
-        """Temperatur-XML: <name><value>-Paare auslesen."""
-        NAME_MAP = {
-            "Vorlauf": "vorlauf",
-            "Rücklauf": "ruecklauf",
-            "Rückl.-Soll": "ruecklauf_soll",
-            "Heissgas": "heissgas",
-            "Aussentemperatur": "aussentemperatur",
-            "Mitteltemperatur": "mitteltemperatur",
-            "Warmwasser-Ist": "warmwasser_ist",
-            "Warmwasser-Soll": "warmwasser_soll",
-            "Solarkollektor": "solarkollektor",
-            "Solarspeicher": "solarspeicher",
-            "Externe Energ.Quelle": "externe_energiequelle",
+    async def _recv(self) -> str:
+        """Receive the next text frame from the controller."""
+        if self.ws is None:
+            raise ConnectionError("not connected")
+        msg = await self.ws.receive(timeout=self.request_timeout)
+        if msg.type == aiohttp.WSMsgType.TEXT:
+            data = msg.data
+            size = len(data.encode())
+        elif msg.type == aiohttp.WSMsgType.BINARY:
+            size = len(msg.data)
+            data = msg.data.decode("utf-8", errors="replace")
+        else:
+            raise ConnectionError(f"WebSocket closed ({msg.type.name})")
+        self._last_frame = time.monotonic()
+        self.stats.frames += 1
+        self.stats.bytes_received += size
+        if self.capture is not None:
+            self.capture.record(data)
+        return data
+
+    async def _recv_frame(self) -> str:
+        """Receive the next page frame; navigation frames are applied on the way."""
+        while True:
+            xml = await self._recv()
+            if not xml.lstrip().startswith("<Navigation"):
+                self._early_requests = False
+                return xml
+            if self._parse_navigation(xml):
+                raise NavigationChanged
+
+    async def _request(self, page_id: str) -> str:
+        """GET one page and return its XML."""
+        await self._send(f"GET;{page_id}")
+        return await self._recv_frame()
+
+    # -------------------------------------------------------------
+    # Parsing helpers
+    # -------------------------------------------------------------
+    def _parse_navigation(self, xml: str) -> bool:
+        """Read the navigation tree; True if the polled page ids changed."""
+        tree = NavigationTree.parse(xml)
+        changed = self._apply_navigation(tree)
+        self._save_navigation()
+        return changed
+
+    def _apply_navigation(self, tree: NavigationTree) -> bool:
+        old_ids = (self.temp_id, self.waerm_id, self.output_id, self.state_id)
+        self.navigation = tree
+        self.temp_id = tree.find(_PAGE_NAMES[CATEGORY_TEMPERATURES])
+        self.waerm_id = tree.find(_PAGE_NAMES[CATEGORY_ENERGY])
+        self.output_id = tree.find(_PAGE_NAMES[CATEGORY_OUTPUTS])
+        self.state_id = tree.find(_PAGE_NAMES[CATEGORY_STATE])
+        self.setting_pages = {
+            parameter.page: page_id
+            for parameter in PARAMETERS
+            if (page_id := tree.find_path(parameter.page)) is not None
         }
+        self._discover_pages(tree)
+        return old_ids != (self.temp_id, self.waerm_id, self.output_id, self.state_id)
 
-        for name, value in re.findall(
-            r"<name>([^<]+)</name><value>([^<]+)</value>", xml
-        ):
-            clean_value = self._clean_value(value)
-            key = NAME_MAP.get(name, name)
-            self.values[key] = clean_value
-
-    def _parse_waermemenge(self, xml: str):
-        """Wärmemenge-XML parsen (kWh & Durchfluss)."""
-        NAME_MAP_WAERME = {
-            "Heizung": "waerme_heizung",
-            "Warmwasser": "waerme_ww",
-            "Gesamt": "waerme_gesamt",
-            "Durchfluss": "durchfluss",
-            "seit : 14. 2.2025": "waerme_seit_datum",
-            "seit Reset:": "waerme_seit_reset",
+    def _discover_pages(self, tree: NavigationTree):
+        """Register every leaf page of the tree with the field registry."""
+        polled = {
+            page_id: category
+            for category, page_id, _ in self._pages()[: len(_CATEGORIES)]
+            if page_id
         }
+        parents = {parent for _, parent in tree.nodes.values()}
+        self.discovered_pages = {}
+        for page_id in tree.nodes:
+            if page_id in parents:
+                continue
+            path = tree.path(page_id)
+            if page_id in polled:
+                self.registry.add_page(path, polled[page_id])
+                continue
+            category = self.registry.add_page(path)
+            self.discovered_pages[category] = page_id
+            self._scheduler.add(category, DISCOVERED_PAGE_INTERVAL)
+        self._update_demand()
 
-        for name, value in re.findall(
-            r"<name>([^<]+)</name><value>([^<]+)</value>", xml
-        ):
-            clean_value = self._clean_value(value)
-            key = NAME_MAP_WAERME.get(name, name)
-            self.values[key] = clean_value
-
-    def _parse_outputs(self, xml: str):
-        OUTPUT_MAP = {
-            "AV-Abtauventil": "av_abtauventil",
-            "BUP": "bup",
-            "FUP 1": "fup1",
-            "HUP": "hup",
-            "Ventilation": "ventilation",
-            "Ventil.-BOSUP": "ventil_bosup",
-            "Verdichter": "verdichter",
-            "ZIP": "zip",
-            "ZUP": "zup",
-            "ZWE 1": "zwe1",
-            "ZWE 2 - SST": "zwe2",
-            "ZWE 3": "zwe3",
-            "SLP": "slp",
-            "FUP 2": "fup2",
-            "FUP 3": "fup3",
+    async def _load_navigation(self):
+        """Use the cached navigation tree, if there is one."""
+        if self._navigation_cache is None:
+            return
+        data = await self._navigation_cache.async_load(self.device_id)
+        if not data:
+            return
+        self._cached_navigation = data
+        self._queues_requests = data.get("queues_requests")
+        self.registry.load(data.get("fields", {}))
+        self._apply_navigation(NavigationTree.from_dict(data["tree"]))
+        self._notify_subscribers((REGISTRY_FIELD,))
+
+    def _save_navigation(self):
+        """Update the cache when the tree or the firmware differ from it."""
+        if self._navigation_cache is None or self.navigation is None:
+            return
+        data = {
+            "firmware": self.snapshot.get("firmware"),
+            "tree": self.navigation.as_dict(),
+            "fields": self.registry.as_dict(),
+            "queues_requests": self._queues_requests,
         }
-        for name, value in re.findall(
-            r"<name>([^<]+)</name><value>([^<]+)</value>", xml
+        cached = self._cached_navigation
+        if (
+            cached is not None
+            and cached["tree"] == data["tree"]
+            and cached.get("fields") == data["fields"]
+            and cached.get("queues_requests") == data["queues_requests"]
         ):
-            if name in OUTPUT_MAP:
-                self.values[OUTPUT_MAP[name]] = value
+            if data["firmware"] is None or cached.get("firmware") == data["firmware"]:
+                return
+        self._cached_navigation = data
+        self._navigation_cache.async_save(self.device_id, data)
 
-    def _parse_state(self, xml: str):
-        _LOGGER.debug(f"Luxtronik2 Betriebszustand: {xml}")
+    def _set_queueing(self, queues: bool | None):
+        """Remember whether the firmware queues requests, with the navigation."""
+        if queues != self._queues_requests:
+            self._queues_requests = queues
+            self._save_navigation()
 
-        for name, value in re.findall(
-            r"<name>([^<]+)</name><value>([^<]+)</value>", xml
-        ):
-            _LOGGER.debug(f"Luxtronik2 state values: {name} = {value}")
-            if name == "Betriebszustand":
-                _LOGGER.debug(f"Luxtronik2 Betriebszusand gefunden mit Wert {value}")
-                self.values["Betriebszustand"] = value
+    # -------------------------------------------------------------
+    @property
+    def intervals(self) -> dict[str, float]:
+        """Current poll interval per category."""
+        return self._scheduler.intervals
+
+    @property
+    def values(self) -> dict:
+        """Values of the current snapshot as a plain dict."""
+        return self.snapshot.as_dict()
+
+    def get_value(self, key):
+        """Public getter used by sensors."""
+        return self.snapshot.get(key)
@@ -0,0 +1,70 @@
+"""Coalescing queue for parameter writes."""
+
+import asyncio
+
+from .const import WRITE_COALESCE_WINDOW
+
+
+class WriteNotConfirmed(Exception):
+    """The value read back after a write differs from the one sent."""
+
+
+class WriteQueue:
+    """Collect writes and hand them to `send` in batches.
+
+    Writes to the same parameter within `window` seconds collapse into the
+    last one; everyone waiting on that parameter gets the outcome of the
+    write that was actually sent. Batches are at least `window` apart, so
+    an automation adjusting a setpoint in a loop cannot flood the
+    controller. `send(batch)` returns the keys it could not confirm.
+    """
+
+    def __init__(self, send, window: float = WRITE_COALESCE_WINDOW):
+        self._send = send
+        self._window = window
+        self._pending: dict[str, tuple[object, asyncio.Future]] = {}
+        self._task: asyncio.Task | None = None
+        self._batch: dict[str, tuple[object, asyncio.Future]] = {}
+
+    async def put(self, key: str, value):
+        """Queue `value` for `key` and wait until it is written and read back."""
+        loop = asyncio.get_running_loop()
+        entry = self._pending.get(key)
+        future = entry[1] if entry is not None else loop.create_future()
+        self._pending[key] = (value, future)
+        if self._task is None or self._task.done():
+            self._task = loop.create_task(self._flush())
+        # A cancelled caller must not cancel the write for the others
+        await asyncio.shield(future)
+
+    async def _flush(self):
+        while self._pending:
+            await asyncio.sleep(self._window)
+            batch = self._batch = self._pending
+            self._pending = {}
+            try:
+                failed = await self._send(
+                    {key: value for key, (value, _) in batch.items()}
+                )
+            except Exception as err:
+                for _, future in batch.values():
+                    if not future.done():
+                        future.set_exception(err)
+                continue
+            for key, (value, future) in batch.items():
+                if future.done():
+                    continue
+                if key in failed:
+                    future.set_exception(
+                        WriteNotConfirmed(f"{key}: controller did not take {value!r}")
+                    )
+                else:
+                    future.set_result(None)
+
+    def cancel(self):
+        """Drop queued writes; their callers see CancelledError."""
+        if self._task is not None:
+            self._task.cancel()
+        for _, future in (*self._batch.values(), *self._pending.values()):
+            future.cancel()
+        self._pending = {}
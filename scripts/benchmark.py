@@ -0,0 +1,797 @@
+"""Offline benchmark suite for LuxtronikClient, run against the local simulator.
+
+Measures page parse throughput, per-cycle latency and thread usage for
+sequential and pipelined polling, reconnect and startup time, recovery
+from injected faults, memory per client and how many state writes the
+publish policies save.
+Results can be written as JSON and compared against an earlier run to
+catch regressions:
+
+    python scripts/benchmark.py --json bench.json
+    python scripts/benchmark.py --baseline bench.json --tolerance 0.25
+"""
+
+import argparse
+import asyncio
+import inspect
+import json
+import math
+import pathlib
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import types
+
+import aiohttp
+from luxsim import (
+    DEFAULT_VALUES,
+    OUTPUT_ID,
+    STATE_ID,
+    TEMP_ID,
+    WAERM_ID,
+    LuxBinarySimulator,
+    LuxSimulator,
+    render_page,
+)
+
+PACKAGE_DIR = pathlib.Path(__file__).resolve().parents[1] / "custom_components" / "luxtronik2"
+
+
+def load_client_module():
+    """Import the integration's client without pulling in Home Assistant."""
+    if "luxtronik2" not in sys.modules:
+        pkg = types.ModuleType("luxtronik2")
+        pkg.__path__ = [str(PACKAGE_DIR)]
+        sys.modules["luxtronik2"] = pkg
+    from luxtronik2 import websocket_client
+
+    return websocket_client
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+async def bench_cycles(
+    cycles: int,
+    latency: float,
+    pipeline: bool = True,
+    pipelining: bool = True,
+    jitter: float = 0.0,
+) -> dict:
+    websocket_client = load_client_module()
+    sim = LuxSimulator(latency=latency, pipelining=pipelining, jitter=jitter, seed=1)
+    port = await sim.start()
+
+    client = websocket_client.LuxtronikClient(
+        "127.0.0.1", sim.password, port, 0, pipeline=pipeline
+    )
+    durations: list[float] = []
+    done = asyncio.Event()
+    peak_threads = threading.active_count()
+    poll = client._poll
+
+    async def timed_poll(*args):
+        nonlocal peak_threads
+        start = time.perf_counter()
+        await poll(*args)
+        durations.append((time.perf_counter() - start) * 1000)
+        peak_threads = max(peak_threads, threading.active_count())
+        if len(durations) >= cycles:
+            done.set()
+
+    client._poll = timed_poll
+    task = asyncio.create_task(client.run())
+    await asyncio.wait_for(done.wait(), timeout=60 + cycles)
+    task.cancel()
+    await client.close()
+    await sim.stop()
+
+    # The first cycle may include the fallback from pipelining
+    durations = durations[1:]
+    return {
+        "cycles": len(durations),
+        "mean_ms": statistics.fmean(durations),
+        "p50_ms": percentile(durations, 0.50),
+        "p95_ms": percentile(durations, 0.95),
+        "peak_threads": peak_threads,
+        "requests": sim.requests,
+        "pipelined": client.pipeline,
+    }
+
+
+def bench_parse(rounds: int) -> dict:
+    load_client_module()
+    from luxtronik2.const import (
+        CATEGORY_ENERGY,
+        CATEGORY_OUTPUTS,
+        CATEGORY_STATE,
+        CATEGORY_TEMPERATURES,
+    )
+    from luxtronik2.fields import parse_page
+
+    categories = {
+        TEMP_ID: CATEGORY_TEMPERATURES,
+        WAERM_ID: CATEGORY_ENERGY,
+        OUTPUT_ID: CATEGORY_OUTPUTS,
+        STATE_ID: CATEGORY_STATE,
+    }
+    frames = [
+        (render_page(page_id, DEFAULT_VALUES[page_id]), category)
+        for page_id, category in categories.items()
+    ]
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for xml, category in frames:
+            parse_page(xml, category)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    for xml, category in frames:
+        parse_page(xml, category)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "frames": rounds * len(frames),
+        "us_per_frame": elapsed / (rounds * len(frames)) * 1e6,
+        "peak_bytes_per_frame": peak / len(frames),
+    }
+
+
+async def bench_binary(rounds: int, cycles: int, latency: float) -> dict:
+    """XML pages vs. the binary arrays: decode cost and live poll cycles.
+
+    Decoding is all four pages parsed from XML against one calculations
+    block unpacked and decoded. The live part polls every category from
+    either simulator with the flow temperature changing each cycle.
+    """
+    websocket_client = load_client_module()
+    from luxtronik2.binary import CALCULATIONS, decode, unpack_array
+    from luxtronik2.binary_client import LuxtronikBinaryClient
+    from luxtronik2.const import (
+        CATEGORY_ENERGY,
+        CATEGORY_OUTPUTS,
+        CATEGORY_STATE,
+        CATEGORY_TEMPERATURES,
+    )
+    from luxtronik2.fields import parse_page
+
+    pages = [
+        (render_page(page_id, DEFAULT_VALUES[page_id]), category)
+        for page_id, category in (
+            (TEMP_ID, CATEGORY_TEMPERATURES),
+            (WAERM_ID, CATEGORY_ENERGY),
+            (OUTPUT_ID, CATEGORY_OUTPUTS),
+            (STATE_ID, CATEGORY_STATE),
+        )
+    ]
+    binary_sim = LuxBinarySimulator(latency=latency)
+    block = binary_sim._reply(3004, 0, 0)[12:]
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for xml, category in pages:
+            parse_page(xml, category)
+    xml_us = (time.perf_counter() - start) / rounds * 1e6
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        values = unpack_array(block)
+        for category in CALCULATIONS:
+            decode(values, category)
+    binary_us = (time.perf_counter() - start) / rounds * 1e6
+
+    async def live(client, sim, change):
+        await client.test_connection()
+        durations = []
+        for cycle in range(cycles):
+            change(cycle)
+            start = time.perf_counter()
+            await client._poll(list(CALCULATIONS))
+            durations.append((time.perf_counter() - start) * 1000)
+        await client.close()
+        await sim.stop()
+        return statistics.fmean(durations), client.stats.bytes_received / cycles
+
+    xml_sim = LuxSimulator(latency=latency)
+    port = await xml_sim.start()
+    xml_ms, xml_bytes = await live(
+        websocket_client.LuxtronikClient("127.0.0.1", xml_sim.password, port, 60),
+        xml_sim,
+        lambda cycle: xml_sim.set_value("Vorlauf", f"{30 + cycle % 50 / 10:.1f}°C"),
+    )
+    port = await binary_sim.start()
+    binary_ms, binary_bytes = await live(
+        LuxtronikBinaryClient("127.0.0.1", "", port, 60),
+        binary_sim,
+        lambda cycle: binary_sim.calculations.__setitem__(10, 300 + cycle % 50),
+    )
+    return {
+        "xml_decode_us": xml_us,
+        "binary_decode_us": binary_us,
+        "decode_speedup": xml_us / binary_us,
+        "xml_cycle_ms": xml_ms,
+        "binary_cycle_ms": binary_ms,
+        "xml_bytes_per_cycle": xml_bytes,
+        "binary_bytes_per_cycle": binary_bytes,
+    }
+
+
+async def bench_reconnect(rounds: int, latency: float) -> dict:
+    """Time connect + LOGIN + navigation, as done after every reconnect."""
+    websocket_client = load_client_module()
+    sim = LuxSimulator(latency=latency)
+    port = await sim.start()
+    client = websocket_client.LuxtronikClient("127.0.0.1", sim.password, port, 0)
+
+    durations = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        # Reads the navigation LOGIN is answered with
+        await client._connect()
+        durations.append((time.perf_counter() - start) * 1000)
+
+    await client.close()
+    await sim.stop()
+    return {
+        "reconnects": rounds,
+        "mean_ms": statistics.fmean(durations),
+        "p95_ms": percentile(durations, 0.95),
+    }
+
+
+async def bench_memory(clients: int) -> dict:
+    """Memory held per connected client after one full poll."""
+    websocket_client = load_client_module()
+    sim = LuxSimulator()
+    port = await sim.start()
+
+    # One shared session, as Home Assistant provides
+    async with aiohttp.ClientSession() as session:
+        tracemalloc.start()
+        before, _ = tracemalloc.get_traced_memory()
+        pool = []
+        for _ in range(clients):
+            client = websocket_client.LuxtronikClient(
+                "127.0.0.1", sim.password, port, 0, session
+            )
+            await client._connect()
+            await client._poll()
+            pool.append(client)
+        after, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        for client in pool:
+            await client.close()
+    await sim.stop()
+
+    return {
+        "clients": clients,
+        "bytes_per_client": (after - before) / clients,
+        "peak_bytes_per_client": (peak - before) / clients,
+    }
+
+
+async def _until(predicate, timeout: float) -> bool:
+    """Wait until `predicate()` holds; False if it did not within `timeout`."""
+    deadline = time.perf_counter() + timeout
+    while not predicate():
+        if time.perf_counter() > deadline:
+            return False
+        await asyncio.sleep(0.01)
+    return True
+
+
+async def bench_faults(duration: float, rate: float, latency: float) -> dict:
+    """Keep polling through dropped, stalled and malformed replies.
+
+    Runs `duration` seconds of random faults, then each fault on its own
+    for every request. Checks, listed under "failures" if they do not
+    hold: values resume once the faults stop, a dropped or stalled link
+    makes the client unavailable and available again, malformed frames
+    do not stop it, and every reconnect delay is within the backoff's
+    jittered bounds (those of the scaled-down Backoff used here, and
+    RECONNECT_MIN_DELAY/2..RECONNECT_MAX_DELAY for the default one).
+    """
+    websocket_client = load_client_module()
+    from luxtronik2.const import RECONNECT_MAX_DELAY, RECONNECT_MIN_DELAY
+    from luxtronik2.scheduler import Backoff
+
+    sim = LuxSimulator(
+        latency=latency,
+        drop_rate=rate,
+        stall_rate=rate,
+        malformed_rate=rate,
+        seed=7,
+    )
+    port = await sim.start()
+    client = websocket_client.LuxtronikClient("127.0.0.1", sim.password, port, 0.2)
+    # Scaled down so a run takes seconds, not minutes
+    client.connect_timeout = 1.0
+    client.request_timeout = 0.5
+    backoff = client._backoff = Backoff(0.05, 1.0)
+    delays: list[float] = []
+    next_delay = backoff.next
+
+    def recorded_delay():
+        delays.append(next_delay())
+        return delays[-1]
+
+    backoff.next = recorded_delay
+
+    # Availability as the entities see it
+    availability = [client.available]
+
+    def on_update():
+        if client.available != availability[-1]:
+            availability.append(client.available)
+
+    client.subscribe("vorlauf", on_update)
+
+    stamps: list[float] = []
+    poll = client._poll
+
+    async def timed_poll(*args):
+        await poll(*args)
+        stamps.append(time.perf_counter())
+
+    client._poll = timed_poll
+    failures = []
+    marker = [20.0]
+
+    async def resumes(what: str):
+        """Clear all faults; the next value change must come through."""
+        sim.drop_rate = sim.stall_rate = sim.malformed_rate = 0.0
+        marker[0] += 0.5
+        sim.set_value("Vorlauf", f"{marker[0]:.1f}°C")
+        if not await _until(
+            lambda: client.available and client.get_value("vorlauf") == marker[0], 10
+        ):
+            failures.append(f"no values after {what}")
+
+    start = time.perf_counter()
+    task = asyncio.create_task(client.run())
+    await asyncio.sleep(duration)
+    gaps = [b - a for a, b in zip([start, *stamps], stamps)]
+    polls, reconnects = len(stamps), client.stats.reconnects
+    await resumes("random faults")
+
+    for fault in ("drop_rate", "stall_rate", "malformed_rate"):
+        seen = len(availability)
+        setattr(sim, fault, 1.0)
+        if fault == "malformed_rate":
+            polled = len(stamps)
+            await _until(lambda: len(stamps) >= polled + 3, 5)
+            if False in availability[seen:]:
+                failures.append("unavailable on malformed frames")
+        elif not await _until(lambda: False in availability[seen:], 10):
+            failures.append(f"still available with {fault} 1.0")
+        await resumes(fault.removesuffix("_rate"))
+        if fault != "malformed_rate" and availability[seen:][-2:] != [False, True]:
+            failures.append(f"availability after {fault}: {availability[seen:]}")
+
+    task.cancel()
+    await client.close()
+    await sim.stop()
+
+    if not delays:
+        failures.append("no reconnect delay drawn")
+    low, high = backoff.minimum / 2, backoff.maximum
+    failures.extend(
+        f"reconnect delay {delay:.3f} s outside {low}..{high} s"
+        for delay in delays
+        if not low <= delay <= high
+    )
+    default = Backoff()
+    default_delays = [default.next() for _ in range(40)]
+    if not all(
+        RECONNECT_MIN_DELAY / 2 <= delay <= RECONNECT_MAX_DELAY
+        for delay in default_delays
+    ):
+        failures.append("default backoff outside RECONNECT_MIN_DELAY..RECONNECT_MAX_DELAY")
+
+    return {
+        "fault_rate": rate,
+        "polls": polls,
+        "reconnects": reconnects,
+        "max_gap_s": max(gaps, default=duration),
+        "pipelined": client.pipeline,
+        "max_delay_s": max(delays, default=0.0),
+        "failures": failures,
+    }
+
+
+class MemoryNavigationCache:
+    """In-memory stand-in for the Home Assistant navigation store."""
+
+    def __init__(self):
+        self.data = {}
+
+    async def async_load(self, device_id):
+        return self.data.get(device_id)
+
+    def async_save(self, device_id, data):
+        self.data[device_id] = data
+
+    def async_remove(self, device_id):
+        self.data.pop(device_id, None)
+
+
+async def bench_startup(rounds: int, latency: float, cached: bool) -> dict:
+    """Setup as Home Assistant does it: test_connection(), start(), first values.
+
+    Measures the time until setup returns and until the first values,
+    with or without a navigation cache, and the connections per startup.
+    """
+    websocket_client = load_client_module()
+    sim = LuxSimulator(latency=latency)
+    port = await sim.start()
+    cache = MemoryNavigationCache() if cached else None
+
+    setups = []
+    durations = []
+    connections = sim.connections
+    for _ in range(rounds + 1):
+        client = websocket_client.LuxtronikClient(
+            "127.0.0.1", sim.password, port, 60, navigation_cache=cache
+        )
+        first_values = asyncio.Event()
+
+        def on_vorlauf(client=client, first_values=first_values):
+            # Availability notifies subscribers too, before any value is read
+            if client.get_value("vorlauf") is not None:
+                first_values.set()
+
+        client.subscribe("vorlauf", on_vorlauf)
+        start = time.perf_counter()
+        await client.test_connection()
+        await client.start()
+        setups.append((time.perf_counter() - start) * 1000)
+        await first_values.wait()
+        durations.append((time.perf_counter() - start) * 1000)
+        await client.close()
+        if len(durations) == 1:
+            connections = sim.connections
+
+    await sim.stop()
+    # The first round only fills the cache
+    durations = durations[1:]
+    setups = setups[1:]
+    return {
+        "startups": rounds,
+        "setup_mean_ms": statistics.fmean(setups),
+        "mean_ms": statistics.fmean(durations),
+        "p95_ms": percentile(durations, 0.95),
+        "connections_per_startup": (sim.connections - connections) / rounds,
+    }
+
+
+async def bench_replay(cycles: int, path: str | None) -> dict:
+    """Replay a capture at full speed through a fresh client.
+
+    Without `path`, records `cycles` poll cycles from the simulator first,
+    with a temperature changing every cycle, and checks that the replay
+    ends with the same values as the client that recorded them.
+    """
+    websocket_client = load_client_module()
+    from luxtronik2.capture import FrameRecorder, read_capture
+
+    live = None
+    if path is None:
+        path = str(pathlib.Path(tempfile.mkdtemp()) / "capture.jsonl.gz")
+        sim = LuxSimulator()
+        port = await sim.start()
+        live = websocket_client.LuxtronikClient("127.0.0.1", sim.password, port, 60)
+        await live.test_connection()
+        recorder = FrameRecorder(path)
+        recorder.record(live.navigation.to_xml())
+        live.capture = recorder
+        for cycle in range(cycles):
+            sim.set_value("Vorlauf", f"{30 + cycle % 50 / 10:.1f}°C")
+            await live._poll()
+        live.capture = None
+        await recorder.close()
+        await live.close()
+        await sim.stop()
+
+    frames = list(read_capture(path))
+    client = websocket_client.LuxtronikClient("127.0.0.1", "", 0, 60)
+    notified = []
+    client.register_listener(lambda: notified.append(None))
+    start = time.perf_counter()
+    fed = await client.replay(frames)
+    elapsed = time.perf_counter() - start
+
+    result = {
+        "frames": fed,
+        "us_per_frame": elapsed / max(fed, 1) * 1e6,
+        "notifications": len(notified),
+    }
+    if live is not None:
+        recorded, replayed = live.snapshot.as_dict(), client.snapshot.as_dict()
+        result["values_matching"] = sum(
+            replayed.get(key) == value for key, value in recorded.items()
+        ) / max(len(recorded), 1)
+    return result
+
+
+async def bench_stream(consumers: int, cycles: int) -> dict:
+    """Cost of fanning change sets out to stream consumers.
+
+    Times `cycles` commits of a few changed values with no stream and
+    with `consumers` streams, all but one drained between commits; the
+    one never read shows that a stalled consumer stays bounded.
+    """
+    websocket_client = load_client_module()
+    from luxtronik2.const import STREAM_DROP_OLDEST
+
+    def updates(cycle: int) -> dict:
+        return {
+            "vorlauf": 30 + cycle % 100 / 10,
+            "ruecklauf": 25 + cycle % 7,
+            "verdichter": cycle % 2 == 0,
+        }
+
+    bare = websocket_client.LuxtronikClient("127.0.0.1", "", 0, 60)
+    start = time.perf_counter()
+    for cycle in range(cycles):
+        bare._commit(updates(cycle))
+    bare_us = (time.perf_counter() - start) / cycles * 1e6
+
+    client = websocket_client.LuxtronikClient("127.0.0.1", "", 0, 60)
+    streams = [client.stream() for _ in range(consumers - 1)]
+    stalled = client.stream(policy=STREAM_DROP_OLDEST)
+    received = 0
+
+    async def drain(stream):
+        nonlocal received
+        async for _ in stream:
+            received += 1
+
+    tasks = [asyncio.create_task(drain(stream)) for stream in streams]
+    elapsed = 0.0
+    for cycle in range(cycles):
+        start = time.perf_counter()
+        client._commit(updates(cycle))
+        elapsed += time.perf_counter() - start
+        await asyncio.sleep(0)
+    await client.close()
+    await asyncio.gather(*tasks)
+    return {
+        "consumers": consumers,
+        "commit_us": bare_us,
+        "commit_with_streams_us": elapsed / cycles * 1e6,
+        "delivered_ratio": received / (cycles * (consumers - 1)),
+        "stalled_queued": len(stalled),
+        "stalled_dropped": stalled.dropped,
+    }
+
+
+def bench_publish(hours: float, period: float = 10.0) -> dict:
+    """State writes with the default publish policies vs. one per change.
+
+    Replays synthetic 10 s samples of a temperature, the flow and an energy
+    counter through PublishGate with a fake clock; pending delayed writes
+    are flushed the way async_call_later would.
+    """
+    load_client_module()
+    from luxtronik2.const import (
+        CONF_DEADBAND,
+        CONF_DEADBAND_RELATIVE,
+        CONF_MAX_PUBLISH_INTERVAL,
+        CONF_MIN_PUBLISH_INTERVAL,
+        DEFAULT_PUBLISH_POLICIES,
+        PUBLISH_ENERGY,
+        PUBLISH_FLOW,
+        PUBLISH_TEMPERATURE,
+    )
+    from luxtronik2.publish import PublishGate, PublishPolicy
+
+    rng = random.Random(1)
+    steps = int(hours * 3600 / period)
+    series = {
+        PUBLISH_TEMPERATURE: [
+            round(35 + 5 * math.sin(i / 360) + rng.gauss(0, 0.1), 1)
+            for i in range(steps)
+        ],
+        PUBLISH_FLOW: [
+            (1150 + rng.randrange(-20, 21, 10)) if (i // 180) % 2 else 0
+            for i in range(steps)
+        ],
+        PUBLISH_ENERGY: [round(18000 + i * 0.012, 1) for i in range(steps)],
+    }
+
+    result = {"samples": steps}
+    for publish_class, values in series.items():
+        settings = DEFAULT_PUBLISH_POLICIES[publish_class]
+        policy = PublishPolicy(
+            settings[CONF_DEADBAND],
+            settings[CONF_DEADBAND_RELATIVE],
+            settings[CONF_MIN_PUBLISH_INTERVAL],
+            settings[CONF_MAX_PUBLISH_INTERVAL],
+        )
+        now = 0.0
+        gate = PublishGate(policy, clock=lambda: now)
+        changes = writes = 0
+        due = None
+        last = None
+        for i, value in enumerate(values):
+            now = i * period
+            if due is not None and due <= now:
+                gate.published(last, True)
+                writes += 1
+                due = None
+            if value != last:
+                changes += 1
+            last = value
+            delay = gate.check(value, True)
+            # Like the entity: any pending write is cancelled first
+            due = None
+            if delay == 0:
+                gate.published(value, True)
+                writes += 1
+            elif delay is not None:
+                due = now + delay
+        result[f"{publish_class}_changes"] = changes
+        result[f"{publish_class}_writes"] = writes
+    return result
+
+
+# Metric per suite entry that must not get worse than the baseline
+REGRESSION_METRICS = {
+    "parse": "us_per_frame",
+    "poll_sequential": "mean_ms",
+    "poll_pipelined": "mean_ms",
+    "poll_jitter": "mean_ms",
+    "reconnect": "mean_ms",
+    "startup_cached": "mean_ms",
+    "binary": "binary_cycle_ms",
+    "memory": "bytes_per_client",
+}
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Regressions of more than `tolerance` against a baseline run."""
+    regressions = []
+    for name, metric in REGRESSION_METRICS.items():
+        old = baseline.get(name, {}).get(metric)
+        new = results.get(name, {}).get(metric)
+        if old and new is not None and new > old * (1 + tolerance):
+            regressions.append(f"{name}.{metric}: {old:.3f} -> {new:.3f}")
+    return regressions
+
+
+def print_result(title: str, result: dict):
+    print(f"== {title}")
+    for key, value in result.items():
+        if isinstance(value, float):
+            print(f"  {key:>22}: {value:.3f}")
+        else:
+            print(f"  {key:>22}: {value}")
+
+
+async def _main(args) -> int:
+    rtt = f"simulator latency {args.latency * 1000:.1f} ms"
+    suite = [
+        ("parse", "parse", lambda: bench_parse(args.parse_rounds)),
+        (
+            "poll_sequential",
+            f"sequential poll, {rtt}",
+            lambda: bench_cycles(args.cycles, args.latency, pipeline=False),
+        ),
+        (
+            "poll_pipelined",
+            f"pipelined poll, {rtt}",
+            lambda: bench_cycles(args.cycles, args.latency),
+        ),
+        (
+            "poll_jitter",
+            f"pipelined poll, {rtt} + up to {args.jitter * 1000:.1f} ms jitter",
+            lambda: bench_cycles(args.cycles, args.latency, jitter=args.jitter),
+        ),
+        (
+            "poll_no_queueing",
+            f"pipelined poll against non-queueing firmware, {rtt}",
+            lambda: bench_cycles(args.cycles, args.latency, pipelining=False),
+        ),
+        (
+            "reconnect",
+            f"reconnect, {rtt}",
+            lambda: bench_reconnect(args.reconnects, args.latency),
+        ),
+        (
+            "startup",
+            f"time to first value, {rtt}",
+            lambda: bench_startup(args.startups, args.latency, cached=False),
+        ),
+        (
+            "startup_cached",
+            f"time to first value with cached navigation, {rtt}",
+            lambda: bench_startup(args.startups, args.latency, cached=True),
+        ),
+        (
+            "faults",
+            f"polling through faults ({args.fault_rate:.0%} drop/stall/malformed each)",
+            lambda: bench_faults(args.fault_duration, args.fault_rate, args.latency),
+        ),
+        (
+            "binary",
+            f"XML pages vs. binary arrays (port 8889), {rtt}",
+            lambda: bench_binary(args.parse_rounds // 4, args.cycles, args.latency),
+        ),
+        ("memory", "memory", lambda: bench_memory(args.clients)),
+        (
+            "stream",
+            f"change-set streams, {args.consumers} consumers",
+            lambda: bench_stream(args.consumers, args.cycles * 10),
+        ),
+        (
+            "replay",
+            f"replay of {args.capture or f'{args.cycles} simulated cycles'}",
+            lambda: bench_replay(args.cycles, args.capture),
+        ),
+        (
+            "publish",
+            f"state writes over {args.publish_hours:g} h of 10 s samples",
+            lambda: bench_publish(args.publish_hours),
+        ),
+    ]
+
+    results = {}
+    for name, title, run in suite:
+        if args.only and name not in args.only:
+            continue
+        result = run()
+        results[name] = await result if inspect.isawaitable(result) else result
+        print_result(title, results[name])
+
+    if args.json:
+        pathlib.Path(args.json).write_text(json.dumps(results, indent=2))
+
+    failed = [
+        f"{name}: {failure}"
+        for name, result in results.items()
+        for failure in result.get("failures", ())
+    ]
+    for line in failed:
+        print(f"FAILED {line}")
+
+    if args.baseline:
+        baseline = json.loads(pathlib.Path(args.baseline).read_text())
+        regressions = compare(results, baseline, args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        return 1 if regressions or failed else 0
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cycles", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.005)
+    parser.add_argument("--parse-rounds", type=int, default=20000)
+    parser.add_argument("--reconnects", type=int, default=50)
+    parser.add_argument("--startups", type=int, default=20)
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--consumers", type=int, default=8)
+    parser.add_argument("--fault-rate", type=float, default=0.05)
+    parser.add_argument("--fault-duration", type=float, default=10.0)
+    parser.add_argument("--publish-hours", type=float, default=24.0)
+    parser.add_argument("--capture", help="replay this capture file instead of recording one")
+    parser.add_argument(
+        "--only",
+        nargs="*",
+        choices=[*REGRESSION_METRICS, "poll_no_queueing", "startup", "faults", "publish", "replay", "stream"],
+    )
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--baseline", help="compare against results from --json")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    sys.exit(asyncio.run(_main(parser.parse_args())))
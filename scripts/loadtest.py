@@ -0,0 +1,113 @@
+"""Run many LuxtronikClients against simulated controllers in one event loop.
+
+Each client gets its own simulator (own port), all clients share one HTTP
+session and one LuxtronikHub, like config entries in Home Assistant.
+Reports event-loop lag, memory per device and request rate.
+
+    python scripts/loadtest.py --devices 50 --interval 2 --duration 30
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+import tracemalloc
+
+import aiohttp
+from benchmark import load_client_module, percentile, print_result
+from luxsim import LuxSimulator
+
+
+async def measure_lag(stop: asyncio.Event, tick: float, lags: list[float]):
+    """Sample how late the loop wakes up a task that sleeps `tick` seconds."""
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        start = loop.time()
+        await asyncio.sleep(tick)
+        lags.append((loop.time() - start - tick) * 1000)
+
+
+async def run(args) -> dict:
+    websocket_client = load_client_module()
+    from luxtronik2.hub import LuxtronikHub
+
+    sims = [
+        LuxSimulator(latency=args.latency, jitter=args.jitter, seed=i)
+        for i in range(args.devices)
+    ]
+    ports = [await sim.start() for sim in sims]
+    hub = LuxtronikHub(args.max_concurrent)
+
+    async with aiohttp.ClientSession() as session:
+        tracemalloc.start()
+        before, _ = tracemalloc.get_traced_memory()
+
+        clients = []
+        for i, (sim, port) in enumerate(zip(sims, ports)):
+            device_id = f"device{i}"
+            clients.append(
+                websocket_client.LuxtronikClient(
+                    "127.0.0.1",
+                    sim.password,
+                    port,
+                    args.interval,
+                    session,
+                    device_id=device_id,
+                    limiter=hub.limiter,
+                    phase=0.0 if args.no_stagger else hub.phase(device_id),
+                )
+            )
+
+        stop = asyncio.Event()
+        lags: list[float] = []
+        lag_task = asyncio.create_task(measure_lag(stop, args.tick, lags))
+        tasks = [asyncio.create_task(client.run()) for client in clients]
+
+        start = time.perf_counter()
+        await asyncio.sleep(args.duration)
+        elapsed = time.perf_counter() - start
+
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        stop.set()
+        await lag_task
+        for task in tasks:
+            task.cancel()
+        for client in clients:
+            await client.close()
+
+    for sim in sims:
+        await sim.stop()
+
+    return {
+        "devices": args.devices,
+        "requests_per_s": sum(sim.requests for sim in sims) / elapsed,
+        "lag_mean_ms": statistics.fmean(lags),
+        "lag_p99_ms": percentile(lags, 0.99),
+        "lag_max_ms": max(lags),
+        "bytes_per_device": (current - before) / args.devices,
+        "peak_bytes_per_device": (peak - before) / args.devices,
+    }
+
+
+async def _main(args):
+    stagger = "no stagger" if args.no_stagger else "staggered"
+    print_result(
+        f"{args.devices} devices, interval {args.interval} s, {stagger}, "
+        f"max {args.max_concurrent} concurrent",
+        await run(args),
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--devices", type=int, default=50)
+    parser.add_argument("--interval", type=float, default=2.0)
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--jitter", type=float, default=0.01)
+    parser.add_argument("--tick", type=float, default=0.01)
+    parser.add_argument("--max-concurrent", type=int, default=4)
+    parser.add_argument("--no-stagger", action="store_true")
+    asyncio.run(_main(parser.parse_args()))
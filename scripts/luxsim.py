@@ -0,0 +1,508 @@
+"""Local stand-in for the Luxtronik 2 web interface (``Lux_WS`` subprotocol).
+
+Serves the navigation tree on ``LOGIN`` and the pages the integration
+reads on ``GET;<id>``, with optional latency, jitter and injected faults.
+Settings pages accept ``SET;set_<item id>;<raw>`` followed by ``SAVE;1``.
+Used by the benchmark suite in this folder.
+
+LuxBinarySimulator stands in for the binary interface on port 8889 with
+the same values as raw parameter and calculation arrays.
+
+    python scripts/luxsim.py --port 8214 --latency 0.02 --jitter 0.01
+    python scripts/luxsim.py --binary --port 8889
+"""
+
+import argparse
+import asyncio
+import random
+import struct
+import zlib
+
+from aiohttp import WSMsgType, web
+
+TEMP_ID = "0x4816ac"
+WAERM_ID = "0x4c2d14"
+OUTPUT_ID = "0x4b0c3c"
+STATE_ID = "0x4c7b5c"
+MODE_ID = "0x4d2b6c"
+WW_SETTINGS_ID = "0x4d3c84"
+CURVE_ID = "0x4d4d9c"
+INPUT_ID = "0x4a3d54"
+TIMES_ID = "0x4b2a44"
+HOURS_ID = "0x4c1bc4"
+ERRORS_ID = "0x4c55c4"
+SHUTDOWNS_ID = "0x4c6b3c"
+LIMITS_ID = "0x4d2f70"
+
+NAVIGATION = (
+    "<Navigation id='0x45e068'>"
+    "<item id='0x4a5f68'><name>Informationen</name>"
+    f"<item id='{TEMP_ID}'><name>Temperaturen</name></item>"
+    f"<item id='{INPUT_ID}'><name>Eingänge</name></item>"
+    f"<item id='{OUTPUT_ID}'><name>Ausgänge</name></item>"
+    f"<item id='{TIMES_ID}'><name>Ablaufzeiten</name></item>"
+    f"<item id='{HOURS_ID}'><name>Betriebsstunden</name></item>"
+    f"<item id='{ERRORS_ID}'><name>Fehlerspeicher</name></item>"
+    f"<item id='{SHUTDOWNS_ID}'><name>Abschaltungen</name></item>"
+    f"<item id='{STATE_ID}'><name>Anlagenstatus</name></item>"
+    f"<item id='{WAERM_ID}'><name>Wärmemenge</name></item>"
+    "</item>"
+    "<item id='0x4d1a54'><name>Einstellungen</name>"
+    f"<item id='{MODE_ID}'><name>Betriebsart</name></item>"
+    f"<item id='{LIMITS_ID}'><name>Temperaturen</name></item>"
+    f"<item id='{WW_SETTINGS_ID}'><name>Warmwasser</name></item>"
+    f"<item id='{CURVE_ID}'><name>Heizkurven</name></item>"
+    "</item>"
+    "</Navigation>"
+)
+
+DEFAULT_VALUES = {
+    TEMP_ID: {
+        "Vorlauf": "32.1°C",
+        "Rücklauf": "27.4°C",
+        "Rückl.-Soll": "28.0°C",
+        "Heissgas": "61.3°C",
+        "Aussentemperatur": "4.2°C",
+        "Mitteltemperatur": "5.0°C",
+        "Warmwasser-Ist": "48.7°C",
+        "Warmwasser-Soll": "50.0°C",
+        "Solarkollektor": "5.0°C",
+        "Solarspeicher": "150.0°C",
+        "Externe Energ.Quelle": "75.0°C",
+    },
+    WAERM_ID: {
+        "Heizung": "18234.1 kWh",
+        "Warmwasser": "4120.7 kWh",
+        "Gesamt": "22354.8 kWh",
+        "Durchfluss": "1150 l/h",
+        "seit : 14. 2.2025": "3120.4 kWh",
+        "seit Reset:": "812.2 kWh",
+    },
+    OUTPUT_ID: {
+        "AV-Abtauventil": "Aus",
+        "BUP": "Aus",
+        "FUP 1": "Ein",
+        "HUP": "Ein",
+        "Ventilation": "Aus",
+        "Ventil.-BOSUP": "Ein",
+        "Verdichter": "Ein",
+        "ZIP": "Aus",
+        "ZUP": "Aus",
+        "ZWE 1": "Aus",
+        "ZWE 2 - SST": "Aus",
+        "ZWE 3": "Aus",
+        "SLP": "Aus",
+        "FUP 2": "Aus",
+        "FUP 3": "Aus",
+    },
+    STATE_ID: {
+        "Wärmepumpen Typ": "LWD",
+        "Softwarestand": "V3.89.0",
+        "Bivalenz Stufe": "1",
+        "Betriebszustand": "Heizen",
+        "Heizleistung Ist": "4.20 kW",
+    },
+    MODE_ID: {
+        "Heizung": "Automatik",
+        "Warmwasser": "Automatik",
+    },
+    WW_SETTINGS_ID: {
+        "Warmwasser-Soll": "50.0°C",
+        "Hysterese WW": "2.0 K",
+    },
+    CURVE_ID: {
+        "Endpunkt": "35.0°C",
+        "Parallelversch.": "22.0°C",
+    },
+    INPUT_ID: {
+        "ASD": "Aus",
+        "EVU": "Ein",
+        "HD": "Aus",
+        "MOT": "Ein",
+        "ND": "Ein",
+        "PEX": "Aus",
+        "SWT": "Aus",
+    },
+    TIMES_ID: {
+        "WP Seit": "2:13:05",
+        "VD-Stand": "0:00:00",
+        "Netzeinschaltv.": "0:00:00",
+    },
+    HOURS_ID: {
+        "Betriebstund. VD1": "13025h",
+        "Impulse Verdichter 1": "4521",
+        "Betriebstunden WP": "13025h",
+        "Betriebstunden Heiz.": "10321h",
+        "Betriebstunden WW": "2704h",
+    },
+    ERRORS_ID: {
+        "23.11.24 06:12:40": "715 Hochdruck-Abschalt.",
+    },
+    SHUTDOWNS_ID: {
+        "29.11.24 04:10:55": "WP Unterbrechung (EVU)",
+    },
+    LIMITS_ID: {
+        "Rückl.-Begr.": "50.0°C",
+        "Hysterese HR": "2.0 K",
+        "TR Erh max": "7.0 K",
+    },
+}
+
+_MODES = ("Automatik", "Zweiter Wärmeerzeuger", "Party", "Ferien", "Aus")
+
+# How a SET raw value is rendered on each settings page
+SETTING_FORMATS = {
+    (MODE_ID, "Heizung"): _MODES,
+    (MODE_ID, "Warmwasser"): _MODES,
+    (WW_SETTINGS_ID, "Warmwasser-Soll"): "°C",
+    (CURVE_ID, "Endpunkt"): "°C",
+    (CURVE_ID, "Parallelversch."): "°C",
+}
+
+_CLOSE = object()
+
+PAGE_NAMES = {
+    TEMP_ID: "Temperaturen",
+    WAERM_ID: "Wärmemenge",
+    OUTPUT_ID: "Ausgänge",
+    STATE_ID: "Anlagenstatus",
+    MODE_ID: "Betriebsart",
+    WW_SETTINGS_ID: "Warmwasser",
+    CURVE_ID: "Heizkurven",
+    INPUT_ID: "Eingänge",
+    TIMES_ID: "Ablaufzeiten",
+    HOURS_ID: "Betriebsstunden",
+    ERRORS_ID: "Fehlerspeicher",
+    SHUTDOWNS_ID: "Abschaltungen",
+    LIMITS_ID: "Temperaturen",
+}
+
+
+def item_id(page_id: str, name: str) -> str:
+    """Stable id of the item `name` on page `page_id`."""
+    return f"0x{zlib.crc32(f'{page_id}/{name}'.encode()) & 0xFFFFFF:06x}"
+
+
+def render_page(page_id: str, values: dict[str, str]) -> str:
+    """Render a page the way the controller does."""
+    items = "".join(
+        f"<item id='{item_id(page_id, name)}'>"
+        f"<name>{name}</name><value>{value}</value></item>"
+        for name, value in values.items()
+    )
+    return (
+        f"<Content><item id='{page_id}'>"
+        f"<name>{PAGE_NAMES.get(page_id, page_id)}</name>{items}</item></Content>"
+    )
+
+
+class LuxSimulator:
+    """Luxtronik WebSocket server with configurable values and faults.
+
+    ``latency`` (plus up to ``jitter`` seconds) is applied per reply as a
+    network delay, so pipelined requests overlap the way they do on a real
+    link. With ``pipelining`` disabled the server drops requests that arrive
+    while one is in flight, like firmware that cannot queue them.
+
+    Each GET is answered normally unless one of the fault rates hits:
+    ``drop_rate`` closes the connection, ``malformed_rate`` sends a
+    truncated frame and ``stall_rate`` never answers (a half-open link).
+    """
+
+    def __init__(
+        self,
+        password: str = "999999",
+        latency: float = 0.0,
+        pipelining: bool = True,
+        jitter: float = 0.0,
+        drop_rate: float = 0.0,
+        malformed_rate: float = 0.0,
+        stall_rate: float = 0.0,
+        seed: int | None = None,
+    ):
+        self.password = password
+        self.latency = latency
+        self.pipelining = pipelining
+        self.jitter = jitter
+        self.drop_rate = drop_rate
+        self.malformed_rate = malformed_rate
+        self.stall_rate = stall_rate
+        self.values = {page: dict(vals) for page, vals in DEFAULT_VALUES.items()}
+        self.requests = 0
+        self.connections = 0
+        self.writes = 0
+        self._items = {
+            item_id(page_id, name): (page_id, name)
+            for page_id, name in SETTING_FORMATS
+        }
+        self._staged: dict[tuple[str, str], str] = {}
+        self._random = random.Random(seed)
+        self._runner = None
+        self.port = None
+
+    def set_value(self, name: str, value: str):
+        """Change the rendered value of `name` on whichever page shows it."""
+        for values in self.values.values():
+            if name in values:
+                values[name] = value
+                return
+        raise KeyError(name)
+
+    def _set(self, arg: str):
+        """Stage SET;set_<item id>;<raw> until the next SAVE."""
+        target, _, raw = arg.partition(";")
+        item = self._items.get(target.removeprefix("set_"))
+        if item is not None:
+            self._staged[item] = raw
+
+    def _save(self):
+        for (page_id, name), raw in self._staged.items():
+            fmt = SETTING_FORMATS[(page_id, name)]
+            if isinstance(fmt, tuple):
+                value = fmt[int(raw)]
+            else:
+                value = f"{int(raw) / 10:.1f}{fmt}"
+            self.values[page_id][name] = value
+            self.writes += 1
+        self._staged.clear()
+
+    def _reply(self, cmd: str, arg: str) -> str | None:
+        if cmd == "LOGIN":
+            return NAVIGATION if arg == self.password else _CLOSE
+        if cmd == "SET":
+            self._set(arg)
+            return None
+        if cmd == "SAVE":
+            self._save()
+            return None
+        if cmd != "GET" or arg not in self.values:
+            return None
+
+        roll = self._random.random()
+        if roll < self.drop_rate:
+            return _CLOSE
+        roll -= self.drop_rate
+        if roll < self.stall_rate:
+            return None
+        roll -= self.stall_rate
+
+        page = render_page(arg, self.values[arg])
+        if roll < self.malformed_rate:
+            return page[: len(page) // 2]
+        return page
+
+    def _delay(self) -> float:
+        if self.jitter:
+            return self.latency + self._random.uniform(0, self.jitter)
+        return self.latency
+
+    async def _writer(self, ws, queue: asyncio.Queue, inflight: list[int]):
+        loop = asyncio.get_running_loop()
+        while True:
+            due, reply = await queue.get()
+            delay = due - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if reply is _CLOSE:
+                await ws.close()
+                return
+            await ws.send_str(reply)
+            inflight[0] -= 1
+
+    async def _handle(self, request):
+        ws = web.WebSocketResponse(protocols=("Lux_WS",))
+        await ws.prepare(request)
+        self.connections += 1
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        inflight = [0]
+        writer = asyncio.create_task(self._writer(ws, queue, inflight))
+        try:
+            async for msg in ws:
+                if msg.type != WSMsgType.TEXT:
+                    continue
+                if not self.pipelining and inflight[0]:
+                    continue
+                cmd, _, arg = msg.data.partition(";")
+                self.requests += 1
+                reply = self._reply(cmd, arg)
+                if reply is None:
+                    continue
+                inflight[0] += 1
+                queue.put_nowait((loop.time() + self._delay(), reply))
+        except ConnectionResetError:
+            pass
+        finally:
+            writer.cancel()
+        return ws
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> int:
+        app = web.Application()
+        app.router.add_get("/", self._handle)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+        return self.port
+
+    async def stop(self):
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+
+# DEFAULT_VALUES as raw elements of the binary interface: tenths of °C
+# and kWh, outputs 0/1, the firmware one character per element
+DEFAULT_CALCULATIONS = {
+    10: 321,
+    11: 274,
+    12: 280,
+    14: 613,
+    15: 42,
+    16: 50,
+    17: 487,
+    18: 500,
+    26: 50,
+    27: 1500,
+    28: 750,
+    37: 0,
+    38: 0,
+    39: 1,
+    42: 0,
+    43: 1,
+    44: 1,
+    46: 0,
+    47: 0,
+    48: 0,
+    49: 0,
+    50: 0,
+    51: 0,
+    52: 0,
+    80: 0,
+    **{81 + i: ord(c) for i, c in enumerate("V3.89.0")},
+    151: 182341,
+    152: 41207,
+    153: 0,
+    154: 8122,
+    155: 1150,
+}
+DEFAULT_PARAMETERS = {2: 500, 3: 0, 4: 0, 11: 350, 12: 220}
+CALCULATION_COUNT = 260
+PARAMETER_COUNT = 1126
+
+
+class LuxBinarySimulator:
+    """Luxtronik binary interface: commands 3002 (write), 3003 and 3004.
+
+    Every request is (command, argument) as big-endian int32; a write
+    carries the value as a third word. Replies are delayed by
+    ``latency`` seconds.
+    """
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.calculations = [0] * CALCULATION_COUNT
+        for index, raw in DEFAULT_CALCULATIONS.items():
+            self.calculations[index] = raw
+        self.parameters = [0] * PARAMETER_COUNT
+        for index, raw in DEFAULT_PARAMETERS.items():
+            self.parameters[index] = raw
+        self.requests = 0
+        self.connections = 0
+        self.writes = 0
+        self._server = None
+        self.port = None
+
+    def _reply(self, command: int, argument: int, value: int) -> bytes | None:
+        if command == 3002:
+            self.parameters[argument] = value
+            self.writes += 1
+            return struct.pack(">ii", command, value)
+        if command == 3003:
+            values = self.parameters
+            head = struct.pack(">ii", command, len(values))
+        elif command == 3004:
+            values = self.calculations
+            head = struct.pack(">iii", command, 0, len(values))
+        else:
+            return None
+        return head + struct.pack(f">{len(values)}i", *values)
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        try:
+            while True:
+                command, argument = struct.unpack(">ii", await reader.readexactly(8))
+                value = 0
+                if command == 3002:
+                    (value,) = struct.unpack(">i", await reader.readexactly(4))
+                self.requests += 1
+                reply = self._reply(command, argument, value)
+                if reply is None:
+                    break
+                if self.latency:
+                    await asyncio.sleep(self.latency)
+                writer.write(reply)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionResetError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> int:
+        self._server = await asyncio.start_server(self._handle, host, port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self.port
+
+    async def stop(self):
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+
+async def _main(args):
+    if args.binary:
+        sim = LuxBinarySimulator(latency=args.latency)
+        port = await sim.start(args.host, args.port)
+        print(f"Luxtronik binary simulator listening on {args.host}:{port}")
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await sim.stop()
+        return
+    sim = LuxSimulator(
+        password=args.password,
+        latency=args.latency,
+        pipelining=args.pipelining,
+        jitter=args.jitter,
+        drop_rate=args.drop_rate,
+        malformed_rate=args.malformed_rate,
+        stall_rate=args.stall_rate,
+        seed=args.seed,
+    )
+    port = await sim.start(args.host, args.port)
+    print(f"Luxtronik simulator listening on ws://{args.host}:{port}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await sim.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8214)
+    parser.add_argument("--password", default="999999")
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--drop-rate", type=float, default=0.0)
+    parser.add_argument("--malformed-rate", type=float, default=0.0)
+    parser.add_argument("--stall-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--no-pipelining", dest="pipelining", action="store_false")
+    parser.add_argument(
+        "--binary", action="store_true", help="serve the binary interface instead"
+    )
+    asyncio.run(_main(parser.parse_args()))